@@ -0,0 +1,28 @@
+"""add articles.content_hash for skipping unchanged re-polls
+
+Revision ID: 007_articles_content_hash
+Revises: 006_reference_and_kg_tables
+Create Date: 2025-09-14
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "007_articles_content_hash"
+down_revision = "006_reference_and_kg_tables"
+branch_labels = None
+# articles comes from the 001-004 chain, while 005 starts a separate branch: without
+# this, a fresh database could reach 007 before the table exists
+depends_on = "004_source_watermarks"
+
+
+def upgrade() -> None:
+    # Nullable: rows written before this revision get a hash on their next upsert
+    op.add_column("articles", sa.Column("content_hash", sa.String(length=64), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column("articles", "content_hash")
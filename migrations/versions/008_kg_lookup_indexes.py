@@ -0,0 +1,51 @@
+"""indexes for knowledge-graph lookups
+
+Revision ID: 008_kg_lookup_indexes
+Revises: 007_articles_content_hash
+Create Date: 2025-09-15
+
+Covers the lookups the code performs (see tests/performance/test_query_plans.py):
+- claims by (event_id, claim_text) in the KG writer, on a ``substr`` prefix of the
+  text (replaced by the claim_hash index in 009)
+- sources by name in the KG writer, which matches the URL on the fetched rows
+- entities by (entity_type, external_id) for `events list --team-id/--player-id`
+- events ordered by event_date DESC NULLS LAST in `events list`
+- claim_sources by source_id (evidence joins, cascading deletes)
+"""
+
+from __future__ import annotations
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "008_kg_lookup_indexes"
+down_revision = "007_articles_content_hash"
+branch_labels = None
+depends_on = None
+
+CLAIM_TEXT_PREFIX = 64
+
+
+def upgrade() -> None:
+    postgres = op.get_bind().dialect.name.startswith("postgres")
+    op.create_index(
+        "ix_claims_event_text_prefix",
+        "claims",
+        ["event_id", sa.text(f"substr(claim_text, 1, {CLAIM_TEXT_PREFIX})")],
+    )
+    op.create_index("ix_sources_name", "sources", ["name"])
+    op.create_index("ix_entities_type_external_id", "entities", ["entity_type", "external_id"])
+    # Postgres sorts NULLs first in DESC order unless told otherwise; SQLite already
+    # puts them last and does not accept NULLS LAST in an index definition
+    order = "event_date DESC NULLS LAST" if postgres else "event_date DESC"
+    op.create_index("ix_events_event_date_desc", "events", [sa.text(order)])
+    op.create_index("ix_claim_sources_source", "claim_sources", ["source_id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_claim_sources_source", table_name="claim_sources")
+    op.drop_index("ix_events_event_date_desc", table_name="events")
+    op.drop_index("ix_entities_type_external_id", table_name="entities")
+    op.drop_index("ix_sources_name", table_name="sources")
+    op.drop_index("ix_claims_event_text_prefix", table_name="claims")
@@ -0,0 +1,109 @@
+"""dedupe claims by content hash and make claim sources unique
+
+Revision ID: 009_claim_hash_dedup
+Revises: 008_kg_lookup_indexes
+Create Date: 2025-09-16
+
+- claims.claim_hash (SHA-256 of claim_text), backfilled, unique per event; it
+  replaces the claim_text prefix index as the KG writer's lookup key
+- claim_sources unique per (claim_id, source_id, coalesce(url, ''))
+
+Duplicates left by earlier runs are merged first: claim sources are repointed to
+the oldest copy of their claim, then extra claims and claim sources are deleted.
+"""
+
+from __future__ import annotations
+
+import hashlib
+
+import sqlalchemy as sa
+from alembic import op
+
+# revision identifiers, used by Alembic.
+revision = "009_claim_hash_dedup"
+down_revision = "008_kg_lookup_indexes"
+branch_labels = None
+depends_on = None
+
+BATCH = 1000
+
+claims = sa.table(
+    "claims",
+    sa.column("id", sa.Integer),
+    sa.column("claim_text", sa.Text),
+    sa.column("claim_hash", sa.String),
+)
+
+
+def _backfill_hashes() -> None:
+    bind = op.get_bind()
+    while True:
+        rows = bind.execute(
+            sa.select(claims.c.id, claims.c.claim_text)
+            .where(claims.c.claim_hash.is_(None))
+            .order_by(claims.c.id)
+            .limit(BATCH)
+        ).all()
+        if not rows:
+            return
+        bind.execute(
+            claims.update()
+            .where(claims.c.id == sa.bindparam("claim_id"))
+            .values(claim_hash=sa.bindparam("hash")),
+            [
+                {"claim_id": cid, "hash": hashlib.sha256(text.encode("utf-8")).hexdigest()}
+                for cid, text in rows
+            ],
+        )
+
+
+def upgrade() -> None:
+    op.add_column("claims", sa.Column("claim_hash", sa.String(length=64), nullable=True))
+    _backfill_hashes()
+
+    op.execute("""
+        UPDATE claim_sources SET claim_id = (
+            SELECT MIN(k.id) FROM claims k JOIN claims c
+              ON k.event_id = c.event_id AND k.claim_hash = c.claim_hash
+            WHERE c.id = claim_sources.claim_id
+        )
+        WHERE claim_id IN (
+            SELECT c.id FROM claims c JOIN claims k
+              ON k.event_id = c.event_id AND k.claim_hash = c.claim_hash AND k.id < c.id
+        )
+        """)
+    op.execute("""
+        DELETE FROM claims WHERE EXISTS (
+            SELECT 1 FROM claims k
+            WHERE k.event_id = claims.event_id AND k.claim_hash = claims.claim_hash
+              AND k.id < claims.id
+        )
+        """)
+    op.execute("""
+        DELETE FROM claim_sources WHERE EXISTS (
+            SELECT 1 FROM claim_sources k
+            WHERE k.claim_id = claim_sources.claim_id AND k.source_id = claim_sources.source_id
+              AND COALESCE(k.url, '') = COALESCE(claim_sources.url, '')
+              AND k.id < claim_sources.id
+        )
+        """)
+
+    op.create_index("uq_claims_event_hash", "claims", ["event_id", "claim_hash"], unique=True)
+    op.drop_index("ix_claims_event_text_prefix", table_name="claims")
+    op.create_index(
+        "uq_claim_sources_claim_source_url",
+        "claim_sources",
+        ["claim_id", "source_id", sa.text("coalesce(url, '')")],
+        unique=True,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("uq_claim_sources_claim_source_url", table_name="claim_sources")
+    op.create_index(
+        "ix_claims_event_text_prefix",
+        "claims",
+        ["event_id", sa.text("substr(claim_text, 1, 64)")],
+    )
+    op.drop_index("uq_claims_event_hash", table_name="claims")
+    op.drop_column("claims", "claim_hash")
@@ -8,6 +8,7 @@ from .commands.health import health_cmd
 from .commands.ingest import ingest
 from .commands.pipeline import pipeline
 from .commands.reference import reference_group
+from .commands.seen_index import seen_index_group
 from .commands.simple import simple_pipeline
 
 
@@ -24,6 +25,7 @@ def main() -> None:
     cli.add_command(health_cmd)
     cli.add_command(events_group)
     cli.add_command(reference_group)
+    cli.add_command(seen_index_group)
     cli()
 
 
@@ -2,6 +2,8 @@ import asyncio
 
 import click
 
+from database.connection import dispose_async_engines, dispose_engines, warm_up
+from services.http_client import aclose_async_client
 from services.pipeline import Pipeline
 
 
@@ -26,11 +28,19 @@ def pipeline(
 
     async def run() -> None:
         p = Pipeline()
-        stats = await p.run_from_config(
-            config_path,
-            only_publishers=list(only_publishers) or None,
-            only_sources=list(only_sources) or None,
-        )
+        # Open pooled DB connections while the first feeds are being fetched
+        warmup = asyncio.create_task(asyncio.to_thread(warm_up))
+        try:
+            stats = await p.run_from_config(
+                config_path,
+                only_publishers=list(only_publishers) or None,
+                only_sources=list(only_sources) or None,
+            )
+        finally:
+            await asyncio.gather(warmup, return_exceptions=True)
+            await aclose_async_client()
+            await dispose_async_engines()
+            dispose_engines()
         click.echo(stats)
 
     asyncio.run(run())
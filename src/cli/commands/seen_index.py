@@ -0,0 +1,40 @@
+from __future__ import annotations
+
+import json
+
+import click
+
+from database.repositories.article_repo import ArticleRepository
+from services.seen_index import get_seen_index
+
+
+@click.group(name="seen-index")
+def seen_index_group() -> None:
+    """Seen-URL index commands (see T4L_SEEN_INDEX_* settings)."""
+
+
+@seen_index_group.command(name="stats")
+def cmd_stats() -> None:
+    """Print size, fill and expected false-positive rate of the index."""
+    click.echo(json.dumps(get_seen_index().stats(), indent=2))
+
+
+@seen_index_group.command(name="rebuild")
+@click.option(
+    "--headroom",
+    type=float,
+    default=2.0,
+    show_default=True,
+    help="Size the index for this multiple of the stored articles (at least the "
+    "configured capacity)",
+)
+def cmd_rebuild(headroom: float) -> None:
+    """Rebuild the index from the articles table."""
+    index = get_seen_index()
+    repo = ArticleRepository()
+    capacity = max(index.capacity, int(repo.count() * max(headroom, 1.0)))
+    n = index.rebuild(repo.iter_urls(), capacity=capacity)
+    click.echo(f"Indexed {n} URLs (capacity {capacity}) into {index.path}")
+
+
+__all__ = ["seen_index_group"]
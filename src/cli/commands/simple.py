@@ -5,6 +5,8 @@ import os
 
 import click
 
+from database.connection import dispose_engines
+from services.http_client import aclose_async_client
 from services.simple_pipeline import run_simplified_pipeline
 
 
@@ -12,7 +14,13 @@ from services.simple_pipeline import run_simplified_pipeline
 @click.option("--config", default="config/feeds.yaml", help="Path to feeds configuration file")
 @click.option("--allowlist", default=None, help="Optional path to allowlist.yaml (overrides env)")
 @click.option("--supabase", is_flag=True, help="Use Supabase instead of local SQLite")
-def simple_pipeline(config: str, allowlist: str | None, supabase: bool):
+@click.option(
+    "--concurrency",
+    type=int,
+    default=None,
+    help="Sources processed at once (default: defaults.max_parallel_sources from config)",
+)
+def simple_pipeline(config: str, allowlist: str | None, supabase: bool, concurrency: int | None):
     """Run a simplified pipeline that can optionally use Supabase directly."""
 
     if supabase:
@@ -32,7 +40,13 @@ def simple_pipeline(config: str, allowlist: str | None, supabase: bool):
         # Allowlist override via env variable for extractor
         if allowlist:
             os.environ["T4L_ALLOWLIST_PATH"] = allowlist
-        results = await run_simplified_pipeline(config, use_supabase=supabase)
+        try:
+            results = await run_simplified_pipeline(
+                config, use_supabase=supabase, concurrency=concurrency
+            )
+        finally:
+            await aclose_async_client()
+            dispose_engines()
 
         total_articles = sum(r.get("articles_count", 0) for r in results)
         success_count = sum(1 for r in results if r.get("status") == "success")
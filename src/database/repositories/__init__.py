@@ -1,11 +1,14 @@
 """Repository package exports."""
 
-from .article_repo import ArticleRepository  # noqa: F401
-from .log_repo import ProcessingLogRepository  # noqa: F401
-from .watermark_repo import WatermarkRepository  # noqa: F401
+from .article_repo import ArticleRepository, AsyncArticleRepository  # noqa: F401
+from .log_repo import AsyncProcessingLogRepository, ProcessingLogRepository  # noqa: F401
+from .watermark_repo import AsyncWatermarkRepository, WatermarkRepository  # noqa: F401
 
 __all__ = [
     "ArticleRepository",
+    "AsyncArticleRepository",
+    "AsyncProcessingLogRepository",
+    "AsyncWatermarkRepository",
     "ProcessingLogRepository",
     "WatermarkRepository",
 ]
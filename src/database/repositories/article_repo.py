@@ -1,13 +1,26 @@
 from __future__ import annotations
 
+import hashlib
+import json
+from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, Optional
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, Iterator, List, Optional
 
+from sqlalchemy import func, select
+from sqlalchemy.dialects import postgresql, sqlite
 from sqlalchemy.orm import Session, sessionmaker
 
-from database.connection import get_sessionmaker
+from database.connection import (
+    get_async_sessionmaker,
+    get_sessionmaker,
+    run_write,
+    run_write_async,
+)
 from models.database import ArticleORM
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
 
 def _parse_dt(value: Any) -> Optional[datetime]:
     if value is None:
@@ -26,6 +39,37 @@ def _parse_dt(value: Any) -> Optional[datetime]:
     return None
 
 
+def content_hash(data: Dict[str, Any]) -> str:
+    """Hash of the fields an upsert writes for ``data``.
+
+    Stored per row on every upsert, so a caller can tell that re-upserting an item
+    would not change anything (see ``ArticleRepository.existing``).
+    """
+    published = _parse_dt(data.get("publication_date"))
+    fields = [
+        str(data.get("title") or ""),
+        str(data.get("publisher") or ""),
+        published.isoformat() if published else None,
+        # Absent and None differ: only a present key overwrites the stored summary
+        [data["content_summary"]] if "content_summary" in data else None,
+    ]
+    payload = json.dumps(fields, ensure_ascii=False, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+# Dialects with INSERT ... ON CONFLICT ... DO UPDATE ... RETURNING
+_UPSERT_INSERTS = {"sqlite": sqlite.insert, "postgresql": postgresql.insert}
+
+
+@dataclass(frozen=True)
+class UpsertedArticle:
+    """Row identity returned by ``upsert_many`` (enough for watermarking)."""
+
+    id: int
+    url: str
+    publication_date: Optional[datetime]
+
+
 class ArticleRepository:
     """Repository for articles using SQLAlchemy ORM.
 
@@ -40,33 +84,251 @@ class ArticleRepository:
 
         Expected keys: url, title, publisher, publication_date (str|datetime|None), content_summary.
         """
-        with self._factory() as session:
+
+        def _write(session: Session) -> ArticleORM:
             url = str(data.get("url") or "").strip()
             obj = session.query(ArticleORM).filter(ArticleORM.url == url).one_or_none()
-            if obj is None:
-                obj = ArticleORM(
-                    url=url,
-                    title=str(data.get("title") or ""),
-                    publisher=str(data.get("publisher") or ""),
-                    publication_date=_parse_dt(data.get("publication_date")),
-                    content_summary=data.get("content_summary"),
-                    created_at=datetime.now(timezone.utc),
-                )
-                session.add(obj)
-            else:
-                obj.title = str(data.get("title") or obj.title)
-                obj.publisher = str(data.get("publisher") or obj.publisher)
-                obj.publication_date = (
-                    _parse_dt(data.get("publication_date")) or obj.publication_date
-                )
-                obj.content_summary = data.get("content_summary", obj.content_summary)
+            obj = _apply_upsert(obj, url, data)
+            session.add(obj)
             session.commit()
             session.refresh(obj)
             return obj
 
+        return run_write(self._factory, _write)
+
+    def upsert_many(
+        self, items: Iterable[Dict[str, Any]], chunk_size: int = 500
+    ) -> List[UpsertedArticle]:
+        """Insert or update a batch by unique URL with one statement per chunk.
+
+        Uses ``INSERT ... ON CONFLICT (url) DO UPDATE ... RETURNING`` on SQLite and
+        Postgres with the same merge rules as ``upsert``: empty titles/publishers and
+        missing publication dates keep the stored value, and ``content_summary`` is only
+        overwritten when the key is present. Duplicate URLs in the batch are merged in
+        order. Other dialects fall back to ``upsert`` per item.
+
+        Returns one entry per distinct URL, in first-seen order.
+        """
+        rows = _merge_rows(items)
+        if not rows:
+            return []
+
+        def _write(session: Session) -> Dict[str, UpsertedArticle]:
+            make_insert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+            if make_insert is None:
+                return {
+                    obj.url: UpsertedArticle(obj.id, obj.url, obj.publication_date)
+                    for obj in (self.upsert(_as_item(r)) for r in rows.values())
+                }
+
+            results: Dict[str, UpsertedArticle] = {}
+            for stmt in _upsert_statements(make_insert, rows, chunk_size):
+                for rid, rurl, rdate in session.execute(stmt):
+                    results[rurl] = UpsertedArticle(rid, rurl, rdate)
+            session.commit()
+            return results
+
+        results = run_write(self._factory, _write)
+        return [results[url] for url in rows if url in results]
+
     def get_by_url(self, url: str) -> Optional[ArticleORM]:
         with self._factory() as session:
             return session.query(ArticleORM).filter(ArticleORM.url == url).one_or_none()
 
+    def existing(self, urls: Iterable[str], chunk_size: int = 500) -> Dict[str, Optional[str]]:
+        """Stored URLs among ``urls`` mapped to their content hash (None if unknown).
+
+        One ``WHERE url IN (...)`` query per ``chunk_size`` distinct URLs.
+        """
+        found: Dict[str, Optional[str]] = {}
+        with self._factory() as session:
+            for stmt in _existing_statements(urls, chunk_size):
+                for url, digest in session.execute(stmt):
+                    found[url] = digest
+        return found
+
+    def iter_urls(self, batch_size: int = 10_000) -> Iterator[str]:
+        """Stream every stored URL without loading the table into memory."""
+        with self._factory() as session:
+            result = session.execute(select(ArticleORM.url).execution_options(yield_per=batch_size))
+            for (url,) in result:
+                yield url
+
+    def count(self) -> int:
+        with self._factory() as session:
+            return session.execute(select(func.count(ArticleORM.id))).scalar_one()
+
+
+class AsyncArticleRepository:
+    """``ArticleRepository`` on SQLAlchemy's asyncio extension (aiosqlite/asyncpg).
+
+    Without an explicit factory, each call uses the running loop's shared
+    ``get_async_sessionmaker()``, so one instance can be created outside the loop.
+    """
+
+    def __init__(self, factory: Optional[async_sessionmaker[AsyncSession]] = None) -> None:
+        self._explicit_factory = factory
+
+    @property
+    def _factory(self) -> async_sessionmaker[AsyncSession]:
+        return self._explicit_factory or get_async_sessionmaker()
+
+    async def upsert(self, data: Dict[str, Any]) -> ArticleORM:
+        async def _write(session: AsyncSession) -> ArticleORM:
+            obj = await _upsert_one_async(session, data)
+            await session.commit()
+            await session.refresh(obj)
+            return obj
+
+        return await run_write_async(self._factory, _write)
+
+    async def upsert_many(
+        self, items: Iterable[Dict[str, Any]], chunk_size: int = 500
+    ) -> List[UpsertedArticle]:
+        """Async ``ArticleRepository.upsert_many`` (same merge rules and result order)."""
+        rows = _merge_rows(items)
+        if not rows:
+            return []
+
+        async def _write(session: AsyncSession) -> Dict[str, UpsertedArticle]:
+            make_insert = _UPSERT_INSERTS.get(session.get_bind().dialect.name)
+            results: Dict[str, UpsertedArticle] = {}
+            if make_insert is None:
+                for r in rows.values():
+                    obj = await _upsert_one_async(session, _as_item(r))
+                    await session.flush()
+                    results[obj.url] = UpsertedArticle(obj.id, obj.url, obj.publication_date)
+            else:
+                for stmt in _upsert_statements(make_insert, rows, chunk_size):
+                    for rid, rurl, rdate in await session.execute(stmt):
+                        results[rurl] = UpsertedArticle(rid, rurl, rdate)
+            await session.commit()
+            return results
+
+        results = await run_write_async(self._factory, _write)
+        return [results[url] for url in rows if url in results]
+
+    async def get_by_url(self, url: str) -> Optional[ArticleORM]:
+        async with self._factory() as session:
+            result = await session.execute(select(ArticleORM).where(ArticleORM.url == url))
+            return result.scalar_one_or_none()
+
+    async def count(self) -> int:
+        async with self._factory() as session:
+            return (await session.execute(select(func.count(ArticleORM.id)))).scalar_one()
+
+    async def existing(
+        self, urls: Iterable[str], chunk_size: int = 500
+    ) -> Dict[str, Optional[str]]:
+        found: Dict[str, Optional[str]] = {}
+        async with self._factory() as session:
+            for stmt in _existing_statements(urls, chunk_size):
+                for url, digest in await session.execute(stmt):
+                    found[url] = digest
+        return found
+
+
+def _apply_upsert(obj: Optional[ArticleORM], url: str, data: Dict[str, Any]) -> ArticleORM:
+    """New row for ``data``, or ``obj`` updated with the ``upsert`` merge rules."""
+    if obj is None:
+        return ArticleORM(
+            url=url,
+            title=str(data.get("title") or ""),
+            publisher=str(data.get("publisher") or ""),
+            publication_date=_parse_dt(data.get("publication_date")),
+            content_summary=data.get("content_summary"),
+            content_hash=content_hash(data),
+            created_at=datetime.now(timezone.utc),
+        )
+    obj.content_hash = content_hash(data)
+    obj.title = str(data.get("title") or obj.title)
+    obj.publisher = str(data.get("publisher") or obj.publisher)
+    obj.publication_date = _parse_dt(data.get("publication_date")) or obj.publication_date
+    obj.content_summary = data.get("content_summary", obj.content_summary)
+    return obj
+
+
+async def _upsert_one_async(session: AsyncSession, data: Dict[str, Any]) -> ArticleORM:
+    url = str(data.get("url") or "").strip()
+    result = await session.execute(select(ArticleORM).where(ArticleORM.url == url))
+    obj = _apply_upsert(result.scalar_one_or_none(), url, data)
+    session.add(obj)
+    return obj
+
+
+def _merge_rows(items: Iterable[Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+    """Normalize a batch into one row per URL, merging duplicates in order."""
+    rows: Dict[str, Dict[str, Any]] = {}
+    for data in items:
+        url = str(data.get("url") or "").strip()
+        row = {
+            "url": url,
+            "title": str(data.get("title") or ""),
+            "publisher": str(data.get("publisher") or ""),
+            "publication_date": _parse_dt(data.get("publication_date")),
+            "content_summary": data.get("content_summary"),
+            "has_summary": "content_summary" in data,
+        }
+        prev = rows.get(url)
+        if prev is not None:
+            row["title"] = row["title"] or prev["title"]
+            row["publisher"] = row["publisher"] or prev["publisher"]
+            row["publication_date"] = row["publication_date"] or prev["publication_date"]
+            if not row["has_summary"]:
+                row["content_summary"] = prev["content_summary"]
+                row["has_summary"] = prev["has_summary"]
+        rows[url] = row
+    for row in rows.values():
+        row["content_hash"] = content_hash(_as_item(row))
+    return rows
+
+
+def _existing_statements(urls: Iterable[str], chunk_size: int) -> Iterator[Any]:
+    distinct = list(dict.fromkeys(u.strip() for u in urls if u and u.strip()))
+    for i in range(0, len(distinct), max(1, chunk_size)):
+        yield select(ArticleORM.url, ArticleORM.content_hash).where(
+            ArticleORM.url.in_(distinct[i : i + chunk_size])
+        )
+
+
+def _upsert_statements(
+    make_insert: Callable[[Any], Any], rows: Dict[str, Dict[str, Any]], chunk_size: int
+) -> Iterator[Any]:
+    """``INSERT ... ON CONFLICT (url) DO UPDATE ... RETURNING`` statements for merged rows."""
+    table = ArticleORM.__table__
+    now = datetime.now(timezone.utc)
+    for has_summary in (True, False):
+        group = [r for r in rows.values() if r["has_summary"] is has_summary]
+        for i in range(0, len(group), chunk_size):
+            values = [
+                {k: v for k, v in r.items() if k != "has_summary"} | {"created_at": now}
+                for r in group[i : i + chunk_size]
+            ]
+            stmt = make_insert(table).values(values)
+            set_ = {
+                "title": func.coalesce(func.nullif(stmt.excluded.title, ""), table.c.title),
+                "publisher": func.coalesce(
+                    func.nullif(stmt.excluded.publisher, ""), table.c.publisher
+                ),
+                "publication_date": func.coalesce(
+                    stmt.excluded.publication_date, table.c.publication_date
+                ),
+                "content_hash": stmt.excluded.content_hash,
+            }
+            if has_summary:
+                set_["content_summary"] = stmt.excluded.content_summary
+            yield stmt.on_conflict_do_update(index_elements=[table.c.url], set_=set_).returning(
+                table.c.id, table.c.url, table.c.publication_date
+            )
+
+
+def _as_item(row: Dict[str, Any]) -> Dict[str, Any]:
+    item = {
+        k: v for k, v in row.items() if k not in ("has_summary", "content_summary", "content_hash")
+    }
+    if row["has_summary"]:
+        item["content_summary"] = row["content_summary"]
+    return item
+
 
-__all__ = ["ArticleRepository"]
+__all__ = ["ArticleRepository", "AsyncArticleRepository", "UpsertedArticle", "content_hash"]
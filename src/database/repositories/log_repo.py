@@ -1,12 +1,30 @@
 from __future__ import annotations
 
-from typing import Optional
+import asyncio
+import atexit
+import inspect
+import threading
+import time
+import weakref
+from typing import TYPE_CHECKING, Any, Callable, Dict, Iterable, List, Optional, Union, cast
 
+from sqlalchemy import Table, insert
 from sqlalchemy.orm import Session, sessionmaker
 
-from database.connection import get_sessionmaker
+from database.connection import (
+    get_async_sessionmaker,
+    get_sessionmaker,
+    run_write,
+    run_write_async,
+)
 from models.database import ProcessingLogORM
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
+# The Core table behind the ORM class, typed as a Table for insert()
+_LOG_TABLE = cast(Table, ProcessingLogORM.__table__)
+
 
 class ProcessingLogRepository:
     def __init__(self, factory: Optional[sessionmaker[Session]] = None) -> None:
@@ -19,7 +37,7 @@ class ProcessingLogRepository:
         article_url: Optional[str] = None,
         metadata: Optional[str] = None,
     ) -> ProcessingLogORM:
-        with self._factory() as session:
+        def _write(session: Session) -> ProcessingLogORM:
             row = ProcessingLogORM(
                 level=level, message=message, article_url=article_url, meta=metadata
             )
@@ -28,5 +46,208 @@ class ProcessingLogRepository:
             session.refresh(row)
             return row
 
+        return run_write(self._factory, _write)
+
+    def add_many(self, entries: Iterable[Dict[str, Any]]) -> int:
+        """Insert entries (level, message, article_url?, metadata?) in one executemany."""
+        rows = _log_rows(entries)
+        if not rows:
+            return 0
+
+        def _write(session: Session) -> int:
+            # Core insert on the table: one executemany regardless of which values are None
+            session.execute(insert(_LOG_TABLE), rows)
+            session.commit()
+            return len(rows)
+
+        return run_write(self._factory, _write)
+
+
+class AsyncProcessingLogRepository:
+    """``ProcessingLogRepository`` on SQLAlchemy's asyncio extension."""
+
+    def __init__(self, factory: Optional[async_sessionmaker[AsyncSession]] = None) -> None:
+        self._explicit_factory = factory
+
+    @property
+    def _factory(self) -> async_sessionmaker[AsyncSession]:
+        return self._explicit_factory or get_async_sessionmaker()
+
+    async def add(
+        self,
+        level: str,
+        message: str,
+        article_url: Optional[str] = None,
+        metadata: Optional[str] = None,
+    ) -> ProcessingLogORM:
+        async def _write(session: AsyncSession) -> ProcessingLogORM:
+            row = ProcessingLogORM(
+                level=level, message=message, article_url=article_url, meta=metadata
+            )
+            session.add(row)
+            await session.commit()
+            await session.refresh(row)
+            return row
+
+        return await run_write_async(self._factory, _write)
+
+    async def add_many(self, entries: Iterable[Dict[str, Any]]) -> int:
+        rows = _log_rows(entries)
+        if not rows:
+            return 0
+
+        async def _write(session: AsyncSession) -> int:
+            await session.execute(insert(_LOG_TABLE), rows)
+            await session.commit()
+            return len(rows)
+
+        return await run_write_async(self._factory, _write)
+
+
+def _log_rows(entries: Iterable[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    return [
+        {
+            "level": str(e.get("level", "INFO")),
+            "message": str(e.get("message", "")),
+            "article_url": e.get("article_url"),
+            "metadata": e.get("metadata"),
+        }
+        for e in entries
+    ]
+
+
+class BufferedLogWriter:
+    """Collects log entries in memory and writes them with ``add_many``.
+
+    Drop-in for ``ProcessingLogRepository.add`` on hot paths. The buffer is flushed when
+    it reaches ``max_entries``, when its oldest entry is ``max_age`` seconds old (checked
+    on ``add``), on ``flush()``/``close()``, and at interpreter exit. Entries are put
+    back if a flush fails, so the next flush retries them.
+
+    With an async repository (``AsyncProcessingLogRepository``), or with
+    ``auto_flush=False``, nothing is written from ``add``; the owner checks ``due`` and
+    awaits ``aflush()``. Event-loop owners of a sync repository need the latter, since
+    a flush from ``add`` would block the loop on the commit.
+    """
+
+    def __init__(
+        self,
+        repo: Optional[Union[ProcessingLogRepository, AsyncProcessingLogRepository]] = None,
+        max_entries: int = 500,
+        max_age: float = 2.0,
+        clock: Callable[[], float] = time.monotonic,
+        auto_flush: bool = True,
+    ) -> None:
+        self.repo = repo or ProcessingLogRepository()
+        self.max_entries = max(1, max_entries)
+        self.max_age = max_age
+        self._clock = clock
+        self._lock = threading.Lock()
+        self._buffer: List[Dict[str, Any]] = []
+        self._oldest: Optional[float] = None
+        self.is_async = inspect.iscoroutinefunction(getattr(self.repo, "add_many", None))
+        self.auto_flush = auto_flush and not self.is_async
+        _live_writers.add(self)
+
+    @property
+    def pending(self) -> int:
+        return len(self._buffer)
+
+    @property
+    def due(self) -> bool:
+        """Whether the buffer has reached ``max_entries`` or ``max_age``."""
+        with self._lock:
+            return self._due()
+
+    def _due(self) -> bool:
+        # Caller holds the lock
+        return bool(self._buffer) and (
+            len(self._buffer) >= self.max_entries
+            or self._clock() - (self._oldest or 0.0) >= self.max_age
+        )
+
+    def add(
+        self,
+        level: str,
+        message: str,
+        article_url: Optional[str] = None,
+        metadata: Optional[str] = None,
+    ) -> None:
+        with self._lock:
+            if self._oldest is None:
+                self._oldest = self._clock()
+            self._buffer.append(
+                {
+                    "level": level,
+                    "message": message,
+                    "article_url": article_url,
+                    "metadata": metadata,
+                }
+            )
+            due = self.auto_flush and self._due()
+        if due:
+            self.flush()
+
+    def _take(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            batch, self._buffer = self._buffer, []
+            self._oldest = None
+        return batch
+
+    def _put_back(self, batch: List[Dict[str, Any]]) -> None:
+        with self._lock:
+            self._buffer[:0] = batch
+            self._oldest = self._clock()
+
+    def flush(self) -> int:
+        """Write everything buffered so far; returns the number of rows written."""
+        if self.is_async:
+            raise TypeError("BufferedLogWriter over an async repository: use aflush()")
+        batch = self._take()
+        if not batch:
+            return 0
+        try:
+            return cast(ProcessingLogRepository, self.repo).add_many(batch)
+        except Exception:
+            self._put_back(batch)
+            raise
+
+    async def aflush(self) -> int:
+        """``flush()`` for event-loop callers: awaits async repositories natively and runs
+        sync ones in a worker thread."""
+        batch = self._take()
+        if not batch:
+            return 0
+        try:
+            if self.is_async:
+                return await cast(AsyncProcessingLogRepository, self.repo).add_many(batch)
+            return await asyncio.to_thread(cast(ProcessingLogRepository, self.repo).add_many, batch)
+        except Exception:
+            self._put_back(batch)
+            raise
+
+    def close(self) -> int:
+        return self.flush()
+
+    def __enter__(self) -> "BufferedLogWriter":
+        return self
+
+    def __exit__(self, *exc: Any) -> None:
+        self.close()
+
+
+_live_writers: "weakref.WeakSet[BufferedLogWriter]" = weakref.WeakSet()
+
+
+@atexit.register
+def _flush_live_writers() -> None:
+    for writer in list(_live_writers):
+        if writer.is_async:
+            continue  # needs its event loop, which is gone by now
+        try:
+            writer.flush()
+        except Exception:
+            pass
+
 
-__all__ = ["ProcessingLogRepository"]
+__all__ = ["ProcessingLogRepository", "AsyncProcessingLogRepository", "BufferedLogWriter"]
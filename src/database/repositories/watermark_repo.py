@@ -1,13 +1,22 @@
 from __future__ import annotations
 
 from datetime import datetime, timezone
-from typing import Optional
+from typing import TYPE_CHECKING, Optional
 
+from sqlalchemy import select
 from sqlalchemy.orm import Session, sessionmaker
 
-from database.connection import get_sessionmaker
+from database.connection import (
+    get_async_sessionmaker,
+    get_sessionmaker,
+    run_write,
+    run_write_async,
+)
 from models.database import SourceWatermarkORM
 
+if TYPE_CHECKING:
+    from sqlalchemy.ext.asyncio import AsyncSession, async_sessionmaker
+
 
 class WatermarkRepository:
     def __init__(self, factory: Optional[sessionmaker[Session]] = None) -> None:
@@ -20,15 +29,12 @@ class WatermarkRepository:
                 .filter(SourceWatermarkORM.source_key == source_key)
                 .one_or_none()
             )
-            # SQLite may round-trip timezone-aware datetimes as naive; coerce to UTC-aware.
-            if row and row.last_publication_date and row.last_publication_date.tzinfo is None:
-                row.last_publication_date = row.last_publication_date.replace(tzinfo=timezone.utc)
-            return row
+            return _as_utc(row)
 
     def upsert(
         self, source_key: str, last_publication_date: Optional[datetime], last_url: Optional[str]
     ) -> SourceWatermarkORM:
-        with self._factory() as session:
+        def _write(session: Session) -> SourceWatermarkORM:
             row = (
                 session.query(SourceWatermarkORM)
                 .filter(SourceWatermarkORM.source_key == source_key)
@@ -46,9 +52,60 @@ class WatermarkRepository:
                 row.last_url = last_url or row.last_url
             session.commit()
             session.refresh(row)
-            if row.last_publication_date and row.last_publication_date.tzinfo is None:
-                row.last_publication_date = row.last_publication_date.replace(tzinfo=timezone.utc)
+            _as_utc(row)
+            return row
+
+        return run_write(self._factory, _write)
+
+
+class AsyncWatermarkRepository:
+    """``WatermarkRepository`` on SQLAlchemy's asyncio extension."""
+
+    def __init__(self, factory: Optional[async_sessionmaker[AsyncSession]] = None) -> None:
+        self._explicit_factory = factory
+
+    @property
+    def _factory(self) -> async_sessionmaker[AsyncSession]:
+        return self._explicit_factory or get_async_sessionmaker()
+
+    async def get(self, source_key: str) -> Optional[SourceWatermarkORM]:
+        async with self._factory() as session:
+            result = await session.execute(
+                select(SourceWatermarkORM).where(SourceWatermarkORM.source_key == source_key)
+            )
+            return _as_utc(result.scalar_one_or_none())
+
+    async def upsert(
+        self, source_key: str, last_publication_date: Optional[datetime], last_url: Optional[str]
+    ) -> SourceWatermarkORM:
+        async def _write(session: AsyncSession) -> SourceWatermarkORM:
+            result = await session.execute(
+                select(SourceWatermarkORM).where(SourceWatermarkORM.source_key == source_key)
+            )
+            row = result.scalar_one_or_none()
+            if row is None:
+                row = SourceWatermarkORM(
+                    source_key=source_key,
+                    last_publication_date=last_publication_date,
+                    last_url=last_url,
+                )
+                session.add(row)
+            else:
+                row.last_publication_date = last_publication_date or row.last_publication_date
+                row.last_url = last_url or row.last_url
+            await session.commit()
+            await session.refresh(row)
+            _as_utc(row)
             return row
 
+        return await run_write_async(self._factory, _write)
+
+
+def _as_utc(row: Optional[SourceWatermarkORM]) -> Optional[SourceWatermarkORM]:
+    # SQLite may round-trip timezone-aware datetimes as naive; coerce to UTC-aware.
+    if row and row.last_publication_date and row.last_publication_date.tzinfo is None:
+        row.last_publication_date = row.last_publication_date.replace(tzinfo=timezone.utc)
+    return row
+
 
-__all__ = ["WatermarkRepository", "SourceWatermarkORM"]
+__all__ = ["WatermarkRepository", "AsyncWatermarkRepository", "SourceWatermarkORM"]
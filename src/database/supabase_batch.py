@@ -0,0 +1,208 @@
+"""Chunked, concurrent upserts through a Supabase/PostgREST table client.
+
+Rows are split into chunks bounded by row count and JSON byte size, and the chunks
+are sent concurrently with ``Prefer: return=minimal``, so PostgREST does not echo the
+rows back. When a chunk fails, it is split in half and each half is retried. This
+repeats until the bad rows are isolated, so a single bad row costs about log2(chunk)
+extra requests instead of one request per row. Only errors caused by the rows are
+bisected: invalid data or a violated constraint (SQLSTATE classes 22 and 23, or a 400,
+409 or 422 without a code) and payloads too large for the server (413). Connection,
+auth, rate-limit and server errors say nothing about the rows, so the chunk is
+reported as failed.
+
+Configuration (env):
+    - T4L_SUPABASE_BATCH_ROWS: max rows per request (500)
+    - T4L_SUPABASE_BATCH_BYTES: max JSON payload bytes per request (1000000)
+    - T4L_SUPABASE_PARALLEL: concurrent requests (4)
+"""
+
+from __future__ import annotations
+
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+import httpx
+
+DEFAULT_MAX_ROWS = 500
+DEFAULT_MAX_BYTES = 1_000_000
+DEFAULT_MAX_PARALLEL = 4
+
+
+def _row_bytes(row: Dict[str, Any]) -> int:
+    # +1 for the separating comma inside the JSON array
+    return len(json.dumps(row, default=str, separators=(",", ":")).encode("utf-8")) + 1
+
+
+def chunk_rows(
+    rows: Iterable[Dict[str, Any]],
+    max_rows: int = DEFAULT_MAX_ROWS,
+    max_bytes: int = DEFAULT_MAX_BYTES,
+) -> Iterator[List[Dict[str, Any]]]:
+    """Yield consecutive chunks of at most ``max_rows`` rows and ``max_bytes`` of JSON.
+
+    A single row larger than ``max_bytes`` is yielded on its own.
+    """
+    max_rows = max(1, max_rows)
+    chunk: List[Dict[str, Any]] = []
+    size = 2  # the enclosing []
+    for row in rows:
+        n = _row_bytes(row)
+        if chunk and (len(chunk) >= max_rows or size + n > max_bytes):
+            yield chunk
+            chunk, size = [], 2
+        chunk.append(row)
+        size += n
+    if chunk:
+        yield chunk
+
+
+def _is_duplicate(exc: BaseException) -> bool:
+    msg = str(exc)
+    return getattr(exc, "code", None) == "23505" or "duplicate key value" in msg or "23505" in msg
+
+
+# SQLSTATE classes raised by the row data: data exception, integrity constraint violation
+_ROW_SQLSTATE_CLASSES = ("22", "23")
+_ROW_HTTP_STATUSES = (400, 409, 413, 422)
+
+
+def _is_row_error(exc: BaseException) -> bool:
+    """Whether ``exc`` rejects the rows themselves, so smaller requests can isolate them.
+
+    postgrest's ``APIError.code`` is the SQLSTATE or a ``PGRST`` code, or the HTTP status
+    when the error body was not JSON; httpx errors carry the response.
+    """
+    if _is_duplicate(exc):
+        return True
+    code = str(getattr(exc, "code", None) or "")
+    if code == "PGRST413":
+        return True
+    if len(code) == 5 and not code.startswith("PGRST"):
+        return code[:2] in _ROW_SQLSTATE_CLASSES
+    status = getattr(getattr(exc, "response", None), "status_code", None)
+    if status is None and code.isdigit():
+        status = int(code)
+    return status in _ROW_HTTP_STATUSES
+
+
+@dataclass
+class BatchResult:
+    written: int = 0
+    duplicates: int = 0
+    requests: int = 0
+    failed: List[Dict[str, Any]] = field(default_factory=list)
+    errors: List[str] = field(default_factory=list)
+
+    @property
+    def ok(self) -> bool:
+        return not self.failed
+
+    def merge(self, other: "BatchResult") -> None:
+        self.written += other.written
+        self.duplicates += other.duplicates
+        self.requests += other.requests
+        self.failed.extend(other.failed)
+        self.errors.extend(other.errors)
+
+
+class SupabaseBatchWriter:
+    """Upsert rows into one table in size-bounded chunks with bounded parallelism.
+
+    ``client`` is anything with the supabase-py/postgrest ``table(name)`` builder API.
+    """
+
+    def __init__(
+        self,
+        client: Any,
+        table: str = "articles",
+        on_conflict: str = "url",
+        ignore_duplicates: bool = True,
+        max_rows: Optional[int] = None,
+        max_bytes: Optional[int] = None,
+        max_parallel: Optional[int] = None,
+    ) -> None:
+        self.client = client
+        self.table = table
+        self.on_conflict = on_conflict
+        self.ignore_duplicates = ignore_duplicates
+        self.max_rows = max_rows or int(os.getenv("T4L_SUPABASE_BATCH_ROWS", str(DEFAULT_MAX_ROWS)))
+        self.max_bytes = max_bytes or int(
+            os.getenv("T4L_SUPABASE_BATCH_BYTES", str(DEFAULT_MAX_BYTES))
+        )
+        self.max_parallel = max(
+            1,
+            max_parallel or int(os.getenv("T4L_SUPABASE_PARALLEL", str(DEFAULT_MAX_PARALLEL))),
+        )
+
+    def write(self, rows: Iterable[Dict[str, Any]]) -> BatchResult:
+        chunks = list(chunk_rows(rows, self.max_rows, self.max_bytes))
+        result = BatchResult()
+        if len(chunks) <= 1 or self.max_parallel == 1:
+            for chunk in chunks:
+                result.merge(self._write_chunk(chunk))
+            return result
+        with ThreadPoolExecutor(
+            max_workers=min(self.max_parallel, len(chunks)), thread_name_prefix="supabase-upsert"
+        ) as pool:
+            # map keeps chunk order, so failed rows are reported in input order
+            for part in pool.map(self._write_chunk, chunks):
+                result.merge(part)
+        return result
+
+    def _write_chunk(self, chunk: List[Dict[str, Any]]) -> BatchResult:
+        result = BatchResult()
+        pending = [chunk]
+        while pending:
+            rows = pending.pop()
+            result.requests += 1
+            try:
+                self._upsert(rows)
+                result.written += len(rows)
+                continue
+            except (httpx.TransportError, OSError) as e:
+                # Nothing row-specific to isolate; retrying halves would just multiply timeouts
+                result.failed.extend(rows)
+                result.errors.append(str(e))
+                continue
+            except Exception as e:
+                if len(rows) == 1 and _is_duplicate(e):
+                    result.duplicates += 1
+                    continue
+                if len(rows) == 1 or not _is_row_error(e):
+                    # Auth, rate-limit and server errors would fail every half as well
+                    result.failed.extend(rows)
+                    result.errors.append(str(e))
+                    continue
+            mid = len(rows) // 2
+            # Stack order: first half is retried first
+            pending.append(rows[mid:])
+            pending.append(rows[:mid])
+        return result
+
+    def _upsert(self, rows: List[Dict[str, Any]]) -> None:
+        table = self.client.table(self.table)
+        try:
+            # "minimal" is postgrest's ReturnMethod.minimal: no rows echoed back
+            query = table.upsert(
+                rows,
+                on_conflict=self.on_conflict,
+                ignore_duplicates=self.ignore_duplicates,
+                returning="minimal",
+            )
+        except TypeError:
+            # Older clients without ignore_duplicates/returning keyword support
+            query = table.upsert(rows, on_conflict=self.on_conflict)
+        query.execute()
+
+
+__all__ = [
+    "DEFAULT_MAX_ROWS",
+    "DEFAULT_MAX_BYTES",
+    "DEFAULT_MAX_PARALLEL",
+    "BatchResult",
+    "SupabaseBatchWriter",
+    "chunk_rows",
+]
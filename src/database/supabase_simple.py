@@ -8,7 +8,9 @@ and behave as no-ops that return False/None instead of raising ImportError.
 from __future__ import annotations
 
 import os
-from typing import Any, Dict, List, Optional
+from typing import Any, Dict, Iterable, List, Optional, Set
+
+from .supabase_batch import SupabaseBatchWriter
 
 try:
     # Optional dependency
@@ -43,44 +45,57 @@ class SimpleSupabaseRepo:
         self.client = client or get_supabase_client()
 
     def save_articles(self, articles: List[Dict[str, Any]]) -> bool:
-        """Save articles to Supabase articles table."""
+        """Save articles to Supabase articles table.
+
+        Rows are upserted on ``url`` in concurrent, size-bounded chunks (see
+        ``SupabaseBatchWriter``); returns False if any row could not be written.
+        """
         if not self.client:
             return False
 
+        # No work to do
+        if not articles:
+            return False
+
         try:
-            # No work to do
-            if not articles:
-                return False
-
-            table = self.client.table("articles")
-
-            # Prefer upsert with conflict on URL, ignoring duplicates so the batch doesn't fail
-            try:
-                # Some versions of supabase-py/postgrest support ignore_duplicates
-                table.upsert(articles, on_conflict="url", ignore_duplicates=True).execute()
-                # Treat as success even if all were duplicates (result.data may be empty)
-                return True
-            except TypeError:
-                # Fallback for older client signature without ignore_duplicates
-                table.upsert(articles, on_conflict="url").execute()
-                return True
-            except Exception:
-                # As a last resort, fall back to per-row insert and ignore duplicates
-                inserted_any = False
-                for row in articles:
-                    try:
-                        table.insert(row).execute()
-                        inserted_any = True
-                    except Exception as ex:
-                        # Ignore unique violations on url; re-raise only for other errors
-                        msg = str(ex)
-                        if "duplicate key value" in msg or "23505" in msg:
-                            continue
-                        raise
-                return inserted_any or True  # If all were duplicates, still a logical success
+            result = SupabaseBatchWriter(self.client, table="articles", on_conflict="url").write(
+                articles
+            )
         except Exception as e:
             print(f"Failed to save articles to Supabase: {e}")
             return False
+        if result.failed:
+            print(
+                f"Failed to save {len(result.failed)} of {len(articles)} articles to Supabase: "
+                f"{result.errors[0] if result.errors else 'unknown error'}"
+            )
+            return False
+        # Duplicates are a logical success
+        return True
+
+    def existing_urls(self, urls: Iterable[str], chunk_size: int = 100) -> Set[str]:
+        """Return the subset of ``urls`` already stored in the articles table.
+
+        Uses one ``url=in.(...)`` query per ``chunk_size`` URLs to keep request lines short.
+        On failure the URLs found so far are returned; callers then simply re-upsert.
+        """
+        if not self.client:
+            return set()
+
+        unique = list(dict.fromkeys(u for u in urls if u))
+        found: Set[str] = set()
+        try:
+            for i in range(0, len(unique), chunk_size):
+                result = (
+                    self.client.table("articles")
+                    .select("url")
+                    .in_("url", unique[i : i + chunk_size])
+                    .execute()
+                )
+                found.update(row["url"] for row in result.data or [])
+        except Exception as e:
+            print(f"Failed to look up existing articles: {e}")
+        return found
 
     def get_watermark(self, source_key: str) -> Optional[str]:
         """Get the last processed timestamp for a source."""
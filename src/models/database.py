@@ -23,6 +23,8 @@ class ArticleORM(Base):
         DateTime(timezone=True), nullable=True
     )
     content_summary: Mapped[Optional[str]] = mapped_column(Text, nullable=True)
+    # Hash of the fields last written by an upsert (see article_repo.content_hash)
+    content_hash: Mapped[Optional[str]] = mapped_column(String(64), nullable=True)
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
 
@@ -1,6 +1,8 @@
 from __future__ import annotations
 
+import hashlib
 from datetime import datetime
+from typing import Any
 
 from sqlalchemy import (
     DateTime,
@@ -11,15 +13,24 @@ from sqlalchemy import (
     String,
     Text,
     UniqueConstraint,
+    text,
 )
 from sqlalchemy.orm import Mapped, mapped_column
 
 from .database import Base
 
 
+def claim_hash(claim_text: str) -> str:
+    """SHA-256 of a claim's text; claims are unique per ``(event_id, claim_hash)``."""
+    return hashlib.sha256(claim_text.encode("utf-8")).hexdigest()
+
+
+def _default_claim_hash(context: Any) -> str:
+    return claim_hash(context.get_current_parameters()["claim_text"])
+
+
 class EventORM(Base):
     __tablename__ = "events"
-    __table_args__ = (UniqueConstraint("signature", name="uq_events_signature"),)
 
     id: Mapped[int] = mapped_column(Integer, primary_key=True, autoincrement=True)
     signature: Mapped[str] = mapped_column(String(256), nullable=False)
@@ -31,6 +42,12 @@ class EventORM(Base):
     created_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
     updated_at: Mapped[datetime] = mapped_column(DateTime(timezone=True), nullable=False)
 
+    __table_args__ = (
+        UniqueConstraint("signature", name="uq_events_signature"),
+        # events list orders by event_date DESC NULLS LAST (Postgres uses that order)
+        Index("ix_events_event_date_desc", text("event_date DESC")),
+    )
+
 
 class EntityORM(Base):
     __tablename__ = "entities"
@@ -40,7 +57,10 @@ class EntityORM(Base):
     external_id: Mapped[str | None] = mapped_column(String(64))
     display_name: Mapped[str] = mapped_column(String(256), nullable=False)
 
-    __table_args__ = (Index("ix_entities_type", "entity_type"),)
+    __table_args__ = (
+        Index("ix_entities_type", "entity_type"),
+        Index("ix_entities_type_external_id", "entity_type", "external_id"),
+    )
 
 
 class EventEntityORM(Base):
@@ -69,6 +89,9 @@ class SourceORM(Base):
     publisher: Mapped[str | None] = mapped_column(String(256))
     url: Mapped[str | None] = mapped_column(String(1000))
 
+    # The KG writer looks sources up by name and matches the URL on the fetched rows
+    __table_args__ = (Index("ix_sources_name", "name"),)
+
 
 class ClaimORM(Base):
     __tablename__ = "claims"
@@ -78,10 +101,15 @@ class ClaimORM(Base):
         Integer, ForeignKey("events.id", ondelete="CASCADE"), nullable=False
     )
     claim_text: Mapped[str] = mapped_column(Text, nullable=False)
+    # Filled from claim_text on insert; nullable so older SQLite dev databases can add it
+    claim_hash: Mapped[str | None] = mapped_column(String(64), default=_default_claim_hash)
     status: Mapped[str | None] = mapped_column(String(32))
     confidence: Mapped[float | None] = mapped_column(Float)
 
-    __table_args__ = (Index("ix_claims_event", "event_id"),)
+    __table_args__ = (
+        Index("ix_claims_event", "event_id"),
+        Index("uq_claims_event_hash", "event_id", "claim_hash", unique=True),
+    )
 
 
 class ClaimSourceORM(Base):
@@ -97,7 +125,18 @@ class ClaimSourceORM(Base):
     url: Mapped[str | None] = mapped_column(String(1000))
     citation: Mapped[str | None] = mapped_column(Text)
 
-    __table_args__ = (Index("ix_claim_sources_claim", "claim_id"),)
+    __table_args__ = (
+        Index("ix_claim_sources_claim", "claim_id"),
+        Index("ix_claim_sources_source", "source_id"),
+        # NULL URLs would never conflict in a plain unique index
+        Index(
+            "uq_claim_sources_claim_source_url",
+            "claim_id",
+            "source_id",
+            text("coalesce(url, '')"),
+            unique=True,
+        ),
+    )
 
 
 class EventArticleORM(Base):
@@ -123,4 +162,5 @@ __all__ = [
     "ClaimORM",
     "ClaimSourceORM",
     "EventArticleORM",
+    "claim_hash",
 ]
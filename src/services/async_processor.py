@@ -1,7 +1,31 @@
 from __future__ import annotations
 
 import asyncio
-from typing import Awaitable, Callable, Iterable, List, TypeVar
+import os
+import time
+import weakref
+from collections import deque
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import (
+    Any,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Deque,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    TypeVar,
+)
+from urllib.parse import urlparse
+
+import httpx
+
+from .metrics import Metrics
 
 T = TypeVar("T")
 R = TypeVar("R")
@@ -48,3 +72,266 @@ async def retry(
             if attempt > retries:
                 raise
             await asyncio.sleep(base_delay * (2 ** (attempt - 1)))
+
+
+def parse_retry_after(value: Optional[str], max_delay: float = 300.0) -> Optional[float]:
+    """Seconds to wait according to a ``Retry-After`` header (delta-seconds or HTTP-date)."""
+    if not value:
+        return None
+    value = value.strip()
+    try:
+        delay = float(value)
+    except ValueError:
+        try:
+            when = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if when.tzinfo is None:
+            when = when.replace(tzinfo=timezone.utc)
+        delay = (when - datetime.now(timezone.utc)).total_seconds()
+    return min(max(delay, 0.0), max_delay)
+
+
+class TokenBucket:
+    """Token bucket refilled at ``rate`` tokens/s up to ``burst`` (``rate <= 0``: unlimited).
+
+    Acquiring reserves a token immediately and sleeps off any debt, so waiters are served
+    in arrival order without a lock. ``block_for`` pauses the bucket, e.g. on Retry-After.
+    """
+
+    def __init__(
+        self, rate: float, burst: float, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.rate = rate
+        self.burst = max(1.0, burst)
+        self._clock = clock
+        self._tokens = self.burst
+        self._updated = clock()
+        self._blocked_until = 0.0
+
+    def reserve(self) -> float:
+        """Take a token and return how long the caller must wait before using it."""
+        now = self._clock()
+        wait = max(0.0, self._blocked_until - now)
+        if self.rate <= 0:
+            return wait
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        self._tokens -= 1
+        if self._tokens < 0:
+            wait = max(wait, -self._tokens / self.rate)
+        return wait
+
+    async def acquire(self) -> None:
+        delay = self.reserve()
+        while delay > 0:
+            await asyncio.sleep(delay)
+            # A Retry-After may have arrived while we slept
+            delay = self._blocked_until - self._clock()
+
+    def block_for(self, seconds: float) -> None:
+        self._blocked_until = max(self._blocked_until, self._clock() + seconds)
+
+
+class AdaptiveLimiter:
+    """AIMD concurrency limit: +1 per window of fast successes, ×``backoff`` on congestion.
+
+    Decreases are applied at most once per ``cooldown`` seconds so a burst of failures
+    from requests already in flight only counts as one congestion signal.
+    """
+
+    def __init__(
+        self,
+        initial: int = 4,
+        min_limit: int = 1,
+        max_limit: int = 16,
+        backoff: float = 0.5,
+        cooldown: float = 1.0,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.min_limit = max(1, min_limit)
+        self.max_limit = max(self.min_limit, max_limit)
+        self.limit = float(min(max(initial, self.min_limit), self.max_limit))
+        self.backoff = backoff
+        self.cooldown = cooldown
+        self.in_flight = 0
+        self._clock = clock
+        self._last_decrease = float("-inf")
+        self._waiters: Deque["asyncio.Future[None]"] = deque()
+
+    async def acquire(self) -> None:
+        while self.in_flight >= int(self.limit):
+            fut = asyncio.get_running_loop().create_future()
+            self._waiters.append(fut)
+            try:
+                await fut
+            finally:
+                if fut in self._waiters:
+                    self._waiters.remove(fut)
+        self.in_flight += 1
+
+    def release(self) -> None:
+        self.in_flight -= 1
+        self._wake()
+
+    def on_success(self) -> None:
+        self.limit = min(float(self.max_limit), self.limit + 1.0 / self.limit)
+        self._wake()
+
+    def on_congestion(self) -> None:
+        now = self._clock()
+        if now - self._last_decrease >= self.cooldown:
+            self.limit = max(float(self.min_limit), self.limit * self.backoff)
+            self._last_decrease = now
+
+    def _wake(self) -> None:
+        free = int(self.limit) - self.in_flight
+        while free > 0 and self._waiters:
+            fut = self._waiters.popleft()
+            if not fut.done():
+                fut.set_result(None)
+                free -= 1
+
+
+_TIMEOUT_ERRORS = (asyncio.TimeoutError, TimeoutError, httpx.TimeoutException)
+
+
+@dataclass
+class _HostState:
+    bucket: TokenBucket
+    limiter: AdaptiveLimiter
+
+
+class RequestSlot:
+    """Handle yielded by ``HostScheduler.slot``; report the response with ``observe``."""
+
+    def __init__(self, scheduler: Optional["HostScheduler"], host: str, started: float) -> None:
+        self._scheduler = scheduler
+        self.host = host
+        self.started = started
+        self.observed = False
+
+    def observe(self, response: Any) -> None:
+        """Feed a response's status, latency and ``Retry-After`` back to the scheduler."""
+        self.observed = True
+        if self._scheduler is not None:
+            self._scheduler.observe(
+                self.host,
+                response.status_code,
+                response.headers,
+                time.monotonic() - self.started,
+            )
+
+
+class HostScheduler:
+    """Per-host politeness: a token bucket plus an AIMD concurrency limit for each host.
+
+    Usage::
+
+        async with scheduler.slot(url) as slot:
+            resp = await client.get(url)
+            slot.observe(resp)
+
+    429 and 5xx responses and timeouts shrink the host's concurrency limit; a
+    ``Retry-After`` on 429/503 pauses the host's bucket. 2xx/3xx responses faster than
+    ``slow_after`` seconds grow the limit back towards ``max_concurrency``.
+    """
+
+    def __init__(
+        self,
+        rate: float = 8.0,
+        burst: float = 16.0,
+        initial_concurrency: int = 4,
+        min_concurrency: int = 1,
+        max_concurrency: int = 16,
+        slow_after: float = 2.0,
+        max_retry_after: float = 300.0,
+        enabled: bool = True,
+    ) -> None:
+        self.rate = rate
+        self.burst = burst
+        self.initial_concurrency = initial_concurrency
+        self.min_concurrency = min_concurrency
+        self.max_concurrency = max_concurrency
+        self.slow_after = slow_after
+        self.max_retry_after = max_retry_after
+        self.enabled = enabled
+        self._hosts: Dict[str, _HostState] = {}
+
+    def host_state(self, host: str) -> _HostState:
+        state = self._hosts.get(host)
+        if state is None:
+            state = _HostState(
+                TokenBucket(self.rate, self.burst),
+                AdaptiveLimiter(
+                    self.initial_concurrency, self.min_concurrency, self.max_concurrency
+                ),
+            )
+            self._hosts[host] = state
+        return state
+
+    @asynccontextmanager
+    async def slot(self, url: str) -> AsyncIterator[RequestSlot]:
+        host = urlparse(url).netloc.lower()
+        if not self.enabled:
+            yield RequestSlot(None, host, time.monotonic())
+            return
+        state = self.host_state(host)
+        await state.limiter.acquire()
+        try:
+            await state.bucket.acquire()
+            slot = RequestSlot(self, host, time.monotonic())
+            try:
+                yield slot
+            except _TIMEOUT_ERRORS:
+                Metrics.counter("http.host_timeouts").inc(1)
+                state.limiter.on_congestion()
+                raise
+            if not slot.observed and time.monotonic() - slot.started <= self.slow_after:
+                state.limiter.on_success()
+        finally:
+            state.limiter.release()
+
+    def observe(self, host: str, status: int, headers: Any, latency: float) -> None:
+        state = self.host_state(host)
+        if status == 429 or status >= 500:
+            Metrics.counter("http.host_throttled").inc(1)
+            state.limiter.on_congestion()
+            if status in (429, 503):
+                delay = parse_retry_after(headers.get("Retry-After"), self.max_retry_after)
+                if delay:
+                    state.bucket.block_for(delay)
+        elif status < 400 and latency <= self.slow_after:
+            state.limiter.on_success()
+
+
+_schedulers: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, HostScheduler]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def get_host_scheduler() -> HostScheduler:
+    """Scheduler for the running event loop, configured from env.
+
+    - T4L_HOST_SCHEDULER: set to 0 to disable rate limiting (default 1)
+    - T4L_HOST_RATE / T4L_HOST_BURST: requests per second and burst per host (8 / 16)
+    - T4L_HOST_CONCURRENCY / T4L_HOST_MAX_CONCURRENCY: initial and max in-flight
+      requests per host (4 / 16)
+    - T4L_HOST_SLOW_AFTER: responses slower than this (seconds) do not ramp up (2.0)
+
+    Like the async HTTP client, one scheduler is kept per event loop since its waiters
+    are loop-bound futures.
+    """
+    loop = asyncio.get_running_loop()
+    scheduler = _schedulers.get(loop)
+    if scheduler is None:
+        scheduler = HostScheduler(
+            rate=float(os.getenv("T4L_HOST_RATE", "8")),
+            burst=float(os.getenv("T4L_HOST_BURST", "16")),
+            initial_concurrency=int(os.getenv("T4L_HOST_CONCURRENCY", "4")),
+            max_concurrency=int(os.getenv("T4L_HOST_MAX_CONCURRENCY", "16")),
+            slow_after=float(os.getenv("T4L_HOST_SLOW_AFTER", "2.0")),
+            enabled=bool(int(os.getenv("T4L_HOST_SCHEDULER", "1"))),
+        )
+        _schedulers[loop] = scheduler
+    return scheduler
@@ -13,6 +13,15 @@ class Evidence:
 
 _TIER_WEIGHT = {"A": 1.0, "B": 0.7, "C": 0.4}
 
+# Official league sources (Tier A); every other publisher counts as Tier C until a
+# tier policy is configured per source
+_OFFICIAL_PUBLISHERS = {"nfl.com", "nfl"}
+
+
+def source_tier(publisher: str | None) -> str:
+    """Tier ("A"|"B"|"C") of a source by publisher name."""
+    return "A" if (publisher or "").strip().lower() in _OFFICIAL_PUBLISHERS else "C"
+
 
 def _tier_weight(tier: str | None) -> float:
     return _TIER_WEIGHT.get((tier or "").upper(), 0.3)
@@ -97,4 +106,4 @@ def compute_claim_confidence(sources: Iterable[Mapping]) -> float:
     return round(score, 2)
 
 
-__all__ = ["compute_event_confidence", "compute_claim_confidence"]
+__all__ = ["compute_event_confidence", "compute_claim_confidence", "source_tier"]
@@ -1,10 +1,8 @@
-import asyncio
-import os
-from typing import Any, Dict, List
+from typing import Any, Dict, List, Optional
 
-import requests
-
-from . import rss_parser
+from . import http_client, rss_parser
+from .async_processor import HostScheduler, get_host_scheduler
+from .http_cache import ValidatorStore, get_validator_store
 from .logger import log_json
 
 
@@ -15,43 +13,61 @@ class FeedIngester:
       - async fetch_feed(self, feed_url: str) -> Dict[str, Any]
       - async extract_articles(self, feed_data: Dict[str, Any]) -> List[Dict[str, Any]]
       - standardize_article(self, raw_article: Dict[str, Any]) -> Dict[str, Any]
+
+    Fetches are conditional: validators from earlier 200s are sent along and a
+    ``304`` comes back as ``{"status": 304, "not_modified": True, "content": ""}``.
+    Requests go through a per-host ``HostScheduler`` (the running loop's by default).
     """
 
+    def __init__(
+        self,
+        validators: Optional[ValidatorStore] = None,
+        scheduler: Optional[HostScheduler] = None,
+    ) -> None:
+        self.validators = validators if validators is not None else get_validator_store()
+        self.scheduler = scheduler
+
     async def fetch_feed(self, feed_url: str) -> Dict[str, Any]:
-        def _get() -> Dict[str, Any]:
-            headers = {
-                "User-Agent": os.getenv(
-                    "T4L_USER_AGENT",
-                    "T4L-End2End/1.0 (+https://github.com/BigSlikTobi/T4L_End2End)",
-                ),
-                "Accept": "application/rss+xml, application/xml;q=0.9, */*;q=0.8",
-            }
-            resp = requests.get(feed_url, timeout=15, headers=headers)
-            if resp.status_code != 200:
-                try:
-                    log_json(
-                        "WARNING",
-                        "feed_fetch_non_200",
-                        url=feed_url,
-                        status=resp.status_code,
-                        content_type=resp.headers.get("Content-Type"),
-                    )
-                except Exception:
-                    pass
-            text = resp.text
-            if not text and resp.content:
-                try:
-                    text = resp.content.decode(resp.encoding or "utf-8", errors="ignore")
-                except Exception:
-                    text = resp.text
+        headers = {"Accept": "application/rss+xml, application/xml;q=0.9, */*;q=0.8"}
+        headers.update(self.validators.request_headers(feed_url))
+        client = http_client.get_async_client()
+        scheduler = self.scheduler or get_host_scheduler()
+        async with scheduler.slot(feed_url) as slot:
+            resp = await client.get(feed_url, timeout=15, headers=headers)
+            slot.observe(resp)
+        if resp.status_code == 304:
             return {
                 "url": feed_url,
-                "status": resp.status_code,
-                "content": text,
+                "status": 304,
+                "not_modified": True,
+                "content": "",
                 "headers": dict(resp.headers),
             }
-
-        return await asyncio.to_thread(_get)
+        if resp.status_code == 200:
+            self.validators.remember(feed_url, resp.headers)
+        else:
+            try:
+                log_json(
+                    "WARNING",
+                    "feed_fetch_non_200",
+                    url=feed_url,
+                    status=resp.status_code,
+                    content_type=resp.headers.get("Content-Type"),
+                )
+            except Exception:
+                pass
+        text = resp.text
+        if not text and resp.content:
+            try:
+                text = resp.content.decode(resp.encoding or "utf-8", errors="ignore")
+            except Exception:
+                text = resp.text
+        return {
+            "url": feed_url,
+            "status": resp.status_code,
+            "content": text,
+            "headers": dict(resp.headers),
+        }
 
     async def extract_articles(self, feed_data: Dict[str, Any]) -> List[Dict[str, Any]]:
         content = feed_data.get("content", "")
@@ -0,0 +1,162 @@
+"""Compiled, early-stopping HTML field extraction on top of lxml.
+
+Selector lists are compiled once into XPath expressions. Documents are fed to lxml's
+C-backed pull parser in chunks, and parsing stops as soon as every field's
+highest-priority selector has matched a fully parsed element. Later markup cannot
+change the result at that point. Only the simple CSS forms used by our extractors
+are supported: ``tag``, ``.class``, ``#id``, ``[attr]`` and ``[attr="value"]``.
+"""
+
+from __future__ import annotations
+
+import re
+from dataclasses import dataclass
+from typing import Any, Dict, List, Mapping, Optional, Sequence, Set, Union
+
+import lxml.html
+from lxml import etree
+
+_SIMPLE_SELECTOR = re.compile(
+    r"""^(?P<tag>[a-zA-Z][a-zA-Z0-9-]*|\*)?"""
+    r"""(?P<rest>(?:\.[\w-]+|\#[\w-]+|\[[\w-]+(?:=(?:"[^"]*"|'[^']*'|[\w-]+))?\])*)$"""
+)
+_PART = re.compile(
+    r"""\.(?P<cls>[\w-]+)|\#(?P<id>[\w-]+)"""
+    r"""|\[(?P<attr>[\w-]+)(?:=(?P<val>"[^"]*"|'[^']*'|[\w-]+))?\]"""
+)
+
+
+def css_to_xpath(selector: str) -> str:
+    """Translate a simple CSS selector into a descendant XPath expression."""
+    m = _SIMPLE_SELECTOR.match(selector.strip())
+    if not m or not (m.group("tag") or m.group("rest")):
+        raise ValueError(f"Unsupported selector: {selector!r}")
+    conds: List[str] = []
+    for part in _PART.finditer(m.group("rest") or ""):
+        if part.group("cls"):
+            conds.append(
+                f"contains(concat(' ', normalize-space(@class), ' '), ' {part.group('cls')} ')"
+            )
+        elif part.group("id"):
+            conds.append(f"@id='{part.group('id')}'")
+        elif part.group("val") is not None:
+            val = part.group("val").strip("\"'")
+            conds.append(f"@{part.group('attr')}='{val}'")
+        else:
+            conds.append(f"@{part.group('attr')}")
+    tag = (m.group("tag") or "*").lower()
+    return f"//{tag}" + "".join(f"[{c}]" for c in conds)
+
+
+@dataclass(frozen=True)
+class CompiledSelectorList:
+    """Ordered fallback selectors for one field, compiled once."""
+
+    selectors: tuple[str, ...]
+    xpaths: tuple[etree.XPath, ...]
+
+    @classmethod
+    def compile(cls, selectors: Sequence[str]) -> "CompiledSelectorList":
+        return cls(
+            tuple(selectors), tuple(etree.XPath(f"({css_to_xpath(s)})[1]") for s in selectors)
+        )
+
+    def first(self, root: Any) -> Optional[Any]:
+        """Mirror of trying ``soup.select_one`` per selector until one matches.
+
+        Like BeautifulSoup, only the first match of each selector is considered, and an
+        empty element is still a match (a bs4 Tag is always truthy).
+        """
+        for xp in self.xpaths:
+            found = xp(root)
+            if found:
+                return found[0]
+        return None
+
+    def top(self, root: Any) -> Optional[Any]:
+        found = self.xpaths[0](root) if self.xpaths else []
+        return found[0] if found else None
+
+
+_NON_TEXT_TAGS = frozenset({"script", "style", "template"})
+
+
+def text_of(el: Any) -> str:
+    """Equivalent of BeautifulSoup's ``get_text(strip=True)`` (script/style text skipped)."""
+    parts: List[str] = []
+    for node in el.iter():
+        if isinstance(node.tag, str) and node.tag not in _NON_TEXT_TAGS and node.text:
+            parts.append(node.text)
+        if node is not el and node.tail:
+            parts.append(node.tail)
+    return "".join(p.strip() for p in parts if p.strip())
+
+
+class FieldExtractor:
+    """Parse HTML until every field's preferred selector has been resolved.
+
+    ``fields`` maps a field name to its ordered selector list.
+    """
+
+    def __init__(self, fields: Mapping[str, Sequence[str]], chunk_size: int = 16384) -> None:
+        self.fields = {name: CompiledSelectorList.compile(sel) for name, sel in fields.items()}
+        self.chunk_size = chunk_size
+
+    def parse(self, html: Union[str, bytes]) -> "ParsedFields":
+        parser = etree.HTMLPullParser(events=("start", "end"), remove_comments=True)
+        parser.set_element_class_lookup(lxml.html.HtmlElementClassLookup())
+        root: Optional[Any] = None
+        open_elements: Set[Any] = set()
+        for i in range(0, len(html), self.chunk_size):
+            parser.feed(html[i : i + self.chunk_size])
+            for event, el in parser.read_events():
+                if event == "start":
+                    if root is None:
+                        root = el.getroottree().getroot()
+                    open_elements.add(el)
+                else:
+                    open_elements.discard(el)
+            if root is not None and self._resolved(root, open_elements):
+                break
+        else:
+            try:
+                root = parser.close()
+            except etree.XMLSyntaxError:
+                root = None
+        if root is None:
+            return ParsedFields(None, {name: None for name in self.fields})
+        return ParsedFields(root, {name: sel.first(root) for name, sel in self.fields.items()})
+
+    def _resolved(self, root: Any, open_elements: Set[Any]) -> bool:
+        # Every element already started is in the partial tree, and anything parsed later
+        # comes after it in document order. So once the first match of a field's
+        # top-priority selector is closed, no further input can change that field.
+        for sel in self.fields.values():
+            el = sel.top(root)
+            if el is None or el in open_elements:
+                return False
+        return True
+
+
+@dataclass
+class ParsedFields:
+    root: Any
+    elements: Dict[str, Optional[Any]]
+
+    def get(self, name: str) -> Optional[Any]:
+        return self.elements.get(name)
+
+    def title_tag(self) -> Optional[Any]:
+        if self.root is None:
+            return None
+        found = self.root.xpath("(//title)[1]")
+        return found[0] if found else None
+
+
+__all__ = [
+    "css_to_xpath",
+    "CompiledSelectorList",
+    "FieldExtractor",
+    "ParsedFields",
+    "text_of",
+]
@@ -0,0 +1,130 @@
+"""Persisted ETag/Last-Modified validators for conditional GETs.
+
+Feeds and sitemaps are polled far more often than they change. Remembering the
+validators a server sent lets the next poll ask ``If-None-Match``/``If-Modified-Since``
+and skip the download, parse and persist work entirely on ``304 Not Modified``.
+
+Validators are staged in memory when a response arrives and only written to disk on
+``save()``; callers should ``forget()`` a URL whose content failed to process so the
+next run fetches it in full again.
+"""
+
+from __future__ import annotations
+
+import json
+import os
+import threading
+from typing import Dict, Mapping, Optional
+
+DEFAULT_CACHE_PATH = "./.t4l_http_cache.json"
+
+
+class ValidatorStore:
+    """URL-keyed store of HTTP cache validators backed by a small JSON file."""
+
+    def __init__(self, path: Optional[str] = None, enabled: bool = True) -> None:
+        self.path = path or DEFAULT_CACHE_PATH
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._entries: Optional[Dict[str, Dict[str, str]]] = None
+        self._dirty = False
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        # Caller holds the lock
+        if self._entries is None:
+            try:
+                with open(self.path, "r", encoding="utf-8") as f:
+                    data = json.load(f)
+                self._entries = data if isinstance(data, dict) else {}
+            except Exception:
+                # Missing or corrupt cache simply means unconditional fetches
+                self._entries = {}
+        return self._entries
+
+    def get(self, url: str) -> Optional[Dict[str, str]]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            entry = self._load().get(url)
+            return dict(entry) if entry else None
+
+    def request_headers(self, url: str) -> Dict[str, str]:
+        """Conditional request headers for ``url`` (empty when nothing is known)."""
+        entry = self.get(url) or {}
+        headers: Dict[str, str] = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def remember(self, url: str, response_headers: Mapping[str, str]) -> None:
+        """Stage the validators from a 200 response; no-op if the server sent none."""
+        if not self.enabled:
+            return
+        lowered = {str(k).lower(): v for k, v in response_headers.items()}
+        entry = {
+            k: str(lowered[h])
+            for k, h in (("etag", "etag"), ("last_modified", "last-modified"))
+            if lowered.get(h)
+        }
+        with self._lock:
+            entries = self._load()
+            if entry:
+                if entries.get(url) != entry:
+                    entries[url] = entry
+                    self._dirty = True
+            elif url in entries:
+                # Server stopped sending validators; don't keep stale ones around
+                del entries[url]
+                self._dirty = True
+
+    def forget(self, url: str) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            if self._load().pop(url, None) is not None:
+                self._dirty = True
+
+    def save(self) -> None:
+        """Atomically persist staged validators to disk."""
+        if not self.enabled:
+            return
+        with self._lock:
+            if not self._dirty or self._entries is None:
+                return
+            tmp = f"{self.path}.tmp"
+            try:
+                with open(tmp, "w", encoding="utf-8") as f:
+                    json.dump(self._entries, f, indent=0, sort_keys=True)
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except Exception:
+                # Best-effort: losing validators only costs a full fetch next time
+                pass
+
+
+_default_store: Optional[ValidatorStore] = None
+_default_lock = threading.Lock()
+
+
+def get_validator_store() -> ValidatorStore:
+    """Process-wide store configured from env.
+
+    - T4L_HTTP_CACHE: set to 0 to disable conditional GETs (default 1)
+    - T4L_HTTP_CACHE_PATH: JSON file location (default ./.t4l_http_cache.json)
+    """
+    global _default_store
+    with _default_lock:
+        path = os.getenv("T4L_HTTP_CACHE_PATH", DEFAULT_CACHE_PATH)
+        enabled = bool(int(os.getenv("T4L_HTTP_CACHE", "1")))
+        if (
+            _default_store is None
+            or _default_store.path != path
+            or _default_store.enabled != enabled
+        ):
+            _default_store = ValidatorStore(path, enabled=enabled)
+        return _default_store
+
+
+__all__ = ["DEFAULT_CACHE_PATH", "ValidatorStore", "get_validator_store"]
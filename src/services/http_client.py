@@ -0,0 +1,107 @@
+"""Shared HTTP client pool for feed, sitemap and article fetches.
+
+One ``httpx`` client is kept per process (sync) and per event loop (async) so that
+connections are pooled and kept alive per host across sources instead of paying a
+TCP+TLS handshake for every request. HTTP/2 can be enabled with ``T4L_HTTP2=1`` when
+the optional ``h2`` package is installed.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import importlib.util
+import os
+import threading
+import weakref
+from typing import Any, Dict, Optional
+
+import httpx
+
+DEFAULT_USER_AGENT = "T4L-End2End/1.0 (+https://github.com/BigSlikTobi/T4L_End2End)"
+
+_lock = threading.Lock()
+_sync_client: Optional[httpx.Client] = None
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = (
+    weakref.WeakKeyDictionary()
+)
+
+
+def user_agent() -> str:
+    return os.getenv("T4L_USER_AGENT", DEFAULT_USER_AGENT)
+
+
+def http2_enabled() -> bool:
+    """Whether HTTP/2 is requested via env and supported by the installed extras."""
+    flag = os.getenv("T4L_HTTP2", "").strip().lower() in ("1", "true", "yes", "on")
+    return flag and importlib.util.find_spec("h2") is not None
+
+
+def _limits() -> httpx.Limits:
+    return httpx.Limits(
+        max_connections=int(os.getenv("T4L_HTTP_MAX_CONNECTIONS", "50")),
+        max_keepalive_connections=int(os.getenv("T4L_HTTP_MAX_KEEPALIVE", "20")),
+        keepalive_expiry=float(os.getenv("T4L_HTTP_KEEPALIVE_EXPIRY", "60")),
+    )
+
+
+def _client_kwargs() -> Dict[str, Any]:
+    return {
+        "headers": {"User-Agent": user_agent()},
+        "limits": _limits(),
+        "timeout": httpx.Timeout(float(os.getenv("T4L_HTTP_TIMEOUT", "20"))),
+        "follow_redirects": True,
+        "http2": http2_enabled(),
+    }
+
+
+def get_client() -> httpx.Client:
+    """Return the process-wide synchronous client (thread-safe)."""
+    global _sync_client
+    with _lock:
+        if _sync_client is None or _sync_client.is_closed:
+            _sync_client = httpx.Client(**_client_kwargs())
+        return _sync_client
+
+
+def get_async_client() -> httpx.AsyncClient:
+    """Return the async client bound to the running event loop.
+
+    Async clients cannot be shared across event loops, so one is kept per loop and
+    dropped automatically when the loop is garbage collected.
+    """
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_clients.get(loop)
+        if client is None or client.is_closed:
+            client = httpx.AsyncClient(**_client_kwargs())
+            _async_clients[loop] = client
+        return client
+
+
+async def aclose_async_client() -> None:
+    """Close the async client of the running loop, if one was created."""
+    loop = asyncio.get_running_loop()
+    with _lock:
+        client = _async_clients.pop(loop, None)
+    if client is not None:
+        await client.aclose()
+
+
+def close_client() -> None:
+    """Close the process-wide synchronous client, if one was created."""
+    global _sync_client
+    with _lock:
+        client, _sync_client = _sync_client, None
+    if client is not None:
+        client.close()
+
+
+__all__ = [
+    "DEFAULT_USER_AGENT",
+    "user_agent",
+    "http2_enabled",
+    "get_client",
+    "get_async_client",
+    "aclose_async_client",
+    "close_client",
+]
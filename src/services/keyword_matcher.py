@@ -0,0 +1,148 @@
+"""Compiled multi-keyword matcher (Aho–Corasick) for the relevance filter.
+
+Testing every keyword with ``k in text`` costs one scan of the text per keyword,
+so the filter slows down linearly as the keyword list grows to every team,
+nickname and star player. ``KeywordMatcher`` compiles a keyword set once into an
+automaton that finds all of them in a single scan, so its cost follows the length
+of the text rather than the number of keywords:
+
+    matcher = compile_keywords(("chiefs", "mahomes", "nfl"))
+    title_hits, summary_hits, url_hits = matcher.count_fields(title, summary, url)
+
+Matching is case-insensitive. A hit count is the number of keyword entries found at
+least once, so it equals ``sum(1 for k in keywords if k.lower() in text.lower())``
+(a keyword listed twice counts twice). With ``word_boundary=True`` a keyword
+only matches when it is not preceded or followed by a letter, digit or underscore
+("jets" then no longer matches "jetsam").
+
+The automaton is stored as a full transition table (failure links folded in), so
+scanning costs one dictionary lookup per character. That Python-level loop is slower
+than a few dozen ``in`` tests (which run in C), so small keyword sets without word
+boundaries are still matched with substring tests. Past that size the gain grows with
+the number of keywords, but how much depends on the texts and the interpreter;
+``tests/performance/test_keyword_matcher_benchmark.py`` measures it when run with
+``T4L_BENCHMARKS=1``.
+"""
+
+from __future__ import annotations
+
+from collections import deque
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+# Up to this many distinct keywords, per-keyword ``in`` tests beat one Python-level
+# scan of the text (break-even is around 35-40 on ~70-character titles)
+SUBSTRING_MAX_KEYWORDS = 32
+
+
+class KeywordMatcher:
+    """Finds which of a fixed set of keywords occur in a text."""
+
+    def __init__(self, keywords: Iterable[str], word_boundary: bool = False) -> None:
+        self.keywords: Tuple[str, ...] = tuple(keywords)
+        self.word_boundary = word_boundary
+        # Distinct lowercased patterns and how many keyword entries each stands for
+        weights: Dict[str, int] = {}
+        for k in self.keywords:
+            if k:
+                weights[k.lower()] = weights.get(k.lower(), 0) + 1
+        self._patterns: List[str] = list(weights)
+        self._weights: List[int] = list(weights.values())
+        self._substring = not word_boundary and len(self._patterns) <= SUBSTRING_MAX_KEYWORDS
+        if not self._substring:
+            self._build()
+
+    def _build(self) -> None:
+        # Trie of the patterns
+        goto: List[Dict[str, int]] = [{}]
+        out: List[List[int]] = [[]]
+        for pid, pattern in enumerate(self._patterns):
+            state = 0
+            for ch in pattern:
+                nxt = goto[state].get(ch)
+                if nxt is None:
+                    nxt = len(goto)
+                    goto[state][ch] = nxt
+                    goto.append({})
+                    out.append([])
+                state = nxt
+            out[state].append(pid)
+
+        # Breadth-first: complete each state's transitions with its failure state's
+        # (already complete) ones and inherit the patterns that end there
+        delta: List[Dict[str, int]] = [dict(goto[0])] + [{} for _ in goto[1:]]
+        fail = [0] * len(goto)
+        queue = deque(goto[0].values())
+        while queue:
+            state = queue.popleft()
+            out[state] = out[state] + out[fail[state]]
+            delta[state] = dict(delta[fail[state]])
+            for ch, nxt in goto[state].items():
+                delta[state][ch] = nxt
+                fail[nxt] = delta[fail[state]].get(ch, 0)
+                queue.append(nxt)
+        self._delta = delta
+        # Per state: (pattern id, pattern length) of every pattern ending there
+        self._out: List[Tuple[Tuple[int, int], ...]] = [
+            tuple((pid, len(self._patterns[pid])) for pid in pids) for pids in out
+        ]
+
+    def find(self, text: str) -> List[str]:
+        """Distinct lowercased keywords occurring in ``text``, in keyword order."""
+        return [self._patterns[pid] for pid in sorted(self._scan([text])[0])]
+
+    def count(self, text: str) -> int:
+        """Number of keyword entries occurring in ``text``."""
+        return self.count_fields(text)[0]
+
+    def count_fields(self, *texts: str) -> Tuple[int, ...]:
+        """``count()`` for each of ``texts``, in one pass over all of them."""
+        weights = self._weights
+        return tuple(sum(weights[pid] for pid in hits) for hits in self._scan(texts))
+
+    def _scan(self, texts: Sequence[str]) -> List[set]:
+        if self._substring:
+            patterns = self._patterns
+            results = []
+            for text in texts:
+                text = (text or "").lower()
+                results.append({pid for pid, p in enumerate(patterns) if p in text})
+            return results
+        return [self._scan_automaton((text or "").lower()) for text in texts]
+
+    def _scan_automaton(self, text: str) -> set:
+        delta, out = self._delta, self._out
+        found: set = set()
+        state = 0
+        if not self.word_boundary:
+            for ch in text:
+                state = delta[state].get(ch, 0)
+                if out[state]:
+                    found.update(pid for pid, _ in out[state])
+            return found
+        for i, ch in enumerate(text):
+            state = delta[state].get(ch, 0)
+            if out[state]:
+                for pid, length in out[state]:
+                    if _at_word_boundary(text, i + 1 - length, i + 1):
+                        found.add(pid)
+        return found
+
+
+def _at_word_boundary(text: str, start: int, end: int) -> bool:
+    before = text[start - 1] if start > 0 else ""
+    after = text[end] if end < len(text) else ""
+    return not _is_word_char(before) and not _is_word_char(after)
+
+
+def _is_word_char(ch: str) -> bool:
+    return bool(ch) and (ch.isalnum() or ch == "_")
+
+
+@lru_cache(maxsize=32)
+def compile_keywords(keywords: Tuple[str, ...], word_boundary: bool = False) -> KeywordMatcher:
+    """Shared matcher for a keyword tuple; built once per keyword set."""
+    return KeywordMatcher(keywords, word_boundary=word_boundary)
+
+
+__all__ = ["SUBSTRING_MAX_KEYWORDS", "KeywordMatcher", "compile_keywords"]
@@ -0,0 +1,342 @@
+"""Set-based writer for the local knowledge graph (events, links, sources, claims).
+
+``SimplifiedPipeline`` used to look up the event, the event/article link, the source
+and every claim of each article with its own query, flushing after each insert. This
+writer builds the same graph for a whole batch of articles with a few ``IN`` queries
+and one multi-row insert per table (Core statements, chunked):
+
+1. compute every event signature and preload the matching events;
+2. insert the missing events, then preload the existing event/article links;
+3. preload the sources and claims the batch refers to and insert the missing ones;
+4. add the new links and one claim source per extracted claim.
+
+``recompute_event_confidence`` then rescores only the events a batch touched.
+
+Rows are matched as before: events by signature, links by ``(event_id, article_id)``
+and sources by ``(name, url)``. Claims are matched by ``(event_id, claim_hash)``.
+Events, links, claims and claim sources are inserted with ``ON CONFLICT DO NOTHING``
+against their unique indexes, so re-running a batch adds no duplicates, and a writer
+racing another one (sources persisted concurrently, without the SQLite writer thread)
+re-reads the events and claims the other inserted instead of failing.
+Within a batch the first article of an event provides its date, title and summary,
+and the first occurrence of a claim or claim source its status or citation.
+"""
+
+from __future__ import annotations
+
+import hashlib
+from dataclasses import dataclass, field
+from datetime import datetime, timezone
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Set, Tuple, cast
+
+from sqlalchemy import Insert, Table, case, insert, select, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.orm import Session
+
+from models import ClaimORM, ClaimSourceORM, EventArticleORM, EventORM, SourceORM
+from models.kg import claim_hash
+
+from .claim_extractor import ClaimCandidate, extract_allowlisted_claims
+from .confidence import compute_event_confidence, source_tier
+from .signature import event_signature
+
+# Bound parameters per IN list; well under SQLite's variable limit
+_CHUNK = 500
+
+
+def _table(orm: Any) -> Table:
+    return cast(Table, orm.__table__)
+
+
+def pseudo_article_id(url: str) -> int:
+    """Stable 31-bit id for an article URL; negative to avoid clashing with real IDs."""
+    if not url:
+        return 0
+    return -(int(hashlib.sha1(url.encode("utf-8")).hexdigest(), 16) % 2147483647)
+
+
+def _parse_pub(pub: Any) -> Optional[datetime]:
+    try:
+        if isinstance(pub, str):
+            from dateutil import parser as dtp
+
+            return dtp.parse(pub)
+        return pub or None
+    except Exception:
+        return None
+
+
+def _chunks(values: Sequence[Any]) -> Iterator[Sequence[Any]]:
+    for i in range(0, len(values), _CHUNK):
+        yield values[i : i + _CHUNK]
+
+
+@dataclass
+class _Item:
+    title: str
+    summary: Optional[str]
+    published: Optional[datetime]
+    signature: str
+    article_id: int
+    source_key: Tuple[str, Optional[str]]
+    claims: List[ClaimCandidate] = field(default_factory=list)
+
+
+def _prepare(article: Dict[str, Any]) -> _Item:
+    title = article.get("title") or ""
+    published = _parse_pub(article.get("publication_date"))
+    url = article.get("url") or ""
+    return _Item(
+        title=title,
+        summary=article.get("content_summary"),
+        published=published,
+        signature=event_signature(title, published),
+        article_id=pseudo_article_id(url),
+        source_key=(article.get("publisher") or "unknown", article.get("url") or None),
+        claims=extract_allowlisted_claims(title, article.get("content_summary") or ""),
+    )
+
+
+def _insert_ignoring_conflicts(session: Session, table: Table) -> Insert:
+    """INSERT that skips rows violating a unique index (plain INSERT elsewhere)."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "sqlite":
+        return sqlite.insert(table).on_conflict_do_nothing()
+    if dialect == "postgresql":
+        return postgresql.insert(table).on_conflict_do_nothing()
+    return insert(table)
+
+
+def _insert_returning(
+    session: Session,
+    table: Table,
+    rows: List[Dict[str, Any]],
+    *keys: str,
+    ignore_conflicts: bool = False,
+) -> Dict[Tuple[Any, ...], int]:
+    """Multi-row INSERT ... RETURNING; maps each row's ``keys`` values to its new id.
+
+    With ``ignore_conflicts`` rows that already exist are skipped and not returned.
+    """
+    ids: Dict[Tuple[Any, ...], int] = {}
+    cols = [table.c[k] for k in keys]
+    for chunk in _chunks(rows):
+        stmt = _insert_ignoring_conflicts(session, table) if ignore_conflicts else insert(table)
+        stmt = stmt.values(list(chunk)).returning(table.c.id, *cols)
+        for rid, *key in session.execute(stmt):
+            ids[tuple(key)] = rid
+    return ids
+
+
+@dataclass
+class GraphWrite:
+    """Outcome of ``write_event_graph``: new links and the events the batch touched."""
+
+    links_created: int = 0
+    event_ids: Set[int] = field(default_factory=set)
+
+
+def write_event_graph(session: Session, articles: Iterable[Dict[str, Any]]) -> GraphWrite:
+    """Persist events, links, sources and claims for ``articles``; does not commit."""
+    items = [_prepare(a) for a in articles]
+    if not items:
+        return GraphWrite()
+    now = datetime.now(timezone.utc)
+    session.flush()
+
+    # Events by signature
+    signatures = list(dict.fromkeys(it.signature for it in items))
+    events = _lookup_events(session, signatures)
+    for chunk in _chunks(list(events.values())):
+        session.execute(update(EventORM).where(EventORM.id.in_(chunk)).values(updated_at=now))
+    new_events: Dict[str, Dict[str, Any]] = {}
+    for it in items:
+        if it.signature not in events and it.signature not in new_events:
+            new_events[it.signature] = {
+                "signature": it.signature,
+                "event_date": it.published,
+                "event_type": None,
+                "title": it.title,
+                "summary": it.summary,
+                "confidence": None,
+                "created_at": now,
+                "updated_at": now,
+            }
+    inserted = _insert_returning(
+        session, _table(EventORM), list(new_events.values()), "signature", ignore_conflicts=True
+    )
+    events.update((sig, rid) for (sig,), rid in inserted.items())
+    if len(events) < len(signatures):
+        # Inserted concurrently by another writer since the lookup
+        events.update(_lookup_events(session, [s for s in signatures if s not in events]))
+
+    # Event/article links
+    event_ids = list(set(events.values()))
+    article_ids = list({it.article_id for it in items})
+    links: Set[Tuple[int, int]] = set()
+    for ev_chunk in _chunks(event_ids):
+        for art_chunk in _chunks(article_ids):
+            link_stmt = select(EventArticleORM.event_id, EventArticleORM.article_id).where(
+                EventArticleORM.event_id.in_(ev_chunk),
+                EventArticleORM.article_id.in_(art_chunk),
+            )
+            links.update((ev_id, art_id) for ev_id, art_id in session.execute(link_stmt))
+    new_links = []
+    for it in items:
+        key = (events[it.signature], it.article_id)
+        if key not in links:
+            links.add(key)
+            new_links.append({"event_id": key[0], "article_id": key[1], "relation": "primary"})
+    if new_links:
+        # Links stored by a concurrent writer since the lookup conflict and are skipped
+        session.execute(_insert_ignoring_conflicts(session, _table(EventArticleORM)), new_links)
+
+    # Sources and claims, for articles with allowlisted claims only
+    claimed = [it for it in items if it.claims]
+    if claimed:
+        sources = _sources_for(session, [it.source_key for it in claimed])
+        claims = _claims_for(session, [(events[it.signature], it) for it in claimed])
+        claim_sources: Dict[Tuple[int, int, Optional[str]], Dict[str, Any]] = {}
+        for it in claimed:
+            for c in it.claims:
+                claim_id = claims[(events[it.signature], claim_hash(c.text))]
+                source_id, url = sources[it.source_key], it.source_key[1]
+                claim_sources.setdefault(
+                    (claim_id, source_id, url),
+                    {
+                        "claim_id": claim_id,
+                        "source_id": source_id,
+                        "url": url,
+                        "citation": c.citation,
+                    },
+                )
+        # Claim sources stored by earlier batches conflict and are skipped
+        session.execute(
+            _insert_ignoring_conflicts(session, _table(ClaimSourceORM)),
+            list(claim_sources.values()),
+        )
+    return GraphWrite(len(new_links), set(events.values()))
+
+
+def recompute_event_confidence(session: Session, event_ids: Iterable[int]) -> Dict[int, float]:
+    """Recompute ``events.confidence`` for ``event_ids`` only; does not commit.
+
+    Evidence is one entry per distinct source citing a claim of the event, read for
+    all events with one aggregate query over ``claim_sources``/``sources``. Claim
+    sources carry no dates, so there is no recency decay. Events without claim
+    evidence count their linked article as one Tier C report. Scores are written
+    with one ``UPDATE ... CASE`` per chunk of events.
+    """
+    ids = sorted(set(event_ids))
+    evidence: Dict[int, List[Dict[str, Any]]] = {i: [] for i in ids}
+    for chunk in _chunks(ids):
+        stmt = (
+            select(ClaimORM.event_id, SourceORM.publisher, SourceORM.name)
+            .join(ClaimSourceORM, ClaimSourceORM.claim_id == ClaimORM.id)
+            .join(SourceORM, SourceORM.id == ClaimSourceORM.source_id)
+            .where(ClaimORM.event_id.in_(chunk))
+            .group_by(ClaimORM.event_id, SourceORM.publisher, SourceORM.name)
+        )
+        for ev_id, publisher, name in session.execute(stmt):
+            evidence[ev_id].append({"source_tier": source_tier(publisher or name)})
+    scores = {
+        ev_id: compute_event_confidence(items or [{"source_tier": "C"}])
+        for ev_id, items in evidence.items()
+    }
+    for chunk in _chunks(ids):
+        session.execute(
+            update(EventORM)
+            .where(EventORM.id.in_(chunk))
+            .values(confidence=case({i: scores[i] for i in chunk}, value=EventORM.id))
+            .execution_options(synchronize_session=False)
+        )
+    return scores
+
+
+def _lookup_events(session: Session, signatures: Sequence[str]) -> Dict[str, int]:
+    found: Dict[str, int] = {}
+    for chunk in _chunks(signatures):
+        stmt = select(EventORM.signature, EventORM.id).where(EventORM.signature.in_(chunk))
+        found.update((sig, ev_id) for sig, ev_id in session.execute(stmt))
+    return found
+
+
+def _source_lookup(names: Sequence[str]) -> Any:
+    return (
+        select(SourceORM.name, SourceORM.url, SourceORM.id)
+        .where(SourceORM.name.in_(names))
+        .order_by(SourceORM.id)
+    )
+
+
+def _claim_lookup(event_ids: Sequence[int], hashes: Sequence[str]) -> Any:
+    return select(ClaimORM.event_id, ClaimORM.claim_hash, ClaimORM.id).where(
+        ClaimORM.event_id.in_(event_ids), ClaimORM.claim_hash.in_(hashes)
+    )
+
+
+def _sources_for(
+    session: Session, keys: List[Tuple[str, Optional[str]]]
+) -> Dict[Tuple[str, Optional[str]], int]:
+    found: Dict[Tuple[str, Optional[str]], int] = {}
+    names = list(dict.fromkeys(name for name, _ in keys))
+    wanted = set(keys)
+    for chunk in _chunks(names):
+        for name, url, sid in session.execute(_source_lookup(chunk)):
+            if (name, url) in wanted:
+                found.setdefault((name, url), sid)
+    missing = [
+        {"name": name, "publisher": name, "url": url}
+        for name, url in dict.fromkeys(keys)
+        if (name, url) not in found
+    ]
+    found.update(_insert_returning(session, _table(SourceORM), missing, "name", "url"))
+    return found
+
+
+def _claims_for(session: Session, pairs: List[Tuple[int, _Item]]) -> Dict[Tuple[int, str], int]:
+    """Ids of the claims of ``pairs``, keyed by ``(event_id, claim_hash)``."""
+    wanted: Dict[Tuple[int, str], Dict[str, Any]] = {}
+    for ev_id, it in pairs:
+        for c in it.claims:
+            wanted.setdefault(
+                (ev_id, claim_hash(c.text)),
+                {"event_id": ev_id, "claim_text": c.text, "status": c.status},
+            )
+    found = _lookup_claims(session, list(wanted))
+    missing = [{**row, "claim_hash": key[1]} for key, row in wanted.items() if key not in found]
+    found.update(
+        _insert_returning(
+            session,
+            _table(ClaimORM),
+            missing,
+            "event_id",
+            "claim_hash",
+            ignore_conflicts=True,
+        )
+    )
+    if len(found) < len(wanted):
+        # Inserted concurrently by another writer since the lookup
+        found.update(_lookup_claims(session, [k for k in wanted if k not in found]))
+    return found
+
+
+def _lookup_claims(session: Session, keys: List[Tuple[int, str]]) -> Dict[Tuple[int, str], int]:
+    found: Dict[Tuple[int, str], int] = {}
+    event_ids = list(dict.fromkeys(ev_id for ev_id, _ in keys))
+    hashes = list(dict.fromkeys(h for _, h in keys))
+    wanted = set(keys)
+    for ev_chunk in _chunks(event_ids):
+        for hash_chunk in _chunks(hashes):
+            for ev_id, h, cid in session.execute(_claim_lookup(ev_chunk, hash_chunk)):
+                if (ev_id, h) in wanted:
+                    found[(ev_id, h)] = cid
+    return found
+
+
+__all__ = [
+    "GraphWrite",
+    "pseudo_article_id",
+    "recompute_event_confidence",
+    "write_event_graph",
+]
@@ -16,6 +16,12 @@ class LogAggregator:
         self._repo = repo or ProcessingLogRepository()
 
     def flush(self, entries: Iterable[dict]) -> int:
+        entries = list(entries)
+        try:
+            return self._repo.add_many(entries)
+        except Exception:
+            # Fall back to row-by-row so one bad entry does not lose the batch
+            pass
         count = 0
         for e in entries:
             try:
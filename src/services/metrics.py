@@ -4,7 +4,7 @@ import threading
 import time
 from contextlib import contextmanager
 from dataclasses import dataclass, field
-from typing import Dict
+from typing import Any, Dict
 
 _lock = threading.Lock()
 
@@ -19,6 +19,20 @@ class Counter:
             self.value += n
 
 
+@dataclass
+class Gauge:
+    """Last observed level of something (e.g. a queue depth) and its high-water mark."""
+
+    name: str
+    value: int = 0
+    max: int = 0
+
+    def set(self, value: int) -> None:
+        with _lock:
+            self.value = value
+            self.max = max(self.max, value)
+
+
 @dataclass
 class Histogram:
     name: str
@@ -40,6 +54,7 @@ class Histogram:
 
 class Metrics:
     counters: Dict[str, Counter] = {}
+    gauges: Dict[str, Gauge] = {}
     histograms: Dict[str, Histogram] = {}
 
     @classmethod
@@ -48,6 +63,12 @@ class Metrics:
             cls.counters[name] = Counter(name)
         return cls.counters[name]
 
+    @classmethod
+    def gauge(cls, name: str) -> Gauge:
+        if name not in cls.gauges:
+            cls.gauges[name] = Gauge(name)
+        return cls.gauges[name]
+
     @classmethod
     def histogram(cls, name: str) -> Histogram:
         if name not in cls.histograms:
@@ -64,11 +85,12 @@ class Metrics:
             cls.histogram(name).observe(time.perf_counter() - start)
 
     @classmethod
-    def snapshot(cls) -> Dict[str, Dict[str, int]]:
+    def snapshot(cls) -> Dict[str, Dict[str, Any]]:
         # Return a serializable snapshot
         with _lock:
             return {
                 "counters": {k: v.value for k, v in cls.counters.items()},
+                "gauges": {k: {"value": v.value, "max": v.max} for k, v in cls.gauges.items()},
                 "histograms": {k: dict(v.buckets) for k, v in cls.histograms.items()},
             }
 
@@ -2,19 +2,104 @@
 
 from __future__ import annotations
 
+import asyncio
 import re
+from collections import deque
 from datetime import datetime, timedelta, timezone
-from typing import Dict, List, Optional
+from typing import Any, AsyncIterator, Coroutine, Deque, Dict, List, Optional, Tuple, TypeVar, Union
+from urllib.parse import urlparse
 
 import requests
 from bs4 import BeautifulSoup
+from lxml import etree
+
+from . import http_client
+from .async_processor import get_host_scheduler
+from .html_extract import FieldExtractor, text_of
+
+T = TypeVar("T")
+
+TITLE_SELECTORS = [
+    'h1[data-testid="headline"]',
+    "h1.headline",
+    "h1",
+    ".article-title",
+    '[data-testid="headline"]',
+]
+CONTENT_SELECTORS = [
+    '[data-testid="article-body"]',
+    ".article-body",
+    ".story-body",
+    ".content-body",
+    "article",
+    ".article-content",
+]
+AUTHOR_SELECTORS = [
+    '[data-testid="author"]',
+    ".author",
+    ".byline",
+    '[data-module="BylineModule"]',
+]
+DATE_SELECTORS = [
+    '[data-testid="publish-date"]',
+    ".publish-date",
+    ".date",
+    "time[datetime]",
+]
+UNWANTED_CONTENT_TAGS = ["script", "style", "nav", "header", "footer", "aside"]
+
+# Compiled once per process for the lxml fast path
+_ARTICLE_FIELDS = FieldExtractor(
+    {
+        "title": TITLE_SELECTORS,
+        "content": CONTENT_SELECTORS,
+        "author": AUTHOR_SELECTORS,
+        "publish_date": DATE_SELECTORS,
+    }
+)
+_UNWANTED_XPATH = etree.XPath("|".join(f".//{t}" for t in UNWANTED_CONTENT_TAGS))
+
+
+def _article_dict(
+    title: Optional[str],
+    content: str,
+    author: Optional[str],
+    publish_date: Optional[str],
+    url: str,
+) -> Dict[str, Any]:
+    # Clean title
+    if title:
+        title = re.sub(r"\s*\|\s*NFL\.com\s*$", "", title)
+        title = title.strip()
+
+    return {
+        "title": title or "NFL Article",
+        "content": content or "Content not extracted",
+        "author": author,
+        "publish_date": publish_date,
+        "url": url,
+    }
 
 
 class NFLArticleExtractor:
-    """Extract full article content from NFL.com URLs."""
-
-    def __init__(self, timeout: int = 15):
+    """Extract full article content from NFL.com URLs.
+
+    ``max_concurrency`` > 1 switches ``process_sitemap_urls`` to a bounded-concurrency
+    mode that fetches several pages at once (at most ``per_host_limit`` per host) while
+    still returning articles in sitemap order.
+    """
+
+    def __init__(
+        self,
+        timeout: int = 15,
+        max_concurrency: int = 1,
+        per_host_limit: int = 4,
+        fast_html: bool = True,
+    ):
         self.timeout = timeout
+        self.fast_html = fast_html
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.per_host_limit = max(1, int(per_host_limit))
         self.session = requests.Session()
         self.session.headers.update(
             {
@@ -50,116 +135,155 @@ class NFLArticleExtractor:
         try:
             response = self.session.get(url, timeout=self.timeout)
             response.raise_for_status()
+            return self.parse_article_html(response.content, url)
+        except Exception as e:
+            print(f"Failed to extract content from {url}: {e}")
+            return None
 
-            soup = BeautifulSoup(response.content, "html.parser")
-
-            # Extract title - try multiple selectors
-            title = None
-            title_selectors = [
-                'h1[data-testid="headline"]',
-                "h1.headline",
-                "h1",
-                ".article-title",
-                '[data-testid="headline"]',
-            ]
-
-            for selector in title_selectors:
-                title_elem = soup.select_one(selector)
-                if title_elem:
-                    title = title_elem.get_text(strip=True)
-                    break
+    async def extract_article_content_async(self, url: str) -> Optional[Dict[str, str]]:
+        """Async variant of ``extract_article_content`` using the shared connection pool.
+
+        Sends the same headers as ``self.session`` so both paths look identical to NFL.com.
+        """
+        # Connection-specific headers are invalid under HTTP/2; the pool manages keep-alive.
+        headers = {
+            k: v.decode("latin-1") if isinstance(v, bytes) else v
+            for k, v in self.session.headers.items()
+            if k.lower() != "connection"
+        }
+        try:
+            client = http_client.get_async_client()
+            async with get_host_scheduler().slot(url) as slot:
+                response = await client.get(url, headers=headers, timeout=self.timeout)
+                slot.observe(response)
+            response.raise_for_status()
+            # Parse off the event loop so concurrent fetches keep flowing
+            return await asyncio.to_thread(self.parse_article_html, response.content, url)
+        except Exception as e:
+            print(f"Failed to extract content from {url}: {e}")
+            return None
 
-            if not title:
-                title = soup.title.get_text(strip=True) if soup.title else "NFL Article"
-
-            # Extract content - try multiple selectors
-            content = ""
-            content_selectors = [
-                '[data-testid="article-body"]',
-                ".article-body",
-                ".story-body",
-                ".content-body",
-                "article",
-                ".article-content",
-            ]
-
-            for selector in content_selectors:
-                content_elem = soup.select_one(selector)
-                if content_elem:
-                    # Remove script, style, and nav elements
-                    for unwanted in content_elem.find_all(
-                        ["script", "style", "nav", "header", "footer", "aside"]
-                    ):
-                        unwanted.decompose()
-
-                    # Get text content
-                    paragraphs = content_elem.find_all(["p", "div"], recursive=True)
-                    content_parts = []
-
-                    for p in paragraphs:
-                        text = p.get_text(strip=True)
-                        if text and len(text) > 20:  # Filter out short snippets
-                            content_parts.append(text)
-
-                    content = "\n\n".join(content_parts[:10])  # Limit to first 10 paragraphs
-                    break
+    def parse_article_html(self, html: Union[str, bytes], url: str) -> Dict[str, str]:
+        """Parse an NFL.com article page into title, content, author and publish date.
 
-            # Extract author
-            author = None
-            author_selectors = [
-                '[data-testid="author"]',
-                ".author",
-                ".byline",
-                '[data-module="BylineModule"]',
-            ]
-
-            for selector in author_selectors:
-                author_elem = soup.select_one(selector)
-                if author_elem:
-                    author = author_elem.get_text(strip=True)
-                    break
+        Uses the compiled lxml fast path and falls back to the BeautifulSoup reference
+        parser if lxml cannot handle the document.
+        """
+        if self.fast_html:
+            try:
+                return self._parse_article_lxml(html, url)
+            except Exception:
+                pass
+        return self.parse_article_html_soup(html, url)
+
+    def _parse_article_lxml(self, html: Union[str, bytes], url: str) -> Dict[str, str]:
+        parsed = _ARTICLE_FIELDS.parse(html)
+
+        title = None
+        title_elem = parsed.get("title")
+        if title_elem is not None:
+            title = text_of(title_elem)
+        if not title:
+            title_tag = parsed.title_tag()
+            title = text_of(title_tag) if title_tag is not None else "NFL Article"
+
+        content = ""
+        content_elem = parsed.get("content")
+        if content_elem is not None:
+            for unwanted in _UNWANTED_XPATH(content_elem):
+                if unwanted.getparent() is not None:
+                    unwanted.drop_tree()
+            content_parts = []
+            for p in content_elem.iterdescendants("p", "div"):
+                text = text_of(p)
+                if text and len(text) > 20:
+                    content_parts.append(text)
+            content = "\n\n".join(content_parts[:10])
+
+        author_elem = parsed.get("author")
+        author = text_of(author_elem) if author_elem is not None else None
+
+        publish_date = None
+        date_elem = parsed.get("publish_date")
+        if date_elem is not None:
+            publish_date = date_elem.get("datetime") or text_of(date_elem)
+
+        return _article_dict(title, content, author, publish_date, url)
+
+    def parse_article_html_soup(self, html: Union[str, bytes], url: str) -> Dict[str, str]:
+        """Reference BeautifulSoup implementation (slower; kept as fallback and baseline)."""
+        soup = BeautifulSoup(html, "html.parser")
+
+        # Extract title - try multiple selectors
+        title = None
+        for selector in TITLE_SELECTORS:
+            title_elem = soup.select_one(selector)
+            if title_elem:
+                title = title_elem.get_text(strip=True)
+                break
 
-            # Extract publish date
-            publish_date = None
-            date_selectors = [
-                '[data-testid="publish-date"]',
-                ".publish-date",
-                ".date",
-                "time[datetime]",
-            ]
-
-            for selector in date_selectors:
-                date_elem = soup.select_one(selector)
-                if date_elem:
-                    # Try datetime attribute first
-                    datetime_attr = date_elem.get("datetime")
-                    if datetime_attr:
-                        publish_date = datetime_attr
-                    else:
-                        publish_date = date_elem.get_text(strip=True)
-                    break
+        if not title:
+            title = soup.title.get_text(strip=True) if soup.title else "NFL Article"
 
-            # Clean title
-            if title:
-                title = re.sub(r"\s*\|\s*NFL\.com\s*$", "", title)
-                title = title.strip()
-
-            return {
-                "title": title or "NFL Article",
-                "content": content or "Content not extracted",
-                "author": author,
-                "publish_date": publish_date,
-                "url": url,
-            }
+        # Extract content - try multiple selectors
+        content = ""
+        for selector in CONTENT_SELECTORS:
+            content_elem = soup.select_one(selector)
+            if content_elem:
+                # Remove script, style, and nav elements
+                for unwanted in content_elem.find_all(UNWANTED_CONTENT_TAGS):
+                    unwanted.decompose()
 
-        except Exception as e:
-            print(f"Failed to extract content from {url}: {e}")
-            return None
+                # Get text content
+                paragraphs = content_elem.find_all(["p", "div"], recursive=True)
+                content_parts = []
+
+                for p in paragraphs:
+                    text = p.get_text(strip=True)
+                    if text and len(text) > 20:  # Filter out short snippets
+                        content_parts.append(text)
+
+                content = "\n\n".join(content_parts[:10])  # Limit to first 10 paragraphs
+                break
+
+        # Extract author
+        author = None
+        for selector in AUTHOR_SELECTORS:
+            author_elem = soup.select_one(selector)
+            if author_elem:
+                author = author_elem.get_text(strip=True)
+                break
+
+        # Extract publish date
+        publish_date = None
+        for selector in DATE_SELECTORS:
+            date_elem = soup.select_one(selector)
+            if date_elem:
+                # Try datetime attribute first
+                datetime_attr = date_elem.get("datetime")
+                if datetime_attr:
+                    publish_date = str(datetime_attr)
+                else:
+                    publish_date = date_elem.get_text(strip=True)
+                break
+
+        return _article_dict(title, content, author, publish_date, url)
+
+    @staticmethod
+    def _annotate(article_data: Dict[str, str], url_entry: Dict) -> Dict[str, str]:
+        """Add metadata from the sitemap entry."""
+        article_data["lastmod"] = url_entry.get("lastmod")
+        article_data["source"] = "NFL.com"
+        article_data["publisher"] = "NFL.com"
+        return article_data
 
     def process_sitemap_urls(
         self, sitemap_urls: List[Dict], max_articles: int = 50, days_back: int = 7
     ) -> List[Dict[str, str]]:
         """Process sitemap URLs and extract article content with intelligent filtering."""
+        if self.max_concurrency > 1:
+            return _run_sync(self.process_sitemap_urls_async(sitemap_urls, max_articles, days_back))
+
         articles = []
         processed = 0
 
@@ -180,12 +304,7 @@ class NFLArticleExtractor:
             # Extract article content
             article_data = self.extract_article_content(url)
             if article_data:
-                # Add metadata from sitemap
-                article_data["lastmod"] = url_entry.get("lastmod")
-                article_data["source"] = "NFL.com"
-                article_data["publisher"] = "NFL.com"
-
-                articles.append(article_data)
+                articles.append(self._annotate(article_data, url_entry))
                 processed += 1
 
                 if processed % 5 == 0:
@@ -194,10 +313,108 @@ class NFLArticleExtractor:
         print(f"Successfully extracted {len(articles)} articles from NFL.com")
         return articles
 
+    async def iter_sitemap_articles(
+        self, sitemap_urls: List[Dict], max_articles: int = 50, days_back: int = 7
+    ) -> AsyncIterator[Dict[str, str]]:
+        """Yield extracted articles in sitemap order while fetching concurrently.
+
+        Up to ``max_concurrency`` pages are in flight (``per_host_limit`` per host). New
+        fetches are only started while successes plus in-flight requests stay below
+        ``max_articles``, so no more pages are downloaded than the sequential mode would.
+        """
+        candidates = (
+            e for e in sitemap_urls if e.get("url") and self.is_recent(e["url"], days_back)
+        )
+        host_limits: Dict[str, asyncio.Semaphore] = {}
+
+        async def _extract(url: str) -> Optional[Dict[str, str]]:
+            host = urlparse(url).netloc
+            sem = host_limits.setdefault(host, asyncio.Semaphore(self.per_host_limit))
+            async with sem:
+                return await self.extract_article_content_async(url)
+
+        pending: Deque[Tuple[Dict, "asyncio.Task[Optional[Dict[str, str]]]"]] = deque()
+        produced = 0
+        try:
+            while True:
+                while (
+                    len(pending) < self.max_concurrency and produced + len(pending) < max_articles
+                ):
+                    entry = next(candidates, None)
+                    if entry is None:
+                        break
+                    pending.append((entry, asyncio.ensure_future(_extract(entry["url"]))))
+                if not pending:
+                    break
+                entry, task = pending.popleft()
+                article_data = await task
+                if article_data:
+                    produced += 1
+                    yield self._annotate(article_data, entry)
+        finally:
+            for _, task in pending:
+                task.cancel()
+
+    async def process_sitemap_urls_async(
+        self, sitemap_urls: List[Dict], max_articles: int = 50, days_back: int = 7
+    ) -> List[Dict[str, str]]:
+        """Concurrent counterpart of ``process_sitemap_urls`` with the same result order."""
+        print(
+            f"Processing up to {max_articles} recent articles (last {days_back} days, "
+            f"{self.max_concurrency} concurrent)..."
+        )
+        articles: List[Dict[str, str]] = []
+        async for article_data in self.iter_sitemap_articles(sitemap_urls, max_articles, days_back):
+            articles.append(article_data)
+            if len(articles) % 5 == 0:
+                print(f"Processed {len(articles)}/{max_articles} articles...")
+        print(f"Successfully extracted {len(articles)} articles from NFL.com")
+        return articles
+
+
+def _run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Run a coroutine to completion from sync code (no event loop may be running)."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        pass
+    else:
+        coro.close()
+        # Blocking here would stall every other task on the caller's loop
+        raise RuntimeError(
+            "process_sitemap_urls() cannot run inside an event loop; "
+            "await process_sitemap_urls_async() instead"
+        )
+
+    async def _with_cleanup() -> T:
+        try:
+            return await coro
+        finally:
+            await http_client.aclose_async_client()
+
+    return asyncio.run(_with_cleanup())
+
 
 def extract_nfl_articles(
-    sitemap_urls: List[Dict], max_articles: int = 50, days_back: int = 7
+    sitemap_urls: List[Dict],
+    max_articles: int = 50,
+    days_back: int = 7,
+    max_concurrency: int = 1,
+    per_host_limit: int = 4,
 ) -> List[Dict[str, str]]:
     """Convenience function to extract NFL articles."""
-    extractor = NFLArticleExtractor()
+    extractor = NFLArticleExtractor(max_concurrency=max_concurrency, per_host_limit=per_host_limit)
     return extractor.process_sitemap_urls(sitemap_urls, max_articles, days_back)
+
+
+async def extract_nfl_articles_async(
+    sitemap_urls: List[Dict],
+    max_articles: int = 50,
+    days_back: int = 7,
+    max_concurrency: int = 8,
+    per_host_limit: int = 4,
+) -> List[Dict[str, str]]:
+    """``extract_nfl_articles`` on the running event loop, so concurrent callers share
+    its host scheduler and HTTP client."""
+    extractor = NFLArticleExtractor(max_concurrency=max_concurrency, per_host_limit=per_host_limit)
+    return await extractor.process_sitemap_urls_async(sitemap_urls, max_articles, days_back)
@@ -2,28 +2,73 @@ from __future__ import annotations
 
 import asyncio
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import Any, Awaitable, Dict, List, Optional, Set
 
 import yaml
 
-from database.repositories.article_repo import ArticleRepository
-from database.repositories.log_repo import ProcessingLogRepository
-from database.repositories.watermark_repo import WatermarkRepository
+from database.connection import async_enabled
+from database.repositories.article_repo import ArticleRepository, AsyncArticleRepository
+from database.repositories.log_repo import (
+    AsyncProcessingLogRepository,
+    BufferedLogWriter,
+    ProcessingLogRepository,
+)
+from database.repositories.watermark_repo import AsyncWatermarkRepository, WatermarkRepository
 from services.async_processor import map_async, retry
 from services.feed_ingester import FeedIngester
+from services.http_cache import ValidatorStore, get_validator_store
 from services.logger import log_json
 from services.metrics import Metrics
 from services.relevance_filter import FilterDecision, RelevanceFilter
-from services.sitemap_parser import fetch_sitemap, parse_sitemap
+from services.seen_index import get_seen_index
+from services.sitemap_parser import apply_dynamic_template, crawl_sitemap_async
+from services.write_behind import WriteBehindWriter, call_db
+
+# End-of-stream marker passed between pipeline stages
+_DONE = object()
 
 
 class Pipeline:
-    def __init__(self) -> None:
-        self.ingester = FeedIngester()
+    def __init__(
+        self, async_db: Optional[bool] = None, validators: Optional[ValidatorStore] = None
+    ) -> None:
+        """``async_db`` selects the asyncio repositories (default: DB_ASYNC, see
+        ``database.connection.async_enabled``); otherwise sync repositories run in worker
+        threads so the event loop keeps fetching while the database works.
+
+        ``validators`` stores the HTTP validators of feeds and sitemaps (default: the
+        process-wide ``get_validator_store()``)."""
+        self.validators = validators or get_validator_store()
+        self.seen_urls = get_seen_index()
+        self.ingester = FeedIngester(validators=self.validators)
         self.filter = RelevanceFilter()
-        self.article_repo = ArticleRepository()
-        self.log_repo = ProcessingLogRepository()
-        self.watermarks = WatermarkRepository()
+        self.async_db = async_enabled() if async_db is None else async_db
+        self.article_repo: ArticleRepository | AsyncArticleRepository
+        self.watermarks: WatermarkRepository | AsyncWatermarkRepository
+        if self.async_db:
+            self.article_repo = AsyncArticleRepository()
+            self.log_repo = BufferedLogWriter(AsyncProcessingLogRepository())
+            self.watermarks = AsyncWatermarkRepository()
+        else:
+            self.article_repo = ArticleRepository()
+            # Audit rows are buffered and written in batches by the write-behind task,
+            # which flushes them off the event loop
+            self.log_repo = BufferedLogWriter(ProcessingLogRepository(), auto_flush=False)
+            self.watermarks = WatermarkRepository()
+        # Write-behind queue shared by the sources of one run
+        self._writer: Optional[WriteBehindWriter] = None
+        # URLs requested so far by each source in progress (index children included)
+        self._fetched_urls: Dict[str, Set[str]] = {}
+
+    def _new_writer(self, defaults: Dict[str, Any]) -> WriteBehindWriter:
+        """Defaults keys: write_queue_size (1000), persist_batch_size (100)."""
+        return WriteBehindWriter(
+            self.article_repo,
+            self.log_repo,
+            self.watermarks,
+            max_queue=int(defaults.get("write_queue_size", 1000)),
+            batch_size=int(defaults.get("persist_batch_size", 100)),
+        )
 
     @staticmethod
     def _to_aware_utc(dt_obj: Any | None) -> datetime | None:
@@ -62,60 +107,154 @@ class Pipeline:
             sources = [s for s in sources if (s.get("name") or "").strip() in only_sources]
         results: Dict[str, Any] = {"total": 0, "kept": 0, "rejected": 0, "escalated": 0}
 
-        for src in sources:
-            if not src.get("enabled", True):
+        enabled = [s for s in sources if s.get("enabled", True)]
+        if self.seen_urls.enabled:
+            # An index written for another (or a since reset) database must not skip URLs
+            self.seen_urls.reconcile(await call_db(self.article_repo.count))
+        try:
+            # Leaving the block drains the queue, including writes of failed sources
+            async with self._new_writer(defaults) as writer:
+                self._writer = writer
+                try:
+                    outcomes = await self._run_sources(enabled, defaults)
+                finally:
+                    self._writer = None
+        finally:
+            # Audit rows of partially processed sources are still written
+            await self.log_repo.aflush()
+        # Aggregate in config order so totals do not depend on completion order
+        failure: BaseException | None = None
+        for outcome in outcomes:
+            if isinstance(outcome, BaseException):
+                failure = failure or outcome
                 continue
-            with Metrics.time("pipeline.process_source"):
-                st = await self._process_source(src, defaults)
-            for k, v in st.items():
+            for k, v in outcome.items():
                 results[k] = results.get(k, 0) + v
+        if failure is not None:
+            raise failure
         return results
 
+    async def _run_sources(
+        self, sources: List[Dict[str, Any]], defaults: Dict[str, Any]
+    ) -> List[Dict[str, int] | BaseException]:
+        """Process sources concurrently under a global and a per-publisher limit.
+
+        Defaults keys:
+        - max_parallel_sources: sources processed at once (default 4)
+        - max_parallel_per_publisher: sources of one publisher at once (default 2)
+
+        Sources sharing a watermark key are serialized so their watermark updates cannot
+        interleave. A failed source does not cancel the others; its outcome is the
+        exception, and the validators of every URL it fetched are dropped.
+        """
+        global_limit = max(1, int(defaults.get("max_parallel_sources", 4)))
+        publisher_limit = max(1, int(defaults.get("max_parallel_per_publisher", 2)))
+        global_sem = asyncio.Semaphore(global_limit)
+        publisher_sems: Dict[str, asyncio.Semaphore] = {}
+        key_locks: Dict[str, asyncio.Lock] = {}
+
+        async def _run(src: Dict[str, Any]) -> Dict[str, int]:
+            publisher = (src.get("publisher") or "").strip().lower()
+            pub_sem = publisher_sems.setdefault(publisher, asyncio.Semaphore(publisher_limit))
+            key_lock = key_locks.setdefault(str(self._source_key(src)), asyncio.Lock())
+            async with key_lock, pub_sem, global_sem:
+                try:
+                    with Metrics.time("pipeline.process_source"):
+                        return await self._process_source(src, defaults)
+                except Exception as e:
+                    Metrics.counter("pipeline.sources_failed").inc(1)
+                    log_json("ERROR", "Source failed", source=self._source_key(src), error=str(e))
+                    self._forget_validators(src)
+                    raise
+
+        return await asyncio.gather(*[_run(s) for s in sources], return_exceptions=True)
+
+    @staticmethod
+    def _source_key(src: Dict[str, Any]) -> str:
+        return src.get("name") or src.get("url") or "unknown"
+
+    @staticmethod
+    def _source_urls(src: Dict[str, Any]) -> List[str]:
+        url = src.get("url") or src.get("url_template")
+        return [url] if isinstance(url, str) else list(url or [])
+
+    @classmethod
+    def _fetch_urls(cls, src: Dict[str, Any]) -> List[str]:
+        # The URLs the fetch stage requests (and stores validators under): sitemap
+        # templates are resolved as crawl_sitemap_async resolves them
+        urls = cls._source_urls(src)
+        if src.get("type") == "sitemap":
+            return [apply_dynamic_template(u) for u in urls]
+        return urls
+
+    def _forget_validators(self, src: Dict[str, Any]) -> None:
+        # Another source's save() may already have persisted validators staged for this
+        # one; drop them so the next run fetches its feeds and child sitemaps in full again.
+        fetched = self._fetched_urls.pop(self._source_key(src), set())
+        for url in set(self._fetch_urls(src)) | fetched:
+            self.validators.forget(url)
+        self.validators.save()
+
     async def _process_source(
         self, src: Dict[str, Any], defaults: Dict[str, Any]
     ) -> Dict[str, int]:
+        """Run one source through stages joined by bounded queues.
+
+        fetch -> parse -> dedupe/watermark/seen-index -> filter -> write-behind queue
+
+        Every stage starts as soon as its inbox has an item, and a full queue blocks the
+        stage feeding it, so at most ``queue_size`` items (per source or in defaults,
+        default 256) wait between two stages however large the feed is. Sitemaps are
+        parsed while they download, so fetch and parse are one stage for them. Kept
+        articles go to the run's ``WriteBehindWriter``; the source waits for its writes
+        only once, before committing its watermark and validators.
+        """
+        if self._writer is None:
+            # Called outside run_from_config: use a writer private to this source
+            async with self._new_writer(defaults) as writer:
+                self._writer = writer
+                try:
+                    return await self._process_source(src, defaults)
+                finally:
+                    self._writer = None
+        writer = self._writer
+
         st = {"total": 0, "kept": 0, "rejected": 0, "escalated": 0}
-        name = src.get("name") or src.get("url")
-        source_key = name or "unknown"
+        source_key = self._source_key(src)
 
         # Load watermark
-        wm = self.watermarks.get(source_key)
+        wm = await call_db(self.watermarks.get, source_key)
         last_dt = wm.last_publication_date if wm else None
         last_url = wm.last_url if wm else None
 
-        items: List[Dict[str, Any]] = []
-        if src.get("type") == "rss":
-            feed_url = src.get("url")
-            max_parallel = int(
-                src.get("max_parallel_fetches", defaults.get("max_parallel_fetches", 5))
-            )
-            timeout = float(src.get("timeout", defaults.get("timeout", 15)))
-
-            async def _fetch_and_parse(url: str) -> List[Dict[str, Any]]:
-                f = await retry(lambda: self.ingester.fetch_feed(url), retries=2, timeout=timeout)
-                return await self.ingester.extract_articles(f)
-
-            # Support single or list of feeds for a source
-            urls = [feed_url] if isinstance(feed_url, str) else (feed_url or [])
-            results = await map_async(urls, _fetch_and_parse, limit=max_parallel)
-            for raw_list in results:
-                for r in raw_list:
-                    items.append(self.ingester.standardize_article(r))
-        elif src.get("type") == "sitemap":
-            url_or_tpl = src.get("url") or src.get("url_template")
-            max_parallel = int(
-                src.get("max_parallel_fetches", defaults.get("max_parallel_fetches", 5))
-            )
-            timeout = float(src.get("timeout", defaults.get("timeout", 15)))
+        kind = src.get("type")
+        if kind not in ("rss", "sitemap"):
+            log_json("WARNING", "Unsupported source type", source=source_key, type=kind)
+            return st
+
+        max_parallel = int(src.get("max_parallel_fetches", defaults.get("max_parallel_fetches", 5)))
+        timeout = float(src.get("timeout", defaults.get("timeout", 15)))
+        queue_size = max(1, int(src.get("queue_size", defaults.get("queue_size", 256))))
+        # Support single or list of feeds for a source
+        urls = self._source_urls(src)
+        fetched_urls = self._fetched_urls.setdefault(source_key, set())
 
-            urls_to_fetch = [url_or_tpl] if isinstance(url_or_tpl, str) else (url_or_tpl or [])
+        feeds_q: asyncio.Queue[Any] = asyncio.Queue(maxsize=max(1, max_parallel))
+        items_q: asyncio.Queue[Any] = asyncio.Queue(maxsize=queue_size)
+        fresh_q: asyncio.Queue[Any] = asyncio.Queue(maxsize=queue_size)
+
+        async def fetch_feed(url: str) -> Optional[bool]:
+            fetched_urls.add(url)
+            f = await retry(lambda: self.ingester.fetch_feed(url), retries=2, timeout=timeout)
+            if f.get("status") == 304:
+                return None
+            await feeds_q.put(f)
+            return True
 
-            async def _fetch(url: str) -> List[Dict[str, Any]]:
-                xml = await asyncio.to_thread(fetch_sitemap, url)
-                entries = parse_sitemap(xml)
-                out: List[Dict[str, Any]] = []
+        async def fetch_sitemap(url: str) -> Optional[bool]:
+            async def emit(entries: List[Dict[str, Any]]) -> None:
                 for u in entries:
-                    out.append(
+                    await items_q.put(
                         {
                             "url": u["url"],
                             "title": u.get("url"),
@@ -123,72 +262,130 @@ class Pipeline:
                             "publication_date": u.get("lastmod"),
                         }
                     )
-                return out
 
-            results = await map_async(
-                urls_to_fetch,
-                lambda u: retry(lambda: _fetch(u), retries=2, timeout=timeout),
-                limit=max_parallel,
+            # Stream-parse the body; entries older than the watermark are dropped
+            # early (and end the stream for sources declared newest-first). Sitemap
+            # indexes are crawled, skipping children not modified since the watermark.
+            # No overall deadline here: waiting on a full queue is backpressure, not a
+            # stalled server (the HTTP timeouts still apply).
+            entries = await retry(
+                lambda: crawl_sitemap_async(
+                    url,
+                    timeout=int(timeout),
+                    validators=self.validators,
+                    min_lastmod=last_dt,
+                    stop_at_cutoff=bool(src.get("lastmod_sorted", False)),
+                    max_parallel=max_parallel,
+                    max_depth=int(src.get("max_index_depth", 2)),
+                    sink=emit,
+                    visited=fetched_urls,
+                ),
+                retries=2,
             )
-            for batch in results:
-                items.extend(batch)
-        else:
-            log_json("WARNING", "Unsupported source type", source=source_key, type=src.get("type"))
-            return st
+            return None if entries is None else True
+
+        async def fetch_stage() -> List[Optional[bool]]:
+            fetcher = fetch_feed if kind == "rss" else fetch_sitemap
+            fetched = await map_async(urls, fetcher, limit=max_parallel)
+            await (feeds_q if kind == "rss" else items_q).put(_DONE)
+            return fetched
+
+        async def parse_stage() -> None:
+            while (f := await feeds_q.get()) is not _DONE:
+                for r in await self.ingester.extract_articles(f):
+                    await items_q.put(self.ingester.standardize_article(r))
+            await items_q.put(_DONE)
 
         # De-dup by URL and incremental watermarking
-        seen: set[str] = set()
+        d_last = self._to_aware_utc(last_dt)
 
         def newer_than_watermark(it: Dict[str, Any]) -> bool:
-            dt_val = it.get("publication_date")
-            url = it.get("url")
-            d_curr = self._to_aware_utc(dt_val)
-            d_last = self._to_aware_utc(last_dt)
+            d_curr = self._to_aware_utc(it.get("publication_date"))
             if d_last and d_curr:
                 return d_curr > d_last
             if last_url:
-                return url != last_url
+                return it.get("url") != last_url
             return True
 
-        filtered_items: List[Dict[str, Any]] = []
-        for it in items:
-            url = it.get("url")
-            if not url or url in seen:
-                continue
-            seen.add(url)
-            if not newer_than_watermark(it):
-                continue
-            filtered_items.append(it)
+        async def dedupe_stage() -> None:
+            seen: set[str] = set()
+            while (it := await items_q.get()) is not _DONE:
+                url = it.get("url")
+                if not url or url in seen:
+                    continue
+                seen.add(url)
+                if not newer_than_watermark(it):
+                    continue
+                if url in self.seen_urls:
+                    # Stored by an earlier run (up to the index's false-positive rate)
+                    Metrics.counter("pipeline.items_seen").inc(1)
+                    continue
+                st["total"] += 1
+                await fresh_q.put(it)
+            await fresh_q.put(_DONE)
+
+        newest_dt = d_last
+        newest_url = last_url
+        kept_urls: List[str] = []
 
-        st["total"] = len(filtered_items)
+        async def filter_stage() -> None:
+            nonlocal newest_dt, newest_url
+            while (it := await fresh_q.get()) is not _DONE:
+                decision, score = self.filter.filter_article(it)
+                if decision is FilterDecision.KEEP:
+                    st["kept"] += 1
+                    await writer.put_article(source_key, it, score)
+                    kept_urls.append(it["url"])
+                    # watermark update candidates
+                    dt = self._to_aware_utc(it.get("publication_date"))
+                    if dt and (newest_dt is None or dt > newest_dt):
+                        newest_dt = dt
+                        newest_url = it.get("url")
+                elif decision is FilterDecision.REJECT:
+                    st["rejected"] += 1
+                    Metrics.counter("pipeline.items_rejected").inc(1)
+                else:
+                    st["escalated"] += 1
+
+        stages = [fetch_stage(), dedupe_stage(), filter_stage()]
+        if kind == "rss":
+            stages.insert(1, parse_stage())
+        fetched = (await self._run_stages(*stages))[0]
+        if urls and all(r is None for r in fetched):
+            self._fetched_urls.pop(source_key, None)
+            return self._not_modified(source_key, st)
         Metrics.counter("pipeline.items_total").inc(st["total"])
 
-        # Filtering and persistence
-        newest_dt = self._to_aware_utc(last_dt)
-        newest_url = last_url
-        for it in filtered_items:
-            decision, score = self.filter.filter_article(it)
-            if decision is FilterDecision.KEEP:
-                st["kept"] += 1
-                # persist
-                obj = self.article_repo.upsert(it)
-                self.log_repo.add(
-                    "INFO", "kept", article_url=it.get("url"), metadata=str({"score": score})
-                )
-                # watermark update candidate
-                dt = self._to_aware_utc(obj.publication_date)
-                if dt and (newest_dt is None or dt > newest_dt):
-                    newest_dt = dt
-                    newest_url = obj.url
-                Metrics.counter("pipeline.items_kept").inc(1)
-            elif decision is FilterDecision.REJECT:
-                st["rejected"] += 1
-                Metrics.counter("pipeline.items_rejected").inc(1)
-            else:
-                st["escalated"] += 1
-
-        # Save watermark
-        self.watermarks.upsert(source_key, newest_dt, newest_url)
+        # The watermark is queued behind this source's articles; once they are all
+        # written, record their URLs and commit the validators of everything fetched
+        await writer.put_watermark(source_key, newest_dt, newest_url)
+        await writer.flush(source_key)
+        self.seen_urls.add_many(kept_urls)
+        self.seen_urls.save()
+        self.validators.save()
+        self._fetched_urls.pop(source_key, None)
+        return st
+
+    @staticmethod
+    async def _run_stages(*stages: Awaitable[Any]) -> List[Any]:
+        """Run stages concurrently; the first failure cancels the others and is raised."""
+        tasks = [asyncio.ensure_future(s) for s in stages]
+        try:
+            await asyncio.wait(tasks, return_when=asyncio.FIRST_EXCEPTION)
+        finally:
+            for t in tasks:
+                t.cancel()  # no-op for finished stages
+            await asyncio.gather(*tasks, return_exceptions=True)
+        for t in tasks:
+            if not t.cancelled() and t.exception() is not None:
+                raise t.exception()  # type: ignore[misc]
+        return [t.result() for t in tasks]
+
+    @staticmethod
+    def _not_modified(source_key: str, st: Dict[str, int]) -> Dict[str, int]:
+        """Short-circuit a source whose feeds all answered 304 Not Modified."""
+        log_json("INFO", "Source not modified", source=source_key)
+        Metrics.counter("pipeline.sources_not_modified").inc(1)
         return st
 
 
@@ -1,7 +1,8 @@
 from enum import Enum
 from typing import Any, Dict, List, Tuple
 
-from .rule_filter import decide, score_text_relevance
+from .keyword_matcher import KeywordMatcher, compile_keywords
+from .rule_filter import decide, score_hits
 
 
 class FilterDecision(Enum):
@@ -14,9 +15,13 @@ class RelevanceFilter:
     """Rule-based relevance filter for NFL content.
 
     Contract-only implementation: minimal but typed methods per tests.
+
+    Keywords are matched case-insensitively with one compiled matcher per keyword
+    set; ``word_boundary=True`` only counts whole-word matches.
     """
 
-    def __init__(self, keywords: List[str] | None = None) -> None:
+    def __init__(self, keywords: List[str] | None = None, word_boundary: bool = False) -> None:
+        self.word_boundary = word_boundary
         self.keywords = keywords or [
             # Common league/team tokens (sample)
             "nfl",
@@ -33,28 +38,30 @@ class RelevanceFilter:
             "bears",
         ]
 
+    @property
+    def matcher(self) -> KeywordMatcher:
+        # Cached per keyword tuple, so edits to self.keywords are picked up
+        return compile_keywords(tuple(self.keywords), self.word_boundary)
+
     def filter_article(self, article: Dict[str, Any]) -> Tuple[FilterDecision, float]:
         title = str(article.get("title") or "")
         url = str(article.get("url") or "")
         summary = str(article.get("content_summary") or "")
 
-        url_hit = self.is_nfl_url_pattern(url)
-        text_score = max(
-            score_text_relevance(title, self.keywords),
-            score_text_relevance(summary, self.keywords),
-        )
+        # Every keyword, in one pass over title, summary and URL
+        title_hits, summary_hits, url_hits = self.matcher.count_fields(title, summary, url)
+        url_hit = url_hits > 0 or "nfl" in url.lower()
+        text_score = max(score_hits(title_hits), score_hits(summary_hits))
 
         score = max(text_score, 0.9 if url_hit else 0.0)
         decision = decide(score, keep_threshold=0.5, escalate_threshold=0.3)
         return decision, float(score)
 
     def is_nfl_team_mention(self, text: str) -> bool:
-        text_l = (text or "").lower()
-        return any(k in text_l for k in self.keywords)
+        return self.matcher.count(text) > 0
 
     def is_nfl_url_pattern(self, url: str) -> bool:
-        url_l = (url or "").lower()
-        return "nfl" in url_l or any(k in url_l for k in self.keywords)
+        return "nfl" in (url or "").lower() or self.matcher.count(url) > 0
 
 
 __all__ = ["FilterDecision", "RelevanceFilter"]
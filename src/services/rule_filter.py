@@ -2,16 +2,20 @@ from __future__ import annotations
 
 from typing import Iterable
 
+from .keyword_matcher import compile_keywords
 
-def score_text_relevance(text: str, keywords: Iterable[str]) -> float:
-    t = (text or "").lower()
-    if not t:
-        return 0.0
-    hits = sum(1 for k in keywords if k and k.lower() in t)
+
+def score_hits(hits: int) -> float:
     # Simple bounded score: 0..1
     return min(1.0, hits / 3.0)
 
 
+def score_text_relevance(text: str, keywords: Iterable[str]) -> float:
+    if not text:
+        return 0.0
+    return score_hits(compile_keywords(tuple(keywords)).count(text))
+
+
 def decide(score: float, keep_threshold: float = 0.5, escalate_threshold: float = 0.3):
     from .relevance_filter import FilterDecision
 
@@ -22,4 +26,4 @@ def decide(score: float, keep_threshold: float = 0.5, escalate_threshold: float
     return FilterDecision.REJECT
 
 
-__all__ = ["score_text_relevance", "decide"]
+__all__ = ["score_hits", "score_text_relevance", "decide"]
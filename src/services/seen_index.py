@@ -0,0 +1,261 @@
+"""Persistent Bloom filter of article URLs that were already stored.
+
+The per-run dedupe set and the single ``last_url`` of a watermark cannot tell that an
+undated feed item was ingested on an earlier poll, so feeds that repeat most of their
+items (Yahoo, aggregators) would be filtered and upserted again on every run. This
+index remembers every stored URL in a compact bit array on disk, so the pipeline can
+drop repeats before the filter and the database see them.
+
+A Bloom filter has no false negatives but a tunable false-positive rate: with the
+default ``1e-4``, about one new URL in 10,000 is wrongly taken as seen and skipped.
+The rate only holds up to ``capacity`` URLs; past that it grows, and the index should
+be rebuilt from the articles table, the source of truth, with
+``python -m src.cli seen-index rebuild``. Rebuilding also forgets deleted articles.
+
+The index belongs to one database: by default it lives next to a SQLite database file,
+or is named after a digest of DATABASE_URL. ``reconcile()`` discards it when it holds
+more URLs than the articles table (the database was reset or replaced), so it never
+skips URLs the database does not have.
+
+Items whose URL is in the index never reach the content-hash check, so edits to stored
+articles are not picked up while the index is enabled. It is therefore opt-in.
+
+URLs are staged in memory by ``add_many()`` and only written to disk on ``save()``.
+"""
+
+from __future__ import annotations
+
+import hashlib
+import math
+import os
+import struct
+import threading
+from typing import Iterable, Optional
+
+from sqlalchemy.engine import make_url
+
+from database.connection import configured_database_url
+from services.logger import log_json
+
+DEFAULT_CAPACITY = 1_000_000
+DEFAULT_FP_RATE = 1e-4
+
+# magic, bit count, hash count, capacity, items added
+_HEADER = struct.Struct("<8sQIQQ")
+_MAGIC = b"T4LBLM01"
+
+
+def default_index_path(database_url: str) -> str:
+    """Index file for ``database_url``: beside a SQLite database file, otherwise
+    ``./.t4l_seen_urls.<digest>.bloom`` keyed by the URL without its password."""
+    url = make_url(database_url)
+    db = url.database or ""
+    if url.get_backend_name() == "sqlite" and db not in ("", ":memory:"):
+        return f"{db}.seen.bloom"
+    identity = url.render_as_string(hide_password=True).encode("utf-8")
+    return f"./.t4l_seen_urls.{hashlib.sha256(identity).hexdigest()[:16]}.bloom"
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter over strings (double hashing on one BLAKE2b digest)."""
+
+    def __init__(self, capacity: int = DEFAULT_CAPACITY, fp_rate: float = DEFAULT_FP_RATE):
+        capacity = max(1, int(capacity))
+        fp_rate = min(max(float(fp_rate), 1e-12), 0.5)
+        self.capacity = capacity
+        self.bits = max(8, math.ceil(-capacity * math.log(fp_rate) / math.log(2) ** 2))
+        self.hashes = max(1, round(self.bits / capacity * math.log(2)))
+        self.count = 0
+        self._array = bytearray((self.bits + 7) // 8)
+
+    def _positions(self, key: str) -> Iterable[int]:
+        digest = hashlib.blake2b(key.encode("utf-8"), digest_size=16).digest()
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        return ((h1 + i * h2) % self.bits for i in range(self.hashes))
+
+    def add(self, key: str) -> bool:
+        """Add ``key``; return False if it was (probably) present already."""
+        new = False
+        for pos in self._positions(key):
+            byte, bit = divmod(pos, 8)
+            if not self._array[byte] & (1 << bit):
+                self._array[byte] |= 1 << bit
+                new = True
+        if new:
+            self.count += 1
+        return new
+
+    def __contains__(self, key: str) -> bool:
+        return all(self._array[pos // 8] & (1 << (pos % 8)) for pos in self._positions(key))
+
+    @property
+    def fp_rate(self) -> float:
+        """Expected false-positive rate at the current fill."""
+        return (1 - math.exp(-self.hashes * self.count / self.bits)) ** self.hashes
+
+    def to_bytes(self) -> bytes:
+        header = _HEADER.pack(_MAGIC, self.bits, self.hashes, self.capacity, self.count)
+        return header + bytes(self._array)
+
+    @classmethod
+    def from_bytes(cls, data: bytes) -> "BloomFilter":
+        magic, bits, hashes, capacity, count = _HEADER.unpack_from(data)
+        body = data[_HEADER.size :]
+        if magic != _MAGIC or len(body) != (bits + 7) // 8:
+            raise ValueError("not a seen-URL index file")
+        bf = cls.__new__(cls)
+        bf.capacity, bf.bits, bf.hashes, bf.count = capacity, bits, hashes, count
+        bf._array = bytearray(body)
+        return bf
+
+
+class SeenUrlIndex:
+    """URL index backed by a Bloom filter file; thread-safe, loaded lazily."""
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        capacity: int = DEFAULT_CAPACITY,
+        fp_rate: float = DEFAULT_FP_RATE,
+        enabled: bool = True,
+    ) -> None:
+        self.path = path or default_index_path(configured_database_url())
+        self.capacity = capacity
+        self.fp_rate = fp_rate
+        self.enabled = enabled
+        self._lock = threading.Lock()
+        self._filter: Optional[BloomFilter] = None
+        self._dirty = False
+
+    def _load(self) -> BloomFilter:
+        # Caller holds the lock
+        if self._filter is None:
+            try:
+                with open(self.path, "rb") as f:
+                    self._filter = BloomFilter.from_bytes(f.read())
+            except Exception:
+                # Missing or corrupt index just means nothing is skipped until it refills
+                self._filter = BloomFilter(self.capacity, self.fp_rate)
+        return self._filter
+
+    def __contains__(self, url: str) -> bool:
+        if not self.enabled or not url:
+            return False
+        with self._lock:
+            return url in self._load()
+
+    def add_many(self, urls: Iterable[str]) -> int:
+        """Stage ``urls`` as stored; returns how many were new to the index."""
+        if not self.enabled:
+            return 0
+        with self._lock:
+            bf = self._load()
+            added = sum(1 for u in urls if u and bf.add(u))
+            self._dirty = self._dirty or added > 0
+            return added
+
+    def reconcile(self, stored_articles: int) -> bool:
+        """Start empty if the index holds more URLs than ``stored_articles``.
+
+        Such an index was written for another database, or before this one was reset or
+        pruned; trusting it would skip articles that are not stored. Returns whether the
+        index was kept.
+        """
+        if not self.enabled:
+            return True
+        with self._lock:
+            indexed = self._load().count
+            if indexed <= stored_articles:
+                return True
+            self._filter = BloomFilter(self.capacity, self.fp_rate)
+            self._dirty = True
+        log_json(
+            "WARNING",
+            "Seen-URL index does not match the articles table; starting empty",
+            path=self.path,
+            indexed=indexed,
+            articles=stored_articles,
+        )
+        self.save()
+        return False
+
+    def stats(self) -> dict:
+        with self._lock:
+            bf = self._load()
+            return {
+                "path": self.path,
+                "urls": bf.count,
+                "capacity": bf.capacity,
+                "size_bytes": _HEADER.size + len(bf._array),
+                "expected_fp_rate": bf.fp_rate,
+                "saturated": bf.count > bf.capacity,
+            }
+
+    def rebuild(self, urls: Iterable[str], capacity: Optional[int] = None) -> int:
+        """Replace the index with exactly ``urls`` and save it; returns the URL count."""
+        bf = BloomFilter(capacity or self.capacity, self.fp_rate)
+        for u in urls:
+            if u:
+                bf.add(u)
+        with self._lock:
+            self._filter = bf
+            self._dirty = True
+        self.save()
+        return bf.count
+
+    def save(self) -> None:
+        """Atomically persist staged URLs (or a rebuilt index) to disk."""
+        with self._lock:
+            if not self._dirty or self._filter is None:
+                return
+            tmp = f"{self.path}.tmp"
+            try:
+                with open(tmp, "wb") as f:
+                    f.write(self._filter.to_bytes())
+                os.replace(tmp, self.path)
+                self._dirty = False
+            except Exception:
+                # Best-effort: a stale index only costs re-processing repeats next time
+                pass
+
+
+_default_index: Optional[SeenUrlIndex] = None
+_default_lock = threading.Lock()
+
+
+def get_seen_index() -> SeenUrlIndex:
+    """Process-wide index configured from env.
+
+    - T4L_SEEN_INDEX: set to 1 to enable the seen-URL pre-check (default 0)
+    - T4L_SEEN_INDEX_PATH: index file location (default ``default_index_path()`` of
+      DATABASE_URL)
+    - T4L_SEEN_INDEX_CAPACITY: URLs the false-positive rate is sized for (default 1000000)
+    - T4L_SEEN_INDEX_FP_RATE: target false-positive rate (default 0.0001)
+
+    Capacity and rate apply when the index is created or rebuilt; an existing file
+    keeps its own sizing.
+    """
+    global _default_index
+    with _default_lock:
+        path = os.getenv("T4L_SEEN_INDEX_PATH") or default_index_path(configured_database_url())
+        enabled = bool(int(os.getenv("T4L_SEEN_INDEX", "0")))
+        capacity = int(os.getenv("T4L_SEEN_INDEX_CAPACITY", str(DEFAULT_CAPACITY)))
+        fp_rate = float(os.getenv("T4L_SEEN_INDEX_FP_RATE", str(DEFAULT_FP_RATE)))
+        if (
+            _default_index is None
+            or _default_index.path != path
+            or _default_index.enabled != enabled
+            or _default_index.capacity != capacity
+            or _default_index.fp_rate != fp_rate
+        ):
+            _default_index = SeenUrlIndex(path, capacity, fp_rate, enabled=enabled)
+        return _default_index
+
+
+__all__ = [
+    "BloomFilter",
+    "SeenUrlIndex",
+    "default_index_path",
+    "get_seen_index",
+]
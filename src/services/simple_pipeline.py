@@ -2,22 +2,48 @@
 
 from __future__ import annotations
 
-from typing import Any, Dict, List
+import asyncio
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
 
-from database.connection import get_sessionmaker
+from sqlalchemy.orm import Session
+
+from database.connection import get_sessionmaker, run_write
 from database.supabase_simple import SimpleSupabaseRepo
-from models import (
-    ClaimORM,
-    ClaimSourceORM,
-    EventArticleORM,
-    EventORM,
-    SourceORM,
-)
-from services.claim_extractor import extract_allowlisted_claims
-from services.confidence import compute_event_confidence
+from services.async_processor import map_async
 from services.feed_ingester import FeedIngester
+from services.http_cache import get_validator_store
+from services.kg_writer import recompute_event_confidence, write_event_graph
 from services.pipeline import Pipeline
-from services.signature import event_signature
+
+
+def _parse_when(value: Any) -> Optional[datetime]:
+    """Aware UTC datetime from ISO8601 or RFC 822 (feed) dates; None if unparseable."""
+    if value is None or value == "":
+        return None
+    d = Pipeline._to_aware_utc(value)
+    if d is None and isinstance(value, str):
+        try:
+            d = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if d.tzinfo is None:
+            d = d.replace(tzinfo=timezone.utc)
+    return d
+
+
+def _is_newer(value: Any, since: Optional[datetime]) -> bool:
+    """Whether an item dated ``value`` may be newer than the watermark; undated items are."""
+    if since is None:
+        return True
+    d = _parse_when(value)
+    if d is None:
+        return True
+    if isinstance(value, str) and len(value.strip()) == 10:
+        # Day-precision sitemap lastmod: keep everything from the watermark's day
+        return d.date() >= since.date()
+    return d >= since
 
 
 class SimplifiedPipeline:
@@ -27,14 +53,13 @@ class SimplifiedPipeline:
         self.use_supabase = use_supabase
         self.supabase_repo = SimpleSupabaseRepo() if use_supabase else None
         self.local_pipeline = Pipeline() if not use_supabase else None
+        self.validators = get_validator_store()
 
     async def run_source(self, source_config: Dict[str, Any]) -> Dict[str, Any]:
         """Run pipeline for a single source."""
         # Handle url_template for NFL.com-style dynamic URLs
         url = source_config.get("url")
         if not url and source_config.get("url_template"):
-            from datetime import datetime
-
             now = datetime.now()
             url = (
                 source_config["url_template"]
@@ -61,84 +86,166 @@ class SimplifiedPipeline:
         source_config["url"] = url
 
         if self.use_supabase and self.supabase_repo:
-            return await self._run_with_supabase(source_config, source_key)
+            result = await self._run_with_supabase(source_config, source_key)
         else:
-            return await self._run_with_local(source_config)
+            result = await self._run_with_local(source_config)
+
+        # Only keep conditional-GET validators for content that was fully processed
+        if result.get("status") == "success":
+            self.validators.save()
+        else:
+            # Another source may already have persisted this URL's staged validators
+            self.validators.forget(url)
+            self.validators.save()
+        return result
+
+    @staticmethod
+    def _only_new(
+        entries: List[Dict[str, Any]],
+        since: Optional[datetime],
+        known_urls: Optional[Callable[[Iterable[str]], Set[str]]],
+        date_key: str,
+    ) -> List[Dict[str, Any]]:
+        """Drop entries older than the watermark, then those whose URL is already stored."""
+        fresh = [e for e in entries if e.get("url") and _is_newer(e.get(date_key), since)]
+        if known_urls is not None and fresh:
+            known = known_urls([e["url"] for e in fresh])
+            fresh = [e for e in fresh if e["url"] not in known]
+        if len(fresh) < len(entries):
+            print(f"Skipping {len(entries) - len(fresh)} already processed entries")
+        return fresh
+
+    async def _load_sitemap_articles(
+        self,
+        source_config: Dict[str, Any],
+        max_articles: int,
+        days_back: int,
+        since: Optional[datetime] = None,
+        known_urls: Optional[Callable[[Iterable[str]], Set[str]]] = None,
+    ) -> Optional[List[Dict[str, Any]]]:
+        """Fetch and parse a sitemap source into standardized articles.
+
+        NFL.com sitemaps get full article extraction; other sitemaps yield URL-only
+        entries. With ``since``/``known_urls``, entries older than the watermark or already
+        stored are dropped before any extraction. Returns None when the sitemap answered
+        304 Not Modified.
+
+        The blocking sitemap fetch and filtering run in a worker thread. Extraction runs
+        on this event loop, so sources processed concurrently share its per-host
+        scheduler instead of each starting a loop with its own.
+        """
+        from services.nfl_extractor import extract_nfl_articles_async
+        from services.sitemap_parser import fetch_sitemap, parse_sitemap
+
+        def _entries() -> Optional[List[Dict[str, Any]]]:
+            xml_text = fetch_sitemap(source_config["url"], validators=self.validators)
+            if xml_text is None:
+                return None
+            entries = parse_sitemap(xml_text)
+            print(f"Found {len(entries)} URLs in sitemap")
+            if since is not None or known_urls is not None:
+                entries = self._only_new(entries, since, known_urls, "lastmod")
+            return entries
+
+        sitemap_urls = await asyncio.to_thread(_entries)
+        if sitemap_urls is None:
+            return None
+
+        articles: List[Dict[str, Any]] = []
+        # Extract full articles with content (NFL.com specific)
+        if "nfl.com" in source_config["url"].lower():
+            nfl_articles = await extract_nfl_articles_async(
+                sitemap_urls,
+                max_articles,
+                days_back,
+                max_concurrency=int(source_config.get("extract_concurrency", 8)),
+                per_host_limit=int(source_config.get("per_host_limit", 4)),
+            )
+
+            # Convert to standardized format
+            for article in nfl_articles:
+                articles.append(
+                    {
+                        "title": article.get("title"),
+                        "url": article.get("url"),
+                        "content_summary": (
+                            article.get("content", "")[:500] + "..."
+                            if len(article.get("content", "")) > 500
+                            else article.get("content", "")
+                        ),
+                        "publisher": article.get("publisher"),
+                        "publication_date": article.get("publish_date"),
+                        "author": article.get("author"),
+                    }
+                )
+        else:
+            # For other sitemaps, use simple URL extraction
+            for url_entry in sitemap_urls[:10]:  # Limit for demo
+                articles.append(
+                    {
+                        "title": f"Article from {source_config.get('publisher')}",
+                        "url": url_entry["url"],
+                        "content_summary": "Article from sitemap",
+                        "publisher": source_config.get("publisher"),
+                        "publication_date": url_entry.get("lastmod"),
+                    }
+                )
+        return articles
+
+    def _not_modified(self, source_key: str) -> Dict[str, Any]:
+        """Result for a source whose feed/sitemap answered 304 Not Modified."""
+        print(f"Not modified since last run: {source_key}")
+        if self.use_supabase and self.supabase_repo:
+            self.supabase_repo.log_processing(source_key, "success", "Not modified")
+        return {"source_key": source_key, "articles_count": 0, "status": "success"}
 
     async def _run_with_supabase(
         self, source_config: Dict[str, Any], source_key: str
     ) -> Dict[str, Any]:
         """Run with Supabase integration."""
+        assert self.supabase_repo is not None
         try:
-            # Get watermark
-            last_processed = self.supabase_repo.get_watermark(source_key)
-            print(f"Last processed: {last_processed}")
+            # Watermark: newest publication date stored by a previous run
+            since = _parse_when(self.supabase_repo.get_watermark(source_key))
+            print(f"Last processed: {since.isoformat() if since else None}")
 
             # Ingest articles using the correct FeedIngester interface
             feed_type = source_config.get("type", "rss")
             print(f"Ingesting from {source_config['url']} (type: {feed_type})")
 
             if feed_type == "sitemap":
-                # Handle sitemap parsing
-                from services.nfl_extractor import extract_nfl_articles
-                from services.sitemap_parser import fetch_sitemap, parse_sitemap
-
-                xml_text = fetch_sitemap(source_config["url"])
-                sitemap_urls = parse_sitemap(xml_text)
-
-                print(f"Found {len(sitemap_urls)} URLs in sitemap")
-
-                # Extract full articles with content (NFL.com specific)
-                if "nfl.com" in source_config["url"].lower():
-                    max_articles = source_config.get("max_articles", 30)  # Configurable
-                    days_back = source_config.get("days_back", 7)  # Configurable
-                    nfl_articles = extract_nfl_articles(sitemap_urls, max_articles, days_back)
-
-                    # Convert to standardized format
-                    articles = []
-                    for article in nfl_articles:
-                        articles.append(
-                            {
-                                "title": article.get("title"),
-                                "url": article.get("url"),
-                                "content_summary": (
-                                    article.get("content", "")[:500] + "..."
-                                    if len(article.get("content", "")) > 500
-                                    else article.get("content", "")
-                                ),
-                                "publisher": article.get("publisher"),
-                                "publication_date": article.get("publish_date"),
-                                "author": article.get("author"),
-                            }
-                        )
-                else:
-                    # For other sitemaps, use simple URL extraction
-                    articles = []
-                    for url_entry in sitemap_urls[:10]:  # Limit for demo
-                        articles.append(
-                            {
-                                "title": f"Article from {source_config.get('publisher')}",
-                                "url": url_entry["url"],
-                                "content_summary": "Article from sitemap",
-                                "publisher": source_config.get("publisher"),
-                                "publication_date": url_entry.get("lastmod"),
-                            }
-                        )
+                articles = await self._load_sitemap_articles(
+                    source_config,
+                    source_config.get("max_articles", 30),  # Configurable
+                    source_config.get("days_back", 7),  # Configurable
+                    since,
+                    self.supabase_repo.existing_urls,
+                )
+                if articles is None:
+                    return self._not_modified(source_key)
 
             else:
                 # Handle RSS feeds
-                ingester = FeedIngester()
+                ingester = FeedIngester(validators=self.validators)
 
                 # Fetch feed data
                 feed_data = await ingester.fetch_feed(source_config["url"])
+                if feed_data.get("status") == 304:
+                    return self._not_modified(source_key)
                 if feed_data.get("status") != 200:
                     raise Exception(f"HTTP {feed_data.get('status')}")
 
                 # Extract articles
                 raw_articles = await ingester.extract_articles(feed_data)
 
-                # Standardize articles
-                articles = [ingester.standardize_article(raw) for raw in raw_articles]
+                # Standardize articles, keeping only those not stored yet
+                articles = await asyncio.to_thread(
+                    self._only_new,
+                    [ingester.standardize_article(raw) for raw in raw_articles],
+                    since,
+                    self.supabase_repo.existing_urls,
+                    "publication_date",
+                )
 
             print(f"Ingested {len(articles)} articles")
 
@@ -147,7 +254,7 @@ class SimplifiedPipeline:
                 return {"source_key": source_key, "articles_count": 0, "status": "success"}
 
             # Convert to dicts for Supabase (use the correct format)
-            article_dicts = []
+            article_dicts: List[Dict[str, Any]] = []
             for article in articles:
                 article_dicts.append(
                     {
@@ -166,14 +273,19 @@ class SimplifiedPipeline:
                 )
 
             # Save to Supabase
-            success = self.supabase_repo.save_articles(article_dicts)
+            success = await asyncio.to_thread(self.supabase_repo.save_articles, article_dicts)
 
             if success:
-                # Update watermark with current timestamp
-                from datetime import datetime
-
-                current_time = datetime.now().isoformat()
-                self.supabase_repo.update_watermark(source_key, current_time)
+                # Advance the watermark to the newest publication date seen (never into
+                # the future, so a mis-dated item cannot hide the next run's articles)
+                newest = max(
+                    (d for d in (_parse_when(a.get("publication_date")) for a in articles) if d),
+                    default=None,
+                )
+                if newest is not None:
+                    newest = min(newest, datetime.now(timezone.utc))
+                    if since is None or newest > since:
+                        self.supabase_repo.update_watermark(source_key, newest.isoformat())
 
                 self.supabase_repo.log_processing(
                     source_key, "success", f"Processed {len(articles)} articles"
@@ -209,59 +321,23 @@ class SimplifiedPipeline:
             print(f"Ingesting from {source_config['url']} (type: {feed_type})")
 
             if feed_type == "sitemap":
-                # Handle sitemap parsing
-                from services.nfl_extractor import extract_nfl_articles
-                from services.sitemap_parser import fetch_sitemap, parse_sitemap
-
-                xml_text = fetch_sitemap(source_config["url"])
-                sitemap_urls = parse_sitemap(xml_text)
-
-                print(f"Found {len(sitemap_urls)} URLs in sitemap")
-
-                # Extract full articles with content (NFL.com specific)
-                if "nfl.com" in source_config["url"].lower():
-                    max_articles = 30  # Process up to 30 recent articles
-                    days_back = 7  # Only articles from last 7 days
-                    articles = extract_nfl_articles(sitemap_urls, max_articles, days_back)
-
-                    # Convert to standardized format
-                    standardized_articles = []
-                    for article in articles:
-                        standardized_articles.append(
-                            {
-                                "title": article.get("title"),
-                                "url": article.get("url"),
-                                "content_summary": (
-                                    article.get("content", "")[:500] + "..."
-                                    if len(article.get("content", "")) > 500
-                                    else article.get("content", "")
-                                ),
-                                "publisher": article.get("publisher"),
-                                "publication_date": article.get("publish_date"),
-                                "author": article.get("author"),
-                            }
-                        )
-                    articles = standardized_articles
-                else:
-                    # For other sitemaps, use simple URL extraction
-                    articles = []
-                    for url_entry in sitemap_urls[:10]:  # Limit for demo
-                        articles.append(
-                            {
-                                "title": f"Article from {source_config.get('publisher')}",
-                                "url": url_entry["url"],
-                                "content_summary": "Article from sitemap",
-                                "publisher": source_config.get("publisher"),
-                                "publication_date": url_entry.get("lastmod"),
-                            }
-                        )
+                # Process up to 30 recent articles from the last 7 days
+                articles = await self._load_sitemap_articles(source_config, 30, 7)
+                if articles is None:
+                    return self._not_modified(
+                        f"{source_config.get('publisher')}:{source_config.get('url')}"
+                    )
 
             else:
                 # Handle RSS feeds
-                ingester = FeedIngester()
+                ingester = FeedIngester(validators=self.validators)
 
                 # Fetch feed data
                 feed_data = await ingester.fetch_feed(source_config["url"])
+                if feed_data.get("status") == 304:
+                    return self._not_modified(
+                        f"{source_config.get('publisher')}:{source_config.get('url')}"
+                    )
                 if feed_data.get("status") != 200:
                     raise Exception(f"HTTP {feed_data.get('status')}")
 
@@ -280,118 +356,16 @@ class SimplifiedPipeline:
                     "status": "success",
                 }
 
-            # For local mode, we'll just return the count (could save to SQLite here if needed)
-            # Persist minimal event records via signature clustering
-            sm = get_sessionmaker()
-            with sm() as session:
-                created_or_linked = 0
-                import hashlib
-                from datetime import datetime, timezone
-
-                for a in articles:
-                    title = a.get("title") or ""
-                    pub = a.get("publication_date")
-                    pub_dt = None
-                    try:
-                        if isinstance(pub, str):
-                            from dateutil import parser as dtp  # type: ignore
-
-                            pub_dt = dtp.parse(pub)
-                        elif pub:
-                            pub_dt = pub
-                    except Exception:
-                        pub_dt = None
-
-                    sig = event_signature(title, pub_dt)
-                    ev = session.query(EventORM).filter_by(signature=sig).one_or_none()
-                    now = datetime.now(timezone.utc)
-                    if not ev:
-                        ev = EventORM(
-                            signature=sig,
-                            event_date=pub_dt,
-                            event_type=None,
-                            title=title,
-                            summary=a.get("content_summary"),
-                            confidence=None,
-                            created_at=now,
-                            updated_at=now,
-                        )
-                        session.add(ev)
-                        session.flush()
-                    else:
-                        ev.updated_at = now
-
-                    # Link article using a stable pseudo ID derived from URL to avoid duplicates
-                    url = a.get("url") or ""
-                    if url:
-                        # Stable 31-bit id; negative to avoid clashing with real positive IDs
-                        pseudo_id = -(
-                            int(hashlib.sha1(url.encode("utf-8")).hexdigest(), 16) % 2147483647
-                        )
-                    else:
-                        pseudo_id = 0
-
-                    exists = (
-                        session.query(EventArticleORM)
-                        .filter_by(event_id=ev.id, article_id=pseudo_id)
-                        .one_or_none()
-                    )
-                    if not exists:
-                        session.add(
-                            EventArticleORM(
-                                event_id=ev.id, article_id=pseudo_id, relation="primary"
-                            )
-                        )
-                        created_or_linked += 1
-                    # Extract allowlisted claims and persist with provenance
-                    content_summary = a.get("content_summary") or ""
-                    claims = extract_allowlisted_claims(title, content_summary)
-                    if claims:
-                        # Ensure a Source row exists for the publisher/url combo (simplified)
-                        src_name = a.get("publisher") or "unknown"
-                        src_url = a.get("url") or None
-                        source = (
-                            session.query(SourceORM)
-                            .filter_by(name=src_name, url=src_url)
-                            .one_or_none()
-                        )
-                        if not source:
-                            source = SourceORM(name=src_name, publisher=src_name, url=src_url)
-                            session.add(source)
-                            session.flush()
-                        for c in claims:
-                            existing_claim = (
-                                session.query(ClaimORM)
-                                .filter_by(event_id=ev.id, claim_text=c.text)
-                                .one_or_none()
-                            )
-                            if existing_claim:
-                                claim_id = existing_claim.id
-                            else:
-                                claim_row = ClaimORM(
-                                    event_id=ev.id, claim_text=c.text, status=c.status
-                                )
-                                session.add(claim_row)
-                                session.flush()
-                                claim_id = claim_row.id
-                            session.add(
-                                ClaimSourceORM(
-                                    claim_id=claim_id,
-                                    source_id=source.id,
-                                    url=src_url,
-                                    citation=c.citation,
-                                )
-                            )
-
-                # Compute naive confidence after processing batch
-                if created_or_linked:
-                    # Use a placeholder evidence list; real integration will provide tiers/dates
-                    conf = compute_event_confidence([{"source_tier": "C", "published_at": None}])
-                    for ev in session.query(EventORM).all():
-                        if ev.confidence is None:
-                            ev.confidence = conf
+            # Persist minimal event records via signature clustering, set-based
+            def _persist(session: Session) -> None:
+                written = write_event_graph(session, articles)
+                # Rescore only the events this batch touched
+                recompute_event_confidence(session, written.event_ids)
                 session.commit()
 
+            sm = get_sessionmaker()
+            await asyncio.to_thread(run_write, sm, _persist)
+
             return {
                 "source_key": f"{source_config.get('publisher')}:{source_config.get('url')}",
                 "articles_count": len(articles),
@@ -409,19 +383,20 @@ class SimplifiedPipeline:
 
 
 async def run_simplified_pipeline(
-    config_path: str, use_supabase: bool = False
+    config_path: str, use_supabase: bool = False, concurrency: Optional[int] = None
 ) -> List[Dict[str, Any]]:
-    """Run the simplified pipeline."""
+    """Run the simplified pipeline.
+
+    Up to ``concurrency`` sources are processed at once (default: the config's
+    ``defaults.max_parallel_sources``, else 1). Results are returned in config order.
+    """
     import yaml
 
     with open(config_path) as f:
         config = yaml.safe_load(f)
 
-    pipeline = SimplifiedPipeline(use_supabase=use_supabase)
-    results = []
-
-    for source in config.get("sources", []):
-        result = await pipeline.run_source(source)
-        results.append(result)
+    defaults = config.get("defaults") or {}
+    limit = concurrency or int(defaults.get("max_parallel_sources", 1))
 
-    return results
+    pipeline = SimplifiedPipeline(use_supabase=use_supabase)
+    return await map_async(config.get("sources", []), pipeline.run_source, limit=limit)
@@ -1,13 +1,36 @@
 from __future__ import annotations
 
+import codecs
 import re
+import zlib
 from dataclasses import dataclass
 from datetime import datetime, timezone
-from typing import Any, Dict, List
+from typing import (
+    Any,
+    AsyncIterable,
+    AsyncIterator,
+    Awaitable,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Set,
+    Tuple,
+    Union,
+)
 from urllib.parse import urljoin
 
-import requests
+import httpx
 from bs4 import BeautifulSoup
+from lxml import etree
+
+from . import http_client
+from .async_processor import get_host_scheduler, map_async
+from .http_cache import ValidatorStore
+from .logger import log_json
+from .metrics import Metrics
 
 
 @dataclass(frozen=True)
@@ -31,13 +54,409 @@ def apply_dynamic_template(url: str) -> str:
     return url
 
 
-def fetch_sitemap(url: str, timeout: int = 20) -> str:
+def fetch_sitemap(
+    url: str, timeout: int = 20, validators: Optional[ValidatorStore] = None
+) -> Optional[str]:
+    """Fetch a sitemap body.
+
+    When ``validators`` is given the request is conditional and ``None`` is returned
+    on ``304 Not Modified``.
+    """
     real_url = apply_dynamic_template(url)
-    resp = requests.get(real_url, timeout=timeout)
+    headers = validators.request_headers(real_url) if validators else {}
+    resp = http_client.get_client().get(real_url, timeout=timeout, headers=headers)
+    return _sitemap_body(real_url, resp, validators)
+
+
+async def fetch_sitemap_async(
+    url: str, timeout: int = 20, validators: Optional[ValidatorStore] = None
+) -> Optional[str]:
+    """Async variant of ``fetch_sitemap`` using the shared connection pool."""
+    real_url = apply_dynamic_template(url)
+    headers = validators.request_headers(real_url) if validators else {}
+    async with get_host_scheduler().slot(real_url) as slot:
+        resp = await http_client.get_async_client().get(real_url, timeout=timeout, headers=headers)
+        slot.observe(resp)
+    return _sitemap_body(real_url, resp, validators)
+
+
+def _sitemap_body(
+    real_url: str, resp: httpx.Response, validators: Optional[ValidatorStore]
+) -> Optional[str]:
+    if validators and resp.status_code == 304:
+        return None
     resp.raise_for_status()
+    if validators:
+        validators.remember(real_url, resp.headers)
     return resp.text
 
 
+EntrySink = Callable[[List[Dict[str, Any]]], Awaitable[None]]
+
+
+def parse_lastmod(value: Any) -> Optional[datetime]:
+    """Parse a sitemap ``<lastmod>`` (W3C datetime or plain date) to aware UTC."""
+    if not value:
+        return None
+    if isinstance(value, datetime):
+        d = value
+    else:
+        try:
+            d = datetime.fromisoformat(str(value).strip().replace("Z", "+00:00"))
+        except ValueError:
+            return None
+    if d.tzinfo is None:
+        return d.replace(tzinfo=timezone.utc)
+    return d.astimezone(timezone.utc)
+
+
+class SitemapStreamParser:
+    """Incremental sitemap parser fed with raw body chunks.
+
+    - Gzip bodies (``.xml.gz``) are detected by magic bytes and inflated on the fly.
+    - XML sitemaps go through lxml's pull parser; each finished ``<url>`` element is
+      emitted and then dropped from the tree so memory stays flat.
+    - Anything that does not look like an XML sitemap is buffered and handed to
+      ``parse_html_article_sitemap`` on ``close()`` (NFL.com monthly HTML pages). So is
+      an XML document without a single entry element, as the BeautifulSoup parser did.
+    - ``encoding`` overrides the document's declared encoding, for bodies that were
+      already decoded and re-encoded (``parse_sitemap`` feeds UTF-8).
+    - ``min_lastmod`` drops entries older than the cutoff; with ``stop_at_cutoff`` the
+      first such entry ends the stream (for sitemaps sorted newest first).
+    - ``entry_tag`` may be a tuple such as ``("url", "sitemap")`` to accept both urlsets
+      and sitemap indexes; ``root_tag`` then tells which one was parsed.
+    """
+
+    _SNIFF_BYTES = 512
+
+    def __init__(
+        self,
+        entry_tag: Union[str, Tuple[str, ...]] = "url",
+        min_lastmod: Any = None,
+        stop_at_cutoff: bool = False,
+        encoding: Optional[str] = None,
+    ) -> None:
+        self.entry_tags = frozenset([entry_tag] if isinstance(entry_tag, str) else entry_tag)
+        self.root_tag: Optional[str] = None
+        self.min_lastmod = parse_lastmod(min_lastmod)
+        self.stop_at_cutoff = stop_at_cutoff
+        self.done = False
+        self._encoding_known = False
+        self._raw_head = b""
+        self._inflate: Optional[Any] = None
+        self._head = b""
+        self._mode: Optional[str] = None  # "xml" | "html"
+        self._html_parts: List[bytes] = []
+        # XML body kept until the first entry element, for the HTML fallback
+        self._xml_parts: Optional[List[bytes]] = []
+        self._encoding = encoding
+        self._xml = etree.XMLPullParser(
+            events=("end",),
+            recover=True,
+            resolve_entities=False,
+            no_network=True,
+            huge_tree=True,
+            encoding=encoding,
+        )
+
+    def feed(self, chunk: bytes) -> List[Dict[str, Any]]:
+        if self.done or not chunk:
+            return []
+        if not self._encoding_known:
+            # Need two bytes to recognise the gzip magic number
+            self._raw_head += chunk
+            if len(self._raw_head) < 2:
+                return []
+            chunk, self._raw_head = self._raw_head, b""
+            self._encoding_known = True
+            if chunk[:2] == b"\x1f\x8b":
+                self._inflate = zlib.decompressobj(16 + zlib.MAX_WBITS)
+        if self._inflate is not None:
+            chunk = self._inflate.decompress(chunk)
+        return self._feed_plain(chunk)
+
+    def close(self) -> List[Dict[str, Any]]:
+        if self.done:
+            return []
+        out: List[Dict[str, Any]] = []
+        out.extend(self._feed_plain(self._raw_head))
+        if self._inflate is not None:
+            out.extend(self._feed_plain(self._inflate.flush()))
+        if self._mode is None:
+            self._sniff(force=True)
+        if self._mode == "xml":
+            try:
+                self._xml.close()
+            except etree.XMLSyntaxError:
+                pass
+            out.extend(self._drain_xml())
+            if self._xml_parts is not None:
+                # Well-formed or not, no <url>/<sitemap> at all: try it as an HTML page
+                self._html_parts, self._xml_parts = self._xml_parts, None
+                self._mode = "html"
+        if self._mode == "html":
+            html_text = b"".join(self._html_parts).decode(
+                self._encoding or "utf-8", errors="replace"
+            )
+            for entry in parse_html_article_sitemap(html_text):
+                if self.done:
+                    break
+                if self._accept(entry):
+                    out.append(entry)
+        self.done = True
+        return out
+
+    def _feed_plain(self, data: bytes) -> List[Dict[str, Any]]:
+        if not data or self.done:
+            return []
+        if self._mode is None:
+            self._head += data
+            if not self._sniff(force=False):
+                return []
+            data, self._head = self._head, b""
+        if self._mode == "html":
+            self._html_parts.append(data)
+            return []
+        self._feed_xml(data)
+        return self._drain_xml()
+
+    def _feed_xml(self, data: bytes) -> None:
+        if self._xml_parts is not None:
+            self._xml_parts.append(data)
+        self._xml.feed(data)
+
+    def _sniff(self, force: bool) -> bool:
+        head = self._head
+        if head.startswith(codecs.BOM_UTF8):
+            head = head[len(codecs.BOM_UTF8) :]
+        head = head.lstrip()[: self._SNIFF_BYTES].lower()
+        if len(head) < self._SNIFF_BYTES and not force:
+            if b"<urlset" not in head and b"<sitemapindex" not in head:
+                return False
+        is_xml = head.startswith(b"<?xml") or b"<urlset" in head or b"<sitemapindex" in head
+        self._mode = "xml" if is_xml else "html"
+        if force and self._head:
+            data, self._head = self._head, b""
+            if self._mode == "html":
+                self._html_parts.append(data)
+            else:
+                self._feed_xml(data)
+        return True
+
+    def _drain_xml(self) -> List[Dict[str, Any]]:
+        out: List[Dict[str, Any]] = []
+        for _, el in self._xml.read_events():
+            if self.done:
+                break
+            if not isinstance(el.tag, str):
+                continue
+            if self.root_tag is None:
+                self.root_tag = etree.QName(el.getroottree().getroot()).localname
+            if etree.QName(el).localname not in self.entry_tags:
+                continue
+            self._xml_parts = None
+            loc: Optional[str] = None
+            lastmod: Optional[str] = None
+            for child in el:
+                if not isinstance(child.tag, str):
+                    continue
+                name = etree.QName(child).localname
+                if name == "loc" and child.text:
+                    loc = child.text.strip()
+                elif name == "lastmod" and child.text:
+                    lastmod = child.text.strip()
+            # Free the finished entry and everything parsed before it
+            el.clear()
+            parent = el.getparent()
+            if parent is not None:
+                while el.getprevious() is not None:
+                    del parent[0]
+            if not loc:
+                continue
+            entry = {"url": loc, "lastmod": lastmod}
+            if self._accept(entry):
+                out.append(entry)
+        return out
+
+    def _accept(self, entry: Dict[str, Any]) -> bool:
+        if self.min_lastmod is None:
+            return True
+        d = parse_lastmod(entry.get("lastmod"))
+        if d is None or d >= self.min_lastmod:
+            return True
+        if self.stop_at_cutoff:
+            self.done = True
+        return False
+
+
+def iter_sitemap_entries(chunks: Iterable[bytes], **options: Any) -> Iterator[Dict[str, Any]]:
+    """Yield ``{"url", "lastmod"}`` entries as body chunks arrive.
+
+    Options are passed to ``SitemapStreamParser``.
+    """
+    parser = SitemapStreamParser(**options)
+    for chunk in chunks:
+        yield from parser.feed(chunk)
+        if parser.done:
+            return
+    yield from parser.close()
+
+
+async def aiter_sitemap_entries(
+    chunks: AsyncIterable[bytes], **options: Any
+) -> AsyncIterator[Dict[str, Any]]:
+    """Async counterpart of ``iter_sitemap_entries``."""
+    parser = SitemapStreamParser(**options)
+    async for chunk in chunks:
+        for entry in parser.feed(chunk):
+            yield entry
+        if parser.done:
+            return
+    for entry in parser.close():
+        yield entry
+
+
+def stream_sitemap(url: str, timeout: int = 20, **options: Any) -> Iterator[Dict[str, Any]]:
+    """Fetch and parse a sitemap incrementally without holding the body in memory."""
+    real_url = apply_dynamic_template(url)
+    with http_client.get_client().stream("GET", real_url, timeout=timeout) as resp:
+        resp.raise_for_status()
+        yield from iter_sitemap_entries(resp.iter_bytes(), **options)
+
+
+async def astream_sitemap(
+    url: str, timeout: int = 20, **options: Any
+) -> AsyncIterator[Dict[str, Any]]:
+    """Async counterpart of ``stream_sitemap`` using the shared connection pool."""
+    real_url = apply_dynamic_template(url)
+    client = http_client.get_async_client()
+    async with get_host_scheduler().slot(real_url) as slot:
+        async with client.stream("GET", real_url, timeout=timeout) as resp:
+            slot.observe(resp)
+            resp.raise_for_status()
+            async for entry in aiter_sitemap_entries(resp.aiter_bytes(), **options):
+                yield entry
+
+
+async def fetch_sitemap_entries_async(
+    url: str,
+    timeout: int = 20,
+    validators: Optional[ValidatorStore] = None,
+    **options: Any,
+) -> Optional[List[Dict[str, Any]]]:
+    """Conditionally fetch a sitemap and stream-parse it into entries.
+
+    Returns ``None`` on ``304 Not Modified`` when ``validators`` is given.
+    """
+    real_url = apply_dynamic_template(url)
+    return await _fetch_parsed_async(real_url, timeout, validators, SitemapStreamParser(**options))
+
+
+async def _fetch_parsed_async(
+    real_url: str,
+    timeout: float,
+    validators: Optional[ValidatorStore],
+    parser: SitemapStreamParser,
+    sink: Optional[EntrySink] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    headers = validators.request_headers(real_url) if validators else {}
+    client = http_client.get_async_client()
+    async with get_host_scheduler().slot(real_url) as slot:
+        async with client.stream("GET", real_url, timeout=timeout, headers=headers) as resp:
+            slot.observe(resp)
+            if validators and resp.status_code == 304:
+                return None
+            resp.raise_for_status()
+            entries: List[Dict[str, Any]] = []
+
+            async def _emit(batch: List[Dict[str, Any]]) -> None:
+                # Index entries are children to crawl; only page entries are streamed
+                if sink is not None and batch and parser.root_tag != "sitemapindex":
+                    await sink(batch)
+                else:
+                    entries.extend(batch)
+
+            async for chunk in resp.aiter_bytes():
+                await _emit(parser.feed(chunk))
+                if parser.done:
+                    break
+            await _emit(parser.close())
+            if validators:
+                validators.remember(real_url, resp.headers)
+            return entries
+
+
+async def crawl_sitemap_async(
+    url: str,
+    timeout: int = 20,
+    validators: Optional[ValidatorStore] = None,
+    min_lastmod: Any = None,
+    stop_at_cutoff: bool = False,
+    max_parallel: int = 5,
+    max_depth: int = 2,
+    sink: Optional[EntrySink] = None,
+    visited: Optional[Set[str]] = None,
+) -> Optional[List[Dict[str, Any]]]:
+    """Fetch a sitemap or sitemap index and return the ``{"url", "lastmod"}`` entries.
+
+    Child sitemaps of an index are fetched in parallel (``max_parallel`` at a time, nested
+    indexes up to ``max_depth`` levels). Children whose ``<lastmod>`` is older than
+    ``min_lastmod`` are skipped without being downloaded, and a child answering
+    ``304 Not Modified`` contributes nothing. A plain urlset behaves like
+    ``fetch_sitemap_entries_async``.
+
+    With ``sink``, entries are awaited into it batch by batch as body chunks are parsed
+    (a slow sink throttles the download) and the returned list is empty.
+
+    Returns ``None`` when the top-level document answered ``304 Not Modified``. A failing
+    child is logged and skipped; the index's validators are then dropped so the next run
+    revisits it instead of getting a 304 for the whole tree.
+
+    Every document requested (the resolved root and the children) is added to
+    ``visited``, so a caller can drop their validators if it fails to store the entries.
+    """
+    root_url = apply_dynamic_template(url)
+    seen = {root_url}
+
+    def _parser() -> SitemapStreamParser:
+        return SitemapStreamParser(
+            entry_tag=("url", "sitemap"), min_lastmod=min_lastmod, stop_at_cutoff=stop_at_cutoff
+        )
+
+    async def _visit(doc_url: str, depth: int) -> Optional[List[Dict[str, Any]]]:
+        parser = _parser()
+        if visited is not None:
+            visited.add(doc_url)
+        entries = await _fetch_parsed_async(doc_url, timeout, validators, parser, sink)
+        if entries is None or parser.root_tag != "sitemapindex":
+            return entries
+        if depth >= max_depth:
+            log_json("WARNING", "Sitemap index nested too deep", url=doc_url, depth=depth)
+            return []
+        children: List[str] = []
+        for e in entries:
+            child = urljoin(doc_url, e["url"])
+            if child not in seen:
+                seen.add(child)
+                children.append(child)
+        Metrics.counter("sitemap.index_children").inc(len(children))
+
+        async def _child(child_url: str) -> List[Dict[str, Any]]:
+            try:
+                return await _visit(child_url, depth + 1) or []
+            except Exception as e:
+                log_json("WARNING", "Child sitemap failed", url=child_url, error=str(e))
+                Metrics.counter("sitemap.child_failures").inc(1)
+                if validators:
+                    validators.forget(root_url)
+                return []
+
+        batches = await map_async(children, _child, limit=max_parallel)
+        return [entry for batch in batches for entry in batch]
+
+    return await _visit(root_url, 0)
+
+
 def parse_sitemap(xml_text: str) -> List[Dict[str, Any]]:
     """Parse an NFL sitemap into a list of URL dicts with optional lastmod.
 
@@ -45,22 +464,8 @@ def parse_sitemap(xml_text: str) -> List[Dict[str, Any]]:
 
     Returns a list of dicts: {"url": str, "lastmod": str | None}
     """
-    # Try XML first
-    soup_xml = BeautifulSoup(xml_text or "", "xml")
-    out: List[Dict[str, Any]] = []
-    for url_tag in soup_xml.find_all("url"):
-        loc = url_tag.find("loc")
-        lastmod = url_tag.find("lastmod")
-        if not loc or not loc.text:
-            continue
-        out.append(
-            {"url": loc.text.strip(), "lastmod": (lastmod.text.strip() if lastmod else None)}
-        )
-    if out:
-        return out
-
-    # Fallback: HTML monthly articles sitemap (e.g., /sitemap/html/articles/{YYYY}/{MM})
-    return parse_html_article_sitemap(xml_text)
+    # The text is already decoded: parse it as UTF-8 whatever its XML declaration says
+    return list(iter_sitemap_entries([(xml_text or "").encode("utf-8")], encoding="utf-8"))
 
 
 def parse_html_article_sitemap(html_text: str) -> List[Dict[str, Any]]:
@@ -115,6 +520,15 @@ __all__ = [
     "current_utc_year_month",
     "apply_dynamic_template",
     "fetch_sitemap",
+    "fetch_sitemap_async",
+    "parse_lastmod",
+    "SitemapStreamParser",
+    "iter_sitemap_entries",
+    "aiter_sitemap_entries",
+    "stream_sitemap",
+    "astream_sitemap",
+    "fetch_sitemap_entries_async",
+    "crawl_sitemap_async",
     "parse_sitemap",
     "parse_html_article_sitemap",
 ]
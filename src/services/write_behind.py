@@ -0,0 +1,227 @@
+"""Write-behind persistence for the pipeline.
+
+Kept articles, their audit rows and watermark updates are put on one bounded queue.
+A background task drains the queue in batches: one existence lookup, one upsert of
+the articles that are new or changed and one log insert per batch, then the
+watermark updates, which can cover several sources. Articles whose stored content
+hash matches are not upserted again, but still get their "kept" audit row. Producers
+only wait when the queue is full, which gives backpressure. They never wait on
+commit latency.
+
+Ordering guarantees:
+- Operations are written in the order they were queued. A source's watermark is
+  always written after the articles queued before it.
+- ``flush(source)`` waits until everything queued so far has been written, including
+  buffered audit rows, and raises if a batch holding that source's writes failed.
+- After a failed batch, later watermark updates of the affected sources are dropped.
+  A watermark is therefore never advanced past articles that were not stored.
+- Producers fail fast: once a source has a failed batch, its next ``put_*`` raises
+  that failure, which stops the source's pipeline instead of fetching on.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Any, Callable, Dict, List, Optional
+
+from database.repositories.article_repo import content_hash
+
+from .logger import log_json
+from .metrics import Metrics
+
+
+async def call_db(fn: Callable[..., Any], *args: Any) -> Any:
+    """Call a repository method: awaited natively if async, else in a worker thread."""
+    if inspect.iscoroutinefunction(fn):
+        return await fn(*args)
+    return await asyncio.to_thread(fn, *args)
+
+
+@dataclass
+class _Article:
+    source: str
+    item: Dict[str, Any]
+    score: float
+
+
+@dataclass
+class _Watermark:
+    source: str
+    publication_date: Optional[datetime]
+    url: Optional[str]
+
+
+@dataclass
+class _Barrier:
+    done: asyncio.Future
+
+
+_STOP = object()
+
+
+class WriteBehindWriter:
+    """Background, batched writer for kept articles, audit logs and watermarks.
+
+    ``log_repo`` is a ``BufferedLogWriter`` built with ``auto_flush=False``, so that its
+    ``add`` never writes on the event loop; the repositories may be sync or async.
+    Use as ``async with WriteBehindWriter(...) as writer:``. Leaving the block drains
+    the queue.
+    """
+
+    def __init__(
+        self,
+        article_repo: Any,
+        log_repo: Any,
+        watermarks: Any,
+        max_queue: int = 1000,
+        batch_size: int = 100,
+        skip_unchanged: bool = True,
+    ) -> None:
+        self.article_repo = article_repo
+        self.log_repo = log_repo
+        self.watermarks = watermarks
+        self.batch_size = max(1, batch_size)
+        self.skip_unchanged = skip_unchanged
+        self._queue: asyncio.Queue[Any] = asyncio.Queue(maxsize=max(1, max_queue))
+        self._failed: Dict[str, BaseException] = {}
+        self._task: Optional[asyncio.Task[None]] = None
+
+    @property
+    def depth(self) -> int:
+        return self._queue.qsize()
+
+    async def start(self) -> "WriteBehindWriter":
+        if self._task is None:
+            self._task = asyncio.create_task(self._run())
+        return self
+
+    async def put_article(self, source: str, item: Dict[str, Any], score: float) -> None:
+        self._raise_failure(source)
+        await self._put(_Article(source, item, score))
+
+    async def put_watermark(
+        self, source: str, publication_date: Optional[datetime], url: Optional[str]
+    ) -> None:
+        self._raise_failure(source)
+        await self._put(_Watermark(source, publication_date, url))
+
+    async def flush(self, source: Optional[str] = None) -> None:
+        """Wait until everything queued so far is written.
+
+        With ``source``, raise that source's write failure (once) if it had one.
+        """
+        barrier = _Barrier(asyncio.get_running_loop().create_future())
+        await self._put(barrier)
+        assert self._task is not None
+        await asyncio.wait({barrier.done, self._task}, return_when=asyncio.FIRST_COMPLETED)
+        if not barrier.done.done():
+            raise RuntimeError("WriteBehindWriter stopped before the flush completed")
+        if source is not None and source in self._failed:
+            raise self._failed.pop(source)
+
+    def _raise_failure(self, source: str) -> None:
+        if source in self._failed:
+            raise self._failed[source]
+
+    async def close(self) -> None:
+        """Drain the queue and stop the worker."""
+        if self._task is None:
+            return
+        if not self._task.done():
+            await self._queue.put(_STOP)
+        try:
+            await self._task
+        finally:
+            self._task = None
+
+    async def __aenter__(self) -> "WriteBehindWriter":
+        return await self.start()
+
+    async def __aexit__(self, *exc: Any) -> None:
+        await self.close()
+
+    async def _put(self, op: Any) -> None:
+        if self._task is None or self._task.done():
+            raise RuntimeError("WriteBehindWriter is not running")
+        await self._queue.put(op)
+        Metrics.gauge("pipeline.write_queue.depth").set(self._queue.qsize())
+
+    async def _run(self) -> None:
+        stop = False
+        while not stop:
+            # Block for one op, then take whatever else is already queued
+            ops = [await self._queue.get()]
+            while len(ops) < self.batch_size and not self._queue.empty():
+                ops.append(self._queue.get_nowait())
+            Metrics.gauge("pipeline.write_queue.depth").set(self._queue.qsize())
+            pending: List[Any] = []
+            for op in ops:
+                if isinstance(op, _Barrier):
+                    await self._write(pending)
+                    pending = []
+                    await self._flush_logs()
+                    if not op.done.done():
+                        op.done.set_result(None)
+                elif op is _STOP:
+                    stop = True
+                else:
+                    pending.append(op)
+            await self._write(pending)
+        await self._flush_logs()
+
+    async def _flush_logs(self) -> None:
+        try:
+            await self.log_repo.aflush()
+        except Exception as e:
+            # Entries stay buffered in the log writer for the next flush
+            log_json("ERROR", "Write-behind log flush failed", error=str(e))
+
+    async def _write(self, ops: List[Any]) -> None:
+        if not ops:
+            return
+        articles = [op for op in ops if isinstance(op, _Article)]
+        marks = [op for op in ops if isinstance(op, _Watermark) and op.source not in self._failed]
+        try:
+            with Metrics.time("pipeline.write_batch"):
+                changed = await self._changed(articles)
+                if changed:
+                    await call_db(self.article_repo.upsert_many, [op.item for op in changed])
+                for op in articles:
+                    self.log_repo.add(
+                        "INFO",
+                        "kept",
+                        article_url=op.item.get("url"),
+                        metadata=str({"score": op.score}),
+                    )
+                if self.log_repo.due:
+                    await self.log_repo.aflush()
+                for mark in marks:
+                    await call_db(
+                        self.watermarks.upsert, mark.source, mark.publication_date, mark.url
+                    )
+            Metrics.counter("pipeline.write_batches").inc(1)
+            Metrics.counter("pipeline.items_kept").inc(len(articles))
+            Metrics.counter("pipeline.items_unchanged").inc(len(articles) - len(changed))
+        except Exception as e:
+            Metrics.counter("pipeline.write_batches_failed").inc(1)
+            log_json("ERROR", "Write-behind batch failed", error=str(e), ops=len(ops))
+            for op in ops:
+                self._failed.setdefault(op.source, e)
+
+    async def _changed(self, articles: List[_Article]) -> List[_Article]:
+        """Articles whose upsert would change the stored row (one lookup per batch)."""
+        if not self.skip_unchanged or not articles:
+            return articles
+        urls = [str(op.item.get("url") or "").strip() for op in articles]
+        stored = await call_db(self.article_repo.existing, urls)
+        return [
+            op
+            for op, url in zip(articles, urls)
+            if url not in stored or stored[url] != content_hash(op.item)
+        ]
+
+
+__all__ = ["WriteBehindWriter", "call_db"]
@@ -1,6 +1,8 @@
 import os
 import sys
 
+import pytest
+
 PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), os.pardir))
 SRC_DIR = os.path.join(PROJECT_ROOT, "src")
 
@@ -8,3 +10,34 @@ if PROJECT_ROOT not in sys.path:
     sys.path.insert(0, PROJECT_ROOT)
 if SRC_DIR not in sys.path:
     sys.path.insert(0, SRC_DIR)
+
+
+@pytest.fixture
+def make_pipeline(tmp_path):
+    """Factory for pipelines whose HTTP validators are stored in ``tmp_path``."""
+    from services.http_cache import ValidatorStore
+    from services.pipeline import Pipeline
+
+    def _make(**kwargs):
+        return Pipeline(validators=ValidatorStore(str(tmp_path / "validators.json")), **kwargs)
+
+    return _make
+
+
+@pytest.fixture
+def offline_pipeline(make_pipeline, monkeypatch):
+    """Factory for pipelines that keep every item and hand each stored article to
+    ``upsert``; watermarks start empty and audit rows are dropped."""
+    from services.relevance_filter import FilterDecision
+
+    def _make(upsert, **kwargs):
+        p = make_pipeline(**kwargs)
+        monkeypatch.setattr(p.article_repo, "upsert_many", lambda items: [upsert(i) for i in items])
+        monkeypatch.setattr(p.article_repo, "existing", lambda urls: {})
+        monkeypatch.setattr(p.log_repo, "add", lambda *a, **k: None)
+        monkeypatch.setattr(p.watermarks, "get", lambda *a, **k: None)
+        monkeypatch.setattr(p.watermarks, "upsert", lambda *a, **k: None)
+        monkeypatch.setattr(p.filter, "filter_article", lambda it: (FilterDecision.KEEP, 1.0))
+        return p
+
+    return _make
@@ -1,6 +1,8 @@
 import asyncio
 import os
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, patch
+
+import httpx
 
 from src.services.pipeline import Pipeline
 
@@ -38,13 +40,8 @@ sources:
         encoding="utf-8",
     )
 
-    with patch("requests.get") as pget:
-        resp = Mock()
-        resp.status_code = 200
-        resp.text = SAMPLE_RSS
-        resp.headers = {"Content-Type": "application/rss+xml"}
-        pget.return_value = resp
-
+    resp = httpx.Response(200, text=SAMPLE_RSS, headers={"Content-Type": "application/rss+xml"})
+    with patch("httpx.AsyncClient.get", new=AsyncMock(return_value=resp)):
         stats = asyncio.run(Pipeline().run_from_config(str(cfg_path)))
 
     assert stats["total"] >= 1 and stats["kept"] >= 1
@@ -106,15 +103,8 @@ sources:
             encoding="utf-8",
         )
 
-    from unittest.mock import Mock, patch
-
-    with patch("requests.get") as pget:
-        resp = Mock()
-        resp.status_code = 200
-        resp.text = SAMPLE_RSS
-        resp.headers = {"Content-Type": "application/rss+xml"}
-        pget.return_value = resp
-
+    resp = httpx.Response(200, text=SAMPLE_RSS, headers={"Content-Type": "application/rss+xml"})
+    with patch("httpx.AsyncClient.get", new=AsyncMock(return_value=resp)):
         stats = asyncio.run(Pipeline().run_from_config(str(cfg_path)))
 
     # Basic sanity on ingestion
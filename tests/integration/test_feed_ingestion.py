@@ -1,5 +1,7 @@
 import asyncio
-from unittest.mock import Mock, patch
+from unittest.mock import AsyncMock, patch
+
+import httpx
 
 from src.services.feed_ingester import FeedIngester
 
@@ -33,12 +35,8 @@ async def _run_ingest(url: str):
 
 
 def test_feed_ingestion_and_standardization():
-    with patch("requests.get") as pget:
-        resp = Mock()
-        resp.status_code = 200
-        resp.text = SAMPLE_RSS
-        resp.headers = {"Content-Type": "application/rss+xml"}
-        pget.return_value = resp
+    resp = httpx.Response(200, text=SAMPLE_RSS, headers={"Content-Type": "application/rss+xml"})
+    with patch("httpx.AsyncClient.get", new=AsyncMock(return_value=resp)):
 
         url = "https://example.com/rss"
         articles = asyncio.run(_run_ingest(url))
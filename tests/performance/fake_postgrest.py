@@ -0,0 +1,134 @@
+"""Local stand-in for a PostgREST endpoint, for benchmarking Supabase writes offline.
+
+Serves ``POST /<table>?on_conflict=<col>`` on 127.0.0.1 with the Prefer semantics our
+writers use (``return=minimal|representation``, ``resolution=ignore-duplicates``),
+keeps rows in memory keyed by the conflict column, and can simulate per-request
+latency, a request body limit (413) and rows the database rejects (400 for the
+whole request, like a failing statement). ``peak_in_flight`` records how many
+requests it served at once.
+
+    with FakePostgREST(latency=0.01) as fake:
+        client = SyncPostgrestClient(fake.url)
+        SupabaseBatchWriter(client).write(rows)
+"""
+
+from __future__ import annotations
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Callable, Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+
+class FakePostgREST:
+    def __init__(
+        self,
+        latency: float = 0.0,
+        max_body_bytes: Optional[int] = None,
+        reject: Optional[Callable[[Dict[str, Any]], bool]] = None,
+    ) -> None:
+        self.latency = latency
+        self.max_body_bytes = max_body_bytes
+        self.reject = reject
+        self.tables: Dict[str, Dict[Any, Dict[str, Any]]] = {}
+        self.requests = 0
+        self.bytes_received = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._handler())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def rows(self, table: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            return list(self.tables.get(table, {}).values())
+
+    def start(self) -> "FakePostgREST":
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> "FakePostgREST":
+        return self.start()
+
+    def __exit__(self, *exc: Any) -> None:
+        self.stop()
+
+    def _apply(self, table: str, rows: List[Dict[str, Any]], key: str, ignore: bool) -> None:
+        with self._lock:
+            store = self.tables.setdefault(table, {})
+            for row in rows:
+                k = row.get(key)
+                if k in store and ignore:
+                    continue
+                store[k] = {**store.get(k, {}), **row}
+
+    def _handler(self) -> type:
+        fake = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args: Any) -> None:  # keep benchmark output quiet
+                pass
+
+            def _reply(self, status: int, body: Any = None) -> None:
+                data = b"" if body is None else json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(data)))
+                self.end_headers()
+                self.wfile.write(data)
+
+            def do_POST(self) -> None:  # noqa: N802 - http.server API
+                length = int(self.headers.get("Content-Length") or 0)
+                raw = self.rfile.read(length)
+                with fake._lock:
+                    fake.requests += 1
+                    fake.bytes_received += len(raw)
+                    fake.in_flight += 1
+                    fake.peak_in_flight = max(fake.peak_in_flight, fake.in_flight)
+                try:
+                    self._serve(raw)
+                finally:
+                    with fake._lock:
+                        fake.in_flight -= 1
+
+            def _serve(self, raw: bytes) -> None:
+                if fake.latency:
+                    time.sleep(fake.latency)
+                if fake.max_body_bytes is not None and len(raw) > fake.max_body_bytes:
+                    self._reply(413, {"code": "PGRST413", "message": "Payload Too Large"})
+                    return
+                parsed = urlparse(self.path)
+                table = parsed.path.rsplit("/", 1)[-1]
+                key = (parse_qs(parsed.query).get("on_conflict") or ["id"])[0]
+                payload = json.loads(raw or b"[]")
+                rows = payload if isinstance(payload, list) else [payload]
+                if fake.reject and any(fake.reject(r) for r in rows):
+                    self._reply(
+                        400,
+                        {"code": "22P02", "message": "invalid input syntax", "details": None},
+                    )
+                    return
+                prefer = self.headers.get("Prefer", "")
+                fake._apply(table, rows, key, "resolution=ignore-duplicates" in prefer)
+                if "return=minimal" in prefer:
+                    self._reply(201)
+                else:
+                    self._reply(201, rows)
+
+        return Handler
+
+
+__all__ = ["FakePostgREST"]
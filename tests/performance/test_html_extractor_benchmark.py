@@ -0,0 +1,69 @@
+from __future__ import annotations
+
+import os
+import time
+from pathlib import Path
+
+import pytest
+
+from src.services.html_extract import FieldExtractor, css_to_xpath
+from src.services.nfl_extractor import NFLArticleExtractor
+
+FIXTURES = Path(__file__).resolve().parents[1] / "fixtures" / "html"
+
+
+def page(name: str) -> str:
+    return (FIXTURES / f"{name}.html").read_text(encoding="utf-8")
+
+
+# Saved article pages: the full NFL.com layout, the fallback selectors, a bare page and
+# one whose first <h1> is empty (it still wins, as with soup.select_one, so the title
+# falls back to <title>)
+PAGES = ["nfl_article_full", "nfl_article_fallbacks", "nfl_article_bare", "nfl_article_empty_first"]
+DOCUMENTS = [page(name) for name in PAGES] + ["<html></html>", ""]
+
+
+@pytest.mark.parametrize("html", DOCUMENTS)
+def test_fast_path_matches_soup_reference(html):
+    extractor = NFLArticleExtractor()
+    url = "https://www.nfl.com/news/x"
+    fast = extractor._parse_article_lxml(html, url)
+    assert fast == extractor.parse_article_html_soup(html, url)
+
+
+def test_early_stop_skips_trailing_markup():
+    fields = FieldExtractor({"title": ["h1"]}, chunk_size=256)
+    parsed = fields.parse("<h1>Hello</h1>" + "<p>x</p>" * 2000 + "<h1>Later</h1>")
+    assert parsed.get("title").text == "Hello"
+    # Parsing stopped long before the end of the document
+    assert len(parsed.root.xpath("//p")) < 2000
+
+
+def test_css_to_xpath_simple_forms():
+    assert css_to_xpath("h1") == "//h1"
+    assert css_to_xpath('[data-testid="headline"]') == "//*[@data-testid='headline']"
+    assert css_to_xpath("time[datetime]") == "//time[@datetime]"
+    with pytest.raises(ValueError):
+        css_to_xpath("div > p")
+
+
+@pytest.mark.skipif(
+    not os.getenv("T4L_BENCHMARKS"), reason="timing benchmark; set T4L_BENCHMARKS=1 to run"
+)
+def test_fast_path_faster_than_soup():
+    html = page("nfl_article_full")
+    extractor = NFLArticleExtractor()
+    url = "https://www.nfl.com/news/x"
+    n = 30
+
+    start = time.perf_counter()
+    for _ in range(n):
+        extractor.parse_article_html_soup(html, url)
+    soup_dur = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for _ in range(n):
+        extractor._parse_article_lxml(html, url)
+    fast_dur = time.perf_counter() - start
+
+    assert fast_dur < soup_dur, f"fast={fast_dur:.3f}s soup={soup_dur:.3f}s"
@@ -0,0 +1,128 @@
+from __future__ import annotations
+
+import os
+import random
+import time
+from typing import List
+
+import pytest
+
+from src.services.keyword_matcher import SUBSTRING_MAX_KEYWORDS, KeywordMatcher
+
+TEAMS = {
+    "arizona": "cardinals",
+    "atlanta": "falcons",
+    "baltimore": "ravens",
+    "buffalo": "bills",
+    "carolina": "panthers",
+    "chicago": "bears",
+    "cincinnati": "bengals",
+    "cleveland": "browns",
+    "dallas": "cowboys",
+    "denver": "broncos",
+    "detroit": "lions",
+    "green bay": "packers",
+    "houston": "texans",
+    "indianapolis": "colts",
+    "jacksonville": "jaguars",
+    "kansas city": "chiefs",
+    "las vegas": "raiders",
+    "los angeles": "chargers",
+    "la": "rams",
+    "miami": "dolphins",
+    "minnesota": "vikings",
+    "new england": "patriots",
+    "new orleans": "saints",
+    "new york": "giants",
+    "ny": "jets",
+    "philadelphia": "eagles",
+    "pittsburgh": "steelers",
+    "san francisco": "49ers",
+    "seattle": "seahawks",
+    "tampa bay": "buccaneers",
+    "tennessee": "titans",
+    "washington": "commanders",
+}
+NICKNAMES = ["niners", "pats", "bucs", "boys", "fins", "pack", "bolts", "g-men", "birds"]
+PLAYERS = [
+    f"{first} {last}"
+    for first, last in [
+        ("patrick", "mahomes"),
+        ("josh", "allen"),
+        ("lamar", "jackson"),
+        ("joe", "burrow"),
+        ("jalen", "hurts"),
+        ("justin", "jefferson"),
+        ("travis", "kelce"),
+        ("tyreek", "hill"),
+        ("christian", "mccaffrey"),
+        ("micah", "parsons"),
+        ("ja'marr", "chase"),
+        ("cj", "stroud"),
+    ]
+]
+KEYWORDS = (
+    ["nfl"]
+    + list(TEAMS.values())
+    + [f"{city} {team}" for city, team in TEAMS.items()]
+    + NICKNAMES
+    + PLAYERS
+    + [p.split()[1] for p in PLAYERS]
+)
+FILLER = (
+    "report says coach week trade deal injury update season opener win loss late rally "
+    "practice contract extension rookie camp news analysis film breakdown stock market "
+    "weather recipe election concert festival"
+).split()
+
+
+def synthetic_titles(n: int, seed: int = 42) -> List[str]:
+    rng = random.Random(seed)
+    names = [w.title() for w in KEYWORDS]
+    titles = []
+    for _ in range(n):
+        words = [rng.choice(FILLER) for _ in range(rng.randint(6, 12))]
+        # About half of the titles mention one or two keywords
+        for _ in range(rng.choice((0, 0, 1, 2))):
+            words.insert(rng.randrange(len(words) + 1), rng.choice(names))
+        titles.append(" ".join(words).capitalize())
+    return titles
+
+
+def naive_counts(titles: List[str], keywords: List[str]) -> List[int]:
+    # What score_text_relevance did before: one substring test per keyword
+    counts = []
+    for t in titles:
+        lowered = t.lower()
+        counts.append(sum(1 for k in keywords if k in lowered))
+    return counts
+
+
+def test_matcher_agrees_with_per_keyword_substring_tests():
+    titles = synthetic_titles(10_000)
+    # Every team, city + team, nickname and star player: uses the automaton
+    assert len(KEYWORDS) > SUBSTRING_MAX_KEYWORDS
+    matcher = KeywordMatcher(KEYWORDS)
+    assert not matcher._substring
+
+    assert [matcher.count(t) for t in titles] == naive_counts(titles, KEYWORDS)
+
+
+@pytest.mark.skipif(
+    not os.getenv("T4L_BENCHMARKS"), reason="timing benchmark; set T4L_BENCHMARKS=1 to run"
+)
+def test_matcher_scales_past_per_keyword_substring_tests():
+    titles = synthetic_titles(100_000)
+    matcher = KeywordMatcher(KEYWORDS)
+
+    start = time.perf_counter()
+    naive_counts(titles, KEYWORDS)
+    naive_dur = time.perf_counter() - start
+
+    start = time.perf_counter()
+    for t in titles:
+        matcher.count(t)
+    fast_dur = time.perf_counter() - start
+
+    print(f"matcher={fast_dur:.3f}s substring={naive_dur:.3f}s")
+    assert fast_dur < naive_dur, f"matcher={fast_dur:.3f}s substring={naive_dur:.3f}s"
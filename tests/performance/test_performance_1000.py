@@ -39,10 +39,10 @@ def test_pipeline_processes_1000_plus_under_time(monkeypatch):
     monkeypatch.setattr(p.ingester, "extract_articles", fake_extract_articles)
 
     # Patch repositories to avoid real DB cost
-    def fake_upsert(data: Dict[str, Any]):
-        return SimpleNamespace(url=data.get("url"), publication_date=None)
+    def fake_upsert_many(items: List[Dict[str, Any]]):
+        return [SimpleNamespace(url=d.get("url"), publication_date=None) for d in items]
 
-    monkeypatch.setattr(p.article_repo, "upsert", fake_upsert)
+    monkeypatch.setattr(p.article_repo, "upsert_many", fake_upsert_many)
     monkeypatch.setattr(p.log_repo, "add", lambda *a, **k: None)
     monkeypatch.setattr(p.watermarks, "get", lambda *a, **k: None)
     monkeypatch.setattr(p.watermarks, "upsert", lambda *a, **k: None)
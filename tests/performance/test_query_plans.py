@@ -0,0 +1,106 @@
+"""Query plans for the knowledge-graph hot lookups (migrations 008 and 009).
+
+SQLite always runs; Postgres runs when ``T4L_TEST_POSTGRES_URL`` points at a
+disposable database; it is migrated to head first.
+"""
+
+from __future__ import annotations
+
+import os
+from typing import Any, Callable, List, Tuple
+
+import pytest
+from sqlalchemy import and_, create_engine, select, text
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from models import Base, ClaimSourceORM, EntityORM, EventEntityORM, EventORM
+from models.kg import claim_hash
+from services.kg_writer import _claim_lookup, _source_lookup
+
+HASHES = [claim_hash("Chiefs sign veteran linebacker"), claim_hash("Bills QB sprains ankle")]
+
+
+def events_list(team_id: str) -> Any:
+    # The query behind `events list --team-id`
+    return (
+        select(EventORM)
+        .join(EventEntityORM, EventEntityORM.event_id == EventORM.id)
+        .join(EntityORM, EntityORM.id == EventEntityORM.entity_id)
+        .where(and_(EntityORM.entity_type == "team", EntityORM.external_id == team_id))
+        .order_by(EventORM.event_date.desc().nullslast())
+        .limit(100)
+    )
+
+
+# (statement, index the plan must use, whether rows come out in index order)
+CASES: List[Tuple[Callable[[], Any], str, bool]] = [
+    (lambda: _claim_lookup([1, 2, 3], HASHES), "uq_claims_event_hash", False),
+    (lambda: _source_lookup(["ESPN", "NFL.com"]), "ix_sources_name", False),
+    (lambda: events_list("KC"), "ix_entities_type_external_id", False),
+    (
+        lambda: select(EventORM).order_by(EventORM.event_date.desc().nullslast()).limit(100),
+        "ix_events_event_date_desc",
+        True,
+    ),
+    (
+        lambda: select(ClaimSourceORM.claim_id).where(ClaimSourceORM.source_id == 7),
+        "ix_claim_sources_source",
+        False,
+    ),
+]
+
+
+def explain(engine: Engine, stmt: Any, prefix: str) -> str:
+    compiled = stmt.compile(dialect=engine.dialect, compile_kwargs={"literal_binds": True})
+    with Session(engine) as s:
+        if engine.dialect.name.startswith("postgres"):
+            # Tiny tables are cheaper to scan; ask whether the index is usable at all
+            s.execute(text("SET LOCAL enable_seqscan = off"))
+        rows = s.execute(text(f"{prefix} {compiled}")).all()
+    return "\n".join(" ".join(str(v) for v in row) for row in rows)
+
+
+@pytest.fixture(scope="module")
+def sqlite_engine(tmp_path_factory):
+    engine = create_engine(f"sqlite:///{tmp_path_factory.mktemp('plans') / 'kg.db'}")
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize("build, index, ordered", CASES, ids=[c[1] for c in CASES])
+def test_sqlite_uses_lookup_index(sqlite_engine, build, index, ordered):
+    plan = explain(sqlite_engine, build(), "EXPLAIN QUERY PLAN")
+    assert index in plan, plan
+    if ordered:
+        # Read straight off the index, no sort step
+        assert "TEMP B-TREE" not in plan, plan
+
+
+@pytest.fixture(scope="module")
+def monkeypatch_module():
+    with pytest.MonkeyPatch.context() as mp:
+        yield mp
+
+
+@pytest.fixture(scope="module")
+def postgres_engine(monkeypatch_module):
+    url = os.getenv("T4L_TEST_POSTGRES_URL")
+    if not url:
+        pytest.skip("T4L_TEST_POSTGRES_URL not set")
+    from database.init_db import upgrade_to_head
+
+    monkeypatch_module.setenv("DATABASE_URL", url)
+    upgrade_to_head()
+    engine = create_engine(url)
+    yield engine
+    engine.dispose()
+
+
+@pytest.mark.parametrize("build, index, ordered", CASES, ids=[c[1] for c in CASES])
+def test_postgres_uses_lookup_index(postgres_engine, build, index, ordered):
+    plan = explain(postgres_engine, build(), "EXPLAIN")
+    assert index in plan, plan
+    if ordered:
+        assert "Sort" not in plan, plan
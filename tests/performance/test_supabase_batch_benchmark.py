@@ -0,0 +1,91 @@
+from __future__ import annotations
+
+import os
+import time
+from typing import Any, Dict, List, Tuple
+
+import pytest
+from postgrest import SyncPostgrestClient
+
+from src.database.supabase_batch import SupabaseBatchWriter
+from tests.performance.fake_postgrest import FakePostgREST
+
+
+def make_rows(n: int):
+    return [
+        {"url": f"https://ex.com/a{i}", "title": f"Article {i}", "publisher": "Perf"}
+        for i in range(n)
+    ]
+
+
+def test_batched_writes_round_trip_through_postgrest_client():
+    with FakePostgREST() as fake:
+        client = SyncPostgrestClient(fake.url)
+        try:
+            result = SupabaseBatchWriter(client, max_rows=100, max_parallel=4).write(
+                make_rows(1000)
+            )
+        finally:
+            client.session.close()
+        assert result.ok and result.written == 1000
+        assert result.requests == fake.requests == 10
+        assert len(fake.rows("articles")) == 1000
+
+
+def test_bisection_isolates_rejected_row():
+    with FakePostgREST(reject=lambda r: r["url"].endswith("/a137")) as fake:
+        client = SyncPostgrestClient(fake.url)
+        try:
+            result = SupabaseBatchWriter(client, max_rows=256, max_parallel=1).write(make_rows(256))
+        finally:
+            client.session.close()
+        assert [r["url"] for r in result.failed] == ["https://ex.com/a137"]
+        assert result.written == 255
+        # One failing request per level plus its healthy sibling: 1 + 2 * log2(256)
+        assert result.requests == 17
+        assert len(fake.rows("articles")) == 255
+
+
+def test_byte_limit_keeps_requests_under_server_body_limit():
+    rows = [dict(r, content="x" * 2000) for r in make_rows(200)]
+    with FakePostgREST(max_body_bytes=64_000) as fake:
+        client = SyncPostgrestClient(fake.url)
+        try:
+            result = SupabaseBatchWriter(client, max_rows=500, max_bytes=60_000).write(rows)
+        finally:
+            client.session.close()
+        assert result.ok and len(fake.rows("articles")) == 200
+
+
+def run_under_latency(rows: List[Dict[str, Any]], parallel: int) -> Tuple[float, int]:
+    """Write ``rows`` against a server with 30ms latency; elapsed seconds and the
+    peak number of requests it served at once."""
+    with FakePostgREST(latency=0.03) as fake:
+        client = SyncPostgrestClient(fake.url)
+        try:
+            start = time.perf_counter()
+            result = SupabaseBatchWriter(client, max_rows=100, max_parallel=parallel).write(rows)
+            elapsed = time.perf_counter() - start
+        finally:
+            client.session.close()
+        assert result.ok and len(fake.rows("articles")) == 1200
+        return elapsed, fake.peak_in_flight
+
+
+def test_parallel_chunks_overlap_in_flight():
+    rows = make_rows(1200)
+    _, sequential_peak = run_under_latency(rows, 1)
+    _, parallel_peak = run_under_latency(rows, 6)
+    assert sequential_peak == 1
+    assert 1 < parallel_peak <= 6
+
+
+@pytest.mark.skipif(
+    not os.getenv("T4L_BENCHMARKS"), reason="timing benchmark; set T4L_BENCHMARKS=1 to run"
+)
+def test_parallel_chunks_beat_sequential_under_latency():
+    rows = make_rows(1200)
+    sequential, _ = run_under_latency(rows, 1)
+    parallel, _ = run_under_latency(rows, 6)
+    # 12 requests at ~30ms each: ~0.36s sequentially, ~2 rounds in parallel
+    assert parallel < sequential * 0.6
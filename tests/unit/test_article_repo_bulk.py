@@ -0,0 +1,108 @@
+from __future__ import annotations
+
+from datetime import datetime
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+from src.database.repositories.article_repo import ArticleRepository, content_hash
+from src.models.database import Base
+
+
+def make_repo(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'bulk.db'}", future=True)
+    Base.metadata.create_all(engine)
+    statements = []
+    event.listen(engine, "before_cursor_execute", lambda *a: statements.append(a[2]), retval=False)
+    return ArticleRepository(sessionmaker(bind=engine, future=True)), statements
+
+
+def test_upsert_many_inserts_and_returns_ids(tmp_path):
+    repo, statements = make_repo(tmp_path)
+    items = [
+        {
+            "url": f"https://ex.com/{i}",
+            "title": f"T{i}",
+            "publisher": "P",
+            "publication_date": f"2025-09-0{i + 1}T00:00:00Z",
+        }
+        for i in range(5)
+    ]
+
+    rows = repo.upsert_many(items)
+
+    assert [r.url for r in rows] == [it["url"] for it in items]
+    assert len({r.id for r in rows}) == 5
+    assert rows[-1].publication_date.replace(tzinfo=None) == datetime(2025, 9, 5)
+    inserts = [s for s in statements if s.lstrip().upper().startswith("INSERT")]
+    assert len(inserts) == 1 and "ON CONFLICT" in inserts[0].upper()
+
+
+def test_upsert_many_merges_like_upsert(tmp_path):
+    repo, _ = make_repo(tmp_path)
+    first = repo.upsert(
+        {
+            "url": "https://ex.com/a",
+            "title": "Original",
+            "publisher": "P",
+            "publication_date": "2025-09-01T00:00:00Z",
+            "content_summary": "keep me",
+        }
+    )
+
+    rows = repo.upsert_many(
+        [
+            {"url": "https://ex.com/a", "title": "", "publisher": "Q"},
+            {"url": "https://ex.com/b", "title": "B", "content_summary": "b1"},
+            {"url": "https://ex.com/b", "title": "", "content_summary": "b2"},
+        ]
+    )
+
+    assert [r.url for r in rows] == ["https://ex.com/a", "https://ex.com/b"]
+    assert rows[0].id == first.id
+    a = repo.get_by_url("https://ex.com/a")
+    assert a.title == "Original" and a.publisher == "Q"
+    assert a.content_summary == "keep me" and a.publication_date is not None
+    b = repo.get_by_url("https://ex.com/b")
+    assert b.title == "B" and b.content_summary == "b2"
+
+
+def test_upsert_many_chunks_and_empty(tmp_path):
+    repo, statements = make_repo(tmp_path)
+    assert repo.upsert_many([]) == []
+    rows = repo.upsert_many(
+        [{"url": f"https://ex.com/{i}", "title": "t"} for i in range(25)], chunk_size=10
+    )
+    assert len(rows) == 25
+    assert sum(1 for s in statements if s.lstrip().upper().startswith("INSERT")) == 3
+
+
+def test_existing_returns_stored_hashes_in_chunked_queries(tmp_path):
+    repo, statements = make_repo(tmp_path)
+    single = {"url": "https://ex.com/one", "title": "One", "publisher": "P"}
+    repo.upsert(single)
+    batch = [{"url": f"https://ex.com/{i}", "title": f"T{i}"} for i in range(5)]
+    repo.upsert_many(batch)
+    statements.clear()
+
+    urls = [it["url"] for it in batch] + ["https://ex.com/one", "https://ex.com/new"]
+    found = repo.existing(urls + urls[:2], chunk_size=4)
+
+    assert set(found) == set(urls) - {"https://ex.com/new"}
+    assert found["https://ex.com/one"] == content_hash(single)
+    assert found["https://ex.com/3"] == content_hash(batch[3])
+    selects = [s for s in statements if s.lstrip().upper().startswith("SELECT")]
+    assert len(selects) == 2 and all(" IN " in s.upper() for s in selects)
+
+
+def test_content_hash_tracks_written_fields(tmp_path):
+    repo, _ = make_repo(tmp_path)
+    item = {"url": "https://ex.com/a", "title": "A", "publication_date": "2025-09-01T00:00:00Z"}
+    assert content_hash(item) == content_hash(dict(item, url="https://other"))
+    assert content_hash(item) != content_hash(dict(item, title="B"))
+    # A present summary (even None) overwrites the stored one, so it hashes differently
+    assert content_hash(item) != content_hash(dict(item, content_summary=None))
+
+    repo.upsert_many([item])
+    repo.upsert_many([dict(item, title="B")])
+    assert repo.existing([item["url"]]) == {item["url"]: content_hash(dict(item, title="B"))}
@@ -3,9 +3,25 @@ from __future__ import annotations
 import asyncio
 import time
 
+import httpx
 import pytest
 
-from src.services.async_processor import map_async, retry
+from src.services.async_processor import (
+    AdaptiveLimiter,
+    HostScheduler,
+    TokenBucket,
+    map_async,
+    parse_retry_after,
+    retry,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 100.0
+
+    def __call__(self) -> float:
+        return self.now
 
 
 def test_map_async_and_retry_success_after_failure():
@@ -39,3 +55,98 @@ def test_retry_timeout():
     with pytest.raises(asyncio.TimeoutError):
         asyncio.run(retry(slow, retries=0, timeout=0.01))
     assert time.time() - t0 < 0.2
+
+
+def test_token_bucket_refill_and_block():
+    clock = FakeClock()
+    bucket = TokenBucket(rate=2.0, burst=2, clock=clock)
+    assert bucket.reserve() == 0 and bucket.reserve() == 0
+    # Bucket empty: third token is owed half a second at 2 tokens/s
+    assert bucket.reserve() == pytest.approx(0.5)
+    clock.now += 5
+    assert bucket.reserve() == 0
+    bucket.block_for(3)
+    assert bucket.reserve() == pytest.approx(3)
+
+
+def test_adaptive_limiter_aimd():
+    clock = FakeClock()
+    limiter = AdaptiveLimiter(initial=4, min_limit=1, max_limit=6, cooldown=1.0, clock=clock)
+    for _ in range(5):
+        limiter.on_success()
+    assert int(limiter.limit) == 5  # about +1 per window of `limit` successes
+    limiter.on_congestion()
+    limiter.on_congestion()  # within cooldown: counted once
+    assert limiter.limit == pytest.approx(2.5, abs=0.1)
+    clock.now += 2
+    limiter.on_congestion()
+    limiter.on_congestion()
+    clock.now += 2
+    limiter.on_congestion()
+    assert limiter.limit == 1
+
+
+def test_adaptive_limiter_caps_in_flight():
+    limiter = AdaptiveLimiter(initial=2, max_limit=2)
+    state = {"active": 0, "peak": 0}
+
+    async def job():
+        await limiter.acquire()
+        try:
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            await asyncio.sleep(0.001)
+            state["active"] -= 1
+        finally:
+            limiter.release()
+
+    async def main():
+        await asyncio.gather(*[job() for _ in range(8)])
+
+    asyncio.run(main())
+    assert state["peak"] == 2 and limiter.in_flight == 0
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("7") == 7
+    assert parse_retry_after("-3") == 0
+    assert parse_retry_after("9999", max_delay=60) == 60
+    assert parse_retry_after("Wed, 21 Oct 2015 07:28:00 GMT") == 0  # in the past
+    assert parse_retry_after("soon") is None and parse_retry_after(None) is None
+
+
+def test_host_scheduler_backs_off_and_honours_retry_after():
+    scheduler = HostScheduler(rate=0, initial_concurrency=8, max_concurrency=8)
+
+    async def main():
+        async with scheduler.slot("https://pub.example/feed") as slot:
+            slot.observe(httpx.Response(429, headers={"Retry-After": "30"}))
+
+    asyncio.run(main())
+    state = scheduler.host_state("pub.example")
+    assert state.limiter.limit == 4
+    assert state.bucket.reserve() == pytest.approx(30, abs=1)
+    # Other hosts are unaffected
+    assert scheduler.host_state("other.example").bucket.reserve() == 0
+
+
+def test_host_scheduler_ramps_up_and_backs_off_on_timeout():
+    scheduler = HostScheduler(rate=0, initial_concurrency=2, max_concurrency=4)
+
+    async def ok():
+        async with scheduler.slot("https://pub.example/a") as slot:
+            slot.observe(httpx.Response(200))
+
+    async def timeout():
+        async with scheduler.slot("https://pub.example/b"):
+            raise httpx.ReadTimeout("slow")
+
+    async def main():
+        for _ in range(10):
+            await ok()
+        with pytest.raises(httpx.ReadTimeout):
+            await timeout()
+
+    state = scheduler.host_state("pub.example")
+    asyncio.run(main())
+    assert state.limiter.limit < 4 and state.limiter.in_flight == 0
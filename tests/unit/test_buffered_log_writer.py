@@ -0,0 +1,89 @@
+from __future__ import annotations
+
+import pytest
+from sqlalchemy import create_engine, event, func, select
+from sqlalchemy.orm import sessionmaker
+
+from src.database.repositories.log_repo import BufferedLogWriter, ProcessingLogRepository
+from src.models.database import Base, ProcessingLogORM
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def make_repo(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'logs.db'}", future=True)
+    Base.metadata.create_all(engine)
+    inserts = []
+
+    def on_execute(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT"):
+            inserts.append(executemany)
+
+    event.listen(engine, "before_cursor_execute", on_execute)
+    factory = sessionmaker(bind=engine, future=True)
+    return ProcessingLogRepository(factory), factory, inserts
+
+
+def count_rows(factory) -> int:
+    with factory() as session:
+        return session.scalar(select(func.count()).select_from(ProcessingLogORM))
+
+
+def test_flushes_on_size_in_one_executemany(tmp_path):
+    repo, factory, inserts = make_repo(tmp_path)
+    writer = BufferedLogWriter(repo, max_entries=3, max_age=60)
+
+    writer.add("INFO", "a", article_url="u1", metadata="{}")
+    writer.add("INFO", "b")
+    assert count_rows(factory) == 0 and writer.pending == 2
+    writer.add("INFO", "c")
+
+    assert count_rows(factory) == 3 and writer.pending == 0
+    assert inserts == [True]
+
+
+def test_flushes_on_age_and_close(tmp_path):
+    repo, factory, _ = make_repo(tmp_path)
+    clock = FakeClock()
+    writer = BufferedLogWriter(repo, max_entries=100, max_age=2.0, clock=clock)
+
+    writer.add("INFO", "a")
+    clock.now = 2.5
+    writer.add("INFO", "b")  # oldest entry is now past max_age
+    assert count_rows(factory) == 2
+
+    with writer:
+        writer.add("INFO", "c")
+    assert count_rows(factory) == 3
+
+
+def test_auto_flush_off_only_buffers(tmp_path):
+    repo, factory, _ = make_repo(tmp_path)
+    writer = BufferedLogWriter(repo, max_entries=2, auto_flush=False)
+
+    for message in ("a", "b", "c"):
+        writer.add("INFO", message)
+    assert count_rows(factory) == 0 and writer.pending == 3 and writer.due
+
+    assert writer.flush() == 3 and count_rows(factory) == 3
+
+
+def test_failed_flush_keeps_entries(tmp_path):
+    repo, factory, _ = make_repo(tmp_path)
+    writer = BufferedLogWriter(repo, max_entries=100)
+    writer.add("INFO", "a")
+
+    real = repo.add_many
+    repo.add_many = lambda entries: (_ for _ in ()).throw(RuntimeError("db down"))
+    with pytest.raises(RuntimeError):
+        writer.flush()
+    assert writer.pending == 1
+
+    repo.add_many = real
+    assert writer.flush() == 1 and count_rows(factory) == 1
@@ -20,12 +20,20 @@ def test_ingest_rss_path(monkeypatch):
             ]
 
     # Patch constructor in module scope
-    monkeypatch.setattr("cli.commands.ingest.FeedIngester", lambda: FakeFI())
+    stores: List[Any] = []
+
+    def make_fi(validators: Any = None) -> FakeFI:
+        stores.append(validators)
+        return FakeFI()
+
+    monkeypatch.setattr("cli.commands.ingest.FeedIngester", make_fi)
 
     runner = CliRunner()
     result = runner.invoke(ingest_cmd, ["--url", "http://example.com/rss", "--type", "rss"])
     assert result.exit_code == 0
     assert "Parsed 2 RSS entries" in result.output
+    # Never conditional, so validators from pipeline runs cannot turn it into a 304
+    assert len(stores) == 1 and not stores[0].enabled
 
 
 def test_ingest_sitemap_path(monkeypatch):
@@ -47,3 +55,17 @@ def test_ingest_sitemap_path(monkeypatch):
     result = runner.invoke(ingest_cmd, ["--url", "http://example.com/sm.xml", "--type", "sitemap"])
     assert result.exit_code == 0
     assert "Parsed 3 sitemap URLs" in result.output
+
+
+def test_ingest_sitemap_index_path(monkeypatch):
+    async def fake_crawl(url: str):
+        return [{"url": "http://x/1", "lastmod": None}, {"url": "http://x/2", "lastmod": None}]
+
+    monkeypatch.setattr("cli.commands.ingest.crawl_sitemap_async", fake_crawl)
+
+    runner = CliRunner()
+    result = runner.invoke(
+        ingest_cmd, ["--url", "http://example.com/index.xml", "--type", "sitemap-index"]
+    )
+    assert result.exit_code == 0
+    assert "Parsed 2 sitemap URLs" in result.output
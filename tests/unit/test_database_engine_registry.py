@@ -0,0 +1,85 @@
+from __future__ import annotations
+
+import sqlite3
+
+from sqlalchemy import inspect
+
+from src.database import connection as conn
+
+
+def test_engine_and_sessionmaker_are_shared_per_url(monkeypatch, tmp_path):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'a.db'}")
+    calls = {"create_all": 0}
+    original_meta = conn.Base.metadata
+
+    class FakeMeta:
+        def create_all(self, bind=None):
+            calls["create_all"] += 1
+
+    try:
+        conn.Base.metadata = FakeMeta()  # type: ignore
+        first = conn.get_engine()
+        assert conn.get_engine() is first
+        assert conn.get_sessionmaker() is conn.get_sessionmaker()
+        assert conn.get_sessionmaker().kw["bind"] is first
+        assert calls["create_all"] == 1  # schema check runs once per engine
+
+        monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'b.db'}")
+        assert conn.get_engine() is not first
+        assert conn.get_engine(echo=True) is not conn.get_engine()
+    finally:
+        conn.Base.metadata = original_meta  # type: ignore
+
+
+def test_dispose_engines_resets_registry(monkeypatch, tmp_path):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'c.db'}")
+    first = conn.get_engine()
+    conn.dispose_engines()
+    assert conn.get_engine() is not first
+
+
+def test_postgres_pool_options_and_sqlite_warm_up(monkeypatch, tmp_path):
+    monkeypatch.setenv("DB_POOL_SIZE", "3")
+    opts = conn._engine_options("postgresql+psycopg://u:p@10.0.0.1/db", echo=False)
+    assert opts["pool_size"] == 3 and opts["pool_pre_ping"] is True
+    assert "pool_size" not in conn._engine_options("sqlite:///x.db", echo=False)
+
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'd.db'}")
+    assert conn.warm_up() == 0
+
+
+def test_sqlite_schema_check_adds_new_nullable_columns(monkeypatch, tmp_path):
+    db = tmp_path / "legacy.db"
+    with sqlite3.connect(db) as legacy:
+        # articles as created before the content_hash column existed
+        legacy.execute(
+            "CREATE TABLE articles (id INTEGER PRIMARY KEY, url VARCHAR(1000) NOT NULL, "
+            "title VARCHAR(512) NOT NULL, publisher VARCHAR(256) NOT NULL, "
+            "publication_date DATETIME, content_summary TEXT, created_at DATETIME NOT NULL)"
+        )
+        # claims as created before claim_hash and the lookup indexes existed
+        legacy.execute(
+            "CREATE TABLE claims (id INTEGER PRIMARY KEY, event_id INTEGER NOT NULL, "
+            "claim_text TEXT NOT NULL, status VARCHAR(16) NOT NULL)"
+        )
+        # claim sources duplicated by re-runs, which the new unique index rejects
+        legacy.execute(
+            "CREATE TABLE claim_sources (id INTEGER PRIMARY KEY, claim_id INTEGER NOT NULL, "
+            "source_id INTEGER NOT NULL, url VARCHAR(1000), citation TEXT)"
+        )
+        legacy.executemany(
+            "INSERT INTO claim_sources (claim_id, source_id) VALUES (?, ?)", [(1, 1), (1, 1)]
+        )
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db}")
+    conn.dispose_engines()
+    try:
+        columns = {c["name"] for c in inspect(conn.get_engine()).get_columns("articles")}
+        assert "content_hash" in columns
+        with sqlite3.connect(db) as check:
+            indexes = {row[0] for row in check.execute("SELECT name FROM sqlite_master")}
+        assert {"ix_claims_event", "uq_claims_event_hash", "ix_claim_sources_source"} <= indexes
+        assert "uq_claim_sources_claim_source_url" not in indexes
+        claims = {c["name"] for c in inspect(conn.get_engine()).get_columns("claims")}
+        assert "claim_hash" in claims
+    finally:
+        conn.dispose_engines()
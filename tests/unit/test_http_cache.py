@@ -0,0 +1,78 @@
+from __future__ import annotations
+
+import asyncio
+from unittest.mock import AsyncMock, patch
+
+import httpx
+
+from services.feed_ingester import FeedIngester
+from services.http_cache import ValidatorStore
+
+
+def test_validator_store_roundtrip(tmp_path):
+    path = str(tmp_path / "validators.json")
+    store = ValidatorStore(path)
+    url = "https://example.com/rss"
+    assert store.request_headers(url) == {}
+
+    store.remember(url, {"ETag": '"abc"', "Last-Modified": "Sun, 07 Sep 2025 12:00:00 GMT"})
+    store.save()
+
+    reloaded = ValidatorStore(path)
+    assert reloaded.request_headers(url) == {
+        "If-None-Match": '"abc"',
+        "If-Modified-Since": "Sun, 07 Sep 2025 12:00:00 GMT",
+    }
+
+    # Staged-but-unsaved changes are not persisted; forget drops the entry
+    reloaded.forget(url)
+    assert ValidatorStore(path).get(url) is not None
+    reloaded.save()
+    assert ValidatorStore(path).get(url) is None
+
+
+def test_validator_store_disabled_and_corrupt_file(tmp_path):
+    path = tmp_path / "validators.json"
+    path.write_text("not json", encoding="utf-8")
+    store = ValidatorStore(str(path))
+    assert store.get("https://example.com") is None
+
+    off = ValidatorStore(str(path), enabled=False)
+    off.remember("https://example.com", {"ETag": "x"})
+    assert off.request_headers("https://example.com") == {}
+
+
+def test_fetch_feed_sends_validators_and_reports_304(tmp_path):
+    store = ValidatorStore(str(tmp_path / "v.json"))
+    url = "https://example.com/rss"
+    store.remember(url, {"ETag": '"v1"'})
+    resp = httpx.Response(304)
+
+    with patch("httpx.AsyncClient.get", new=AsyncMock(return_value=resp)) as mget:
+        out = asyncio.run(FeedIngester(validators=store).fetch_feed(url))
+
+    assert mget.call_args.kwargs["headers"]["If-None-Match"] == '"v1"'
+    assert out["status"] == 304 and out["not_modified"] is True and out["content"] == ""
+
+
+def test_pipeline_short_circuits_unchanged_feed(make_pipeline, monkeypatch):
+    p = make_pipeline()
+    # The ingester records validators in the store the pipeline commits
+    assert p.ingester.validators is p.validators
+
+    async def fake_fetch_feed(url: str):
+        return {"url": url, "status": 304, "not_modified": True, "content": ""}
+
+    def fail(*a, **k):
+        raise AssertionError("downstream stage must not run for a 304")
+
+    monkeypatch.setattr(p.ingester, "fetch_feed", fake_fetch_feed)
+    monkeypatch.setattr(p.ingester, "extract_articles", fail)
+    monkeypatch.setattr(p.filter, "filter_article", fail)
+    monkeypatch.setattr(p.article_repo, "upsert", fail)
+    monkeypatch.setattr(p.watermarks, "get", lambda *a, **k: None)
+    monkeypatch.setattr(p.watermarks, "upsert", fail)
+
+    src = {"name": "unchanged", "type": "rss", "url": "https://ex.com/rss"}
+    st = asyncio.run(p._process_source(src, {}))
+    assert st == {"total": 0, "kept": 0, "rejected": 0, "escalated": 0}
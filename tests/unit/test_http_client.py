@@ -0,0 +1,45 @@
+from __future__ import annotations
+
+import asyncio
+
+import httpx
+
+from src.services import http_client
+
+
+def test_sync_client_is_shared_and_recreated_after_close():
+    c1 = http_client.get_client()
+    c2 = http_client.get_client()
+    assert c1 is c2
+    assert c1.headers["User-Agent"] == http_client.user_agent()
+
+    http_client.close_client()
+    assert c1.is_closed
+    c3 = http_client.get_client()
+    assert c3 is not c1 and not c3.is_closed
+    http_client.close_client()
+
+
+def test_async_client_is_shared_within_a_loop():
+    async def run() -> tuple[httpx.AsyncClient, httpx.AsyncClient]:
+        a = http_client.get_async_client()
+        b = http_client.get_async_client()
+        await http_client.aclose_async_client()
+        return a, b
+
+    a1, b1 = asyncio.run(run())
+    assert a1 is b1 and a1.is_closed
+
+    # A fresh loop gets its own client
+    a2, _ = asyncio.run(run())
+    assert a2 is not a1
+
+
+def test_http2_flag_from_env(monkeypatch):
+    monkeypatch.delenv("T4L_HTTP2", raising=False)
+    assert http_client.http2_enabled() is False
+    monkeypatch.setenv("T4L_HTTP2", "1")
+    monkeypatch.setattr(http_client.importlib.util, "find_spec", lambda name: object())
+    assert http_client.http2_enabled() is True
+    monkeypatch.setattr(http_client.importlib.util, "find_spec", lambda name: None)
+    assert http_client.http2_enabled() is False
@@ -1,5 +1,9 @@
 from __future__ import annotations
 
+import os
+
+from sqlalchemy import create_engine, inspect, text
+
 from src.database import init_db
 
 
@@ -23,3 +27,24 @@ def test_upgrade_to_head_invokes_alembic(monkeypatch, tmp_path):
 
     assert called.get("cfg_path") == str(ini)
     assert called.get("rev") == "head"
+
+
+def test_fresh_sqlite_database_migrates_to_heads(monkeypatch, tmp_path):
+    db = tmp_path / "fresh.db"
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{db}")
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(init_db.__file__)))
+    # alembic.ini locates the migrations relative to the working directory
+    monkeypatch.chdir(project_root)
+
+    init_db.upgrade_to_head()
+
+    engine = create_engine(f"sqlite:///{db}")
+    try:
+        with engine.connect() as conn:
+            versions = conn.execute(text("SELECT version_num FROM alembic_version")).scalars()
+            assert list(versions) == ["009_claim_hash_dedup"]
+        inspector = inspect(engine)
+        assert "content_hash" in {c["name"] for c in inspector.get_columns("articles")}
+        assert "claim_hash" in {c["name"] for c in inspector.get_columns("claims")}
+    finally:
+        engine.dispose()
@@ -0,0 +1,62 @@
+from __future__ import annotations
+
+import random
+
+import pytest
+
+from services.keyword_matcher import SUBSTRING_MAX_KEYWORDS, KeywordMatcher
+from services.relevance_filter import FilterDecision, RelevanceFilter
+from services.rule_filter import score_text_relevance
+
+# Overlapping and nested keywords exercise the failure links
+NESTED = ["he", "she", "his", "hers", "ers", "r", "49ers", "niners", "new york jets", "jets"]
+MANY = NESTED + [f"team{i}" for i in range(SUBSTRING_MAX_KEYWORDS)]
+
+
+def naive(text: str, keywords: list[str]) -> int:
+    return sum(1 for k in keywords if k and k.lower() in text.lower())
+
+
+@pytest.mark.parametrize("keywords", [NESTED, MANY], ids=["substring", "automaton"])
+def test_counts_match_substring_tests(keywords):
+    rng = random.Random(7)
+    alphabet = "heirsn49 jwtyoka"
+    matcher = KeywordMatcher(keywords)
+    for _ in range(2000):
+        text = "".join(rng.choice(alphabet) for _ in range(rng.randint(0, 40)))
+        assert matcher.count(text) == naive(text, keywords), text
+
+
+def test_case_duplicates_and_empty_keywords():
+    matcher = KeywordMatcher(MANY + ["JETS", ""])
+    # "he", "r" (in "york"), "new york jets" and "jets" twice
+    assert matcher.count("The New York Jets") == 5
+    assert matcher.find("The New York Jets") == ["he", "r", "new york jets", "jets"]
+    assert matcher.count("") == 0
+    assert KeywordMatcher([]).count_fields("anything", "") == (0, 0)
+
+
+def test_count_fields_scans_each_field():
+    matcher = KeywordMatcher(MANY)
+    assert matcher.count_fields("Jets win", None, "https://x/team3") == (1, 0, 1)  # type: ignore
+
+
+def test_word_boundary_matches_whole_words_only():
+    matcher = KeywordMatcher(NESTED, word_boundary=True)
+    assert matcher.find("Jetsam washed up; she cheers the 49ers") == ["she", "49ers"]
+    assert matcher.find("https://nfl.com/newyorkjets/") == []
+    assert matcher.find("https://nfl.com/new-york-jets/") == ["jets"]
+    assert matcher.find("https://nfl.com/new york jets/") == ["new york jets", "jets"]
+
+
+def test_relevance_filter_uses_current_keywords():
+    keywords = ["chiefs", "mahomes", "kelce"]
+    f = RelevanceFilter(keywords=list(keywords))
+    article = {"title": "Mahomes and Kelce lead Chiefs", "url": "https://x/story"}
+    assert f.filter_article(article) == (FilterDecision.KEEP, 1.0)
+    assert score_text_relevance(article["title"], keywords) == 1.0
+
+    f.keywords = ["bills"]
+    assert f.filter_article(article)[0] == FilterDecision.REJECT
+    assert f.is_nfl_url_pattern("https://x/bills/news") and f.is_nfl_url_pattern("https://nfl/x")
+    assert not f.is_nfl_team_mention("Mahomes")
@@ -0,0 +1,301 @@
+from __future__ import annotations
+
+import hashlib
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+from sqlalchemy import create_engine, event, select
+from sqlalchemy.orm import Session, sessionmaker
+
+from models import Base, ClaimORM, ClaimSourceORM, EventArticleORM, EventORM, SourceORM
+from services import kg_writer
+from services.claim_extractor import extract_allowlisted_claims
+from services.kg_writer import recompute_event_confidence, write_event_graph
+from services.signature import event_signature
+
+
+def legacy_write(session: Session, articles: List[Dict[str, Any]]) -> int:
+    """The per-article implementation write_event_graph replaced (reference oracle)."""
+    created_or_linked = 0
+    for a in articles:
+        title = a.get("title") or ""
+        pub = a.get("publication_date")
+        pub_dt = None
+        try:
+            if isinstance(pub, str):
+                from dateutil import parser as dtp  # type: ignore
+
+                pub_dt = dtp.parse(pub)
+            elif pub:
+                pub_dt = pub
+        except Exception:
+            pub_dt = None
+        sig = event_signature(title, pub_dt)
+        ev = session.query(EventORM).filter_by(signature=sig).one_or_none()
+        now = datetime.now(timezone.utc)
+        if not ev:
+            ev = EventORM(
+                signature=sig,
+                event_date=pub_dt,
+                title=title,
+                summary=a.get("content_summary"),
+                created_at=now,
+                updated_at=now,
+            )
+            session.add(ev)
+            session.flush()
+        else:
+            ev.updated_at = now
+        url = a.get("url") or ""
+        pseudo_id = (
+            -(int(hashlib.sha1(url.encode("utf-8")).hexdigest(), 16) % 2147483647) if url else 0
+        )
+        exists = (
+            session.query(EventArticleORM)
+            .filter_by(event_id=ev.id, article_id=pseudo_id)
+            .one_or_none()
+        )
+        if not exists:
+            session.add(EventArticleORM(event_id=ev.id, article_id=pseudo_id, relation="primary"))
+            created_or_linked += 1
+        claims = extract_allowlisted_claims(title, a.get("content_summary") or "")
+        if claims:
+            src_name = a.get("publisher") or "unknown"
+            src_url = a.get("url") or None
+            source = session.query(SourceORM).filter_by(name=src_name, url=src_url).one_or_none()
+            if not source:
+                source = SourceORM(name=src_name, publisher=src_name, url=src_url)
+                session.add(source)
+                session.flush()
+            for c in claims:
+                existing = (
+                    session.query(ClaimORM)
+                    .filter_by(event_id=ev.id, claim_text=c.text)
+                    .one_or_none()
+                )
+                if existing:
+                    claim_id = existing.id
+                else:
+                    row = ClaimORM(event_id=ev.id, claim_text=c.text, status=c.status)
+                    session.add(row)
+                    session.flush()
+                    claim_id = row.id
+                # Claim sources are unique per (claim, source, url) since the oracle was
+                # replaced; it used to append a duplicate on every re-run
+                cited = (
+                    session.query(ClaimSourceORM)
+                    .filter_by(claim_id=claim_id, source_id=source.id, url=src_url)
+                    .one_or_none()
+                )
+                if not cited:
+                    session.add(
+                        ClaimSourceORM(
+                            claim_id=claim_id,
+                            source_id=source.id,
+                            url=src_url,
+                            citation=c.citation,
+                        )
+                    )
+    return created_or_linked
+
+
+def make_factory(tmp_path, name: str):
+    engine = create_engine(f"sqlite:///{tmp_path / name}")
+    Base.metadata.create_all(engine)
+    statements: List[str] = []
+    event.listen(engine, "before_cursor_execute", lambda *a: statements.append(a[2]))
+    return sessionmaker(bind=engine), statements
+
+
+def dump(factory) -> Dict[str, List[tuple]]:
+    with factory() as s:
+        return {
+            "events": [
+                (e.id, e.signature, e.event_date, e.title, e.summary)
+                for e in s.scalars(select(EventORM).order_by(EventORM.id))
+            ],
+            "links": [
+                (x.id, x.event_id, x.article_id, x.relation)
+                for x in s.scalars(select(EventArticleORM).order_by(EventArticleORM.id))
+            ],
+            "sources": [
+                (x.id, x.name, x.publisher, x.url)
+                for x in s.scalars(select(SourceORM).order_by(SourceORM.id))
+            ],
+            "claims": [
+                (x.id, x.event_id, x.claim_text, x.claim_hash, x.status)
+                for x in s.scalars(select(ClaimORM).order_by(ClaimORM.id))
+            ],
+            "claim_sources": [
+                (x.id, x.claim_id, x.source_id, x.url, x.citation)
+                for x in s.scalars(select(ClaimSourceORM).order_by(ClaimSourceORM.id))
+            ],
+        }
+
+
+def article(i: int, title: str, **kw: Any) -> Dict[str, Any]:
+    base = {
+        "url": f"https://ex.com/nfl/{i}",
+        "title": title,
+        "publisher": "ESPN",
+        "publication_date": "2025-09-0%dT12:00:00Z" % (1 + i % 5),
+        "content_summary": f"NFL news item {i}",
+    }
+    return base | kw
+
+
+def batches() -> List[List[Dict[str, Any]]]:
+    first = [
+        article(1, "Chiefs sign veteran linebacker to one-year NFL deal"),
+        article(2, "Bills quarterback suffers ankle sprain at practice"),
+        # Same signature as 1 (same title and day), different URL and publisher
+        article(6, "Chiefs sign veteran linebacker to one-year NFL deal", publisher="NFL.com"),
+        # Same URL twice in one batch
+        article(3, "Eagles waived kicker after NFL preseason"),
+        article(3, "Eagles waived kicker after NFL preseason"),
+        article(4, "NFL power rankings: week 1"),
+        article(5, "Jets acquire receiver in NFL trade", publisher=None, url=None),
+        article(7, "Packers activated tight end from NFL injured reserve", publication_date=None),
+    ]
+    # A re-poll repeating most items plus new ones
+    second = first[:4] + [
+        article(8, "Ravens sign rookie NFL safety"),
+        article(2, "Bills quarterback suffers ankle sprain at practice", content_summary="x"),
+    ]
+    return [first, second]
+
+
+def test_batch_writer_builds_the_same_graph_with_few_queries(tmp_path):
+    legacy, _ = make_factory(tmp_path, "legacy.db")
+    batched, statements = make_factory(tmp_path, "batched.db")
+    legacy_links, batched_links = [], []
+    for batch in batches():
+        with legacy() as s:
+            legacy_links.append(legacy_write(s, batch))
+            s.commit()
+        statements.clear()
+        with batched() as s:
+            batched_links.append(write_event_graph(s, batch).links_created)
+            s.commit()
+        # A bounded number of statements per batch, not a few per article
+        assert len(statements) <= 12
+
+    expected = dump(legacy)
+    assert dump(batched) == expected
+    assert batched_links == legacy_links
+    assert expected["claims"] and expected["claim_sources"] and expected["sources"]
+
+
+def test_empty_batch_is_a_no_op(tmp_path):
+    factory, statements = make_factory(tmp_path, "empty.db")
+    with factory() as s:
+        assert write_event_graph(s, []).links_created == 0
+    assert statements == []
+
+
+def test_rewriting_a_batch_adds_no_claims_or_claim_sources(tmp_path, monkeypatch):
+    factory, _ = make_factory(tmp_path, "rerun.db")
+    first, _ = batches()
+    with factory() as s:
+        write_event_graph(s, first)
+        s.commit()
+    before = dump(factory)
+    assert all(len(c[3]) == 64 for c in before["claims"])
+
+    # Claims stored by a concurrent writer after the lookup: the insert skips them
+    # and a second lookup resolves their ids
+    real_lookup = kg_writer._lookup_claims
+    calls: List[int] = []
+
+    def stale_lookup(session: Session, keys: Any) -> Dict[Any, int]:
+        calls.append(len(keys))
+        return {} if len(calls) == 1 else real_lookup(session, keys)
+
+    monkeypatch.setattr(kg_writer, "_lookup_claims", stale_lookup)
+    with factory() as s:
+        write_event_graph(s, first + first)
+        s.commit()
+    assert len(calls) == 2
+    after = dump(factory)
+    assert after["claims"] == before["claims"]
+    assert after["claim_sources"] == before["claim_sources"]
+
+
+def test_concurrent_writers_share_new_events(tmp_path, monkeypatch):
+    factory, _ = make_factory(tmp_path, "race.db")
+    title = "Chiefs sign veteran linebacker to one-year NFL deal"
+    # Two sources persisting the same new event from different articles
+    work = [[article(1, title)], [article(6, title, publisher="NFL.com")]]
+
+    # Both writers look the event up before either inserts it
+    real_lookup = kg_writer._lookup_events
+    barrier = threading.Barrier(2, timeout=10)
+    local = threading.local()
+
+    def racing_lookup(session: Session, signatures: Any) -> Dict[str, int]:
+        found = real_lookup(session, signatures)
+        if not getattr(local, "waited", False):
+            local.waited = True
+            barrier.wait()
+        return found
+
+    monkeypatch.setattr(kg_writer, "_lookup_events", racing_lookup)
+    results: List[Any] = [None, None]
+
+    def persist(i: int) -> None:
+        try:
+            with factory() as s:
+                results[i] = write_event_graph(s, work[i]).event_ids
+                s.commit()
+        except Exception as e:
+            results[i] = e
+
+    threads = [threading.Thread(target=persist, args=(i,)) for i in range(2)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+
+    assert not any(isinstance(r, Exception) for r in results), results
+    assert results[0] == results[1]
+    graph = dump(factory)
+    assert len(graph["events"]) == 1 and len(graph["links"]) == 2
+
+
+def test_confidence_is_recomputed_for_touched_events_only(tmp_path):
+    factory, statements = make_factory(tmp_path, "conf.db")
+    first, second = batches()
+    with factory() as s:
+        write_event_graph(s, first)
+        s.commit()
+        untouched = s.scalars(select(EventORM.id).order_by(EventORM.id)).all()
+
+        written = write_event_graph(s, second[4:])
+        statements.clear()
+        scores = recompute_event_confidence(s, written.event_ids)
+        s.commit()
+        # One aggregate evidence query and one bulk UPDATE
+        assert len(statements) == 2 and statements[1].lstrip().upper().startswith("UPDATE")
+
+        assert set(scores) == written.event_ids
+        rows = dict(s.execute(select(EventORM.id, EventORM.confidence)).all())
+        assert all(rows[i] is None for i in untouched if i not in written.event_ids)
+        assert all(rows[i] == scores[i] for i in written.event_ids)
+
+
+def test_confidence_uses_claim_source_evidence(tmp_path):
+    factory, _ = make_factory(tmp_path, "evidence.db")
+    title = "Chiefs sign veteran linebacker to one-year NFL deal"
+    with factory() as s:
+        official = write_event_graph(s, [article(1, title, publisher="NFL.com")]).event_ids
+        other = write_event_graph(s, [article(2, title + " today")]).event_ids
+        corroborated = write_event_graph(s, [article(3, title + " today", url="https://b/3")])
+        scores = recompute_event_confidence(s, official | other | corroborated.event_ids)
+        plain = write_event_graph(s, [article(4, "NFL power rankings: week 1")]).event_ids
+        scores.update(recompute_event_confidence(s, plain))
+
+    (a,), (c,), (p,) = official, other, plain
+    assert corroborated.event_ids == other
+    # Tier A beats Tier C; articles without claims count as one Tier C report
+    assert scores[a] > scores[c] == scores[p] > 0
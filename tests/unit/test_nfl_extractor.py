@@ -1,7 +1,10 @@
 """Tests for NFL.com article extractor."""
 
-from unittest.mock import Mock, patch
+import asyncio
+from unittest.mock import AsyncMock, Mock, patch
 
+import httpx
+import pytest
 import requests
 
 from src.services.nfl_extractor import NFLArticleExtractor
@@ -148,6 +151,39 @@ class TestNFLArticleExtractor:
         assert result["author"] is None
         assert result["publish_date"] is None
 
+    def test_extract_article_content_async_uses_shared_client(self):
+        """Test async extraction sends session headers through the shared pool."""
+        mock_html = """
+        <html>
+            <head><title>Async Article | NFL.com</title></head>
+            <body><article><p>Async content that is comfortably over twenty chars.</p></article>
+            </body>
+        </html>
+        """
+        url = "https://www.nfl.com/news/async-article"
+        resp = httpx.Response(200, text=mock_html, request=httpx.Request("GET", url))
+
+        with patch("httpx.AsyncClient.get", new=AsyncMock(return_value=resp)) as mock_get:
+            extractor = NFLArticleExtractor()
+            result = asyncio.run(extractor.extract_article_content_async(url))
+
+        assert result is not None
+        assert result["title"] == "Async Article"
+        assert "Async content" in result["content"]
+        sent_headers = mock_get.call_args.kwargs["headers"]
+        assert sent_headers["User-Agent"] == extractor.session.headers["User-Agent"]
+        assert "Connection" not in sent_headers
+
+    def test_extract_article_content_async_http_error(self):
+        """Test async extraction returns None on HTTP errors."""
+        url = "https://www.nfl.com/news/missing"
+        resp = httpx.Response(404, request=httpx.Request("GET", url))
+
+        with patch("httpx.AsyncClient.get", new=AsyncMock(return_value=resp)):
+            result = asyncio.run(NFLArticleExtractor().extract_article_content_async(url))
+
+        assert result is None
+
     @patch.object(NFLArticleExtractor, "extract_article_content")
     @patch.object(NFLArticleExtractor, "is_recent")
     def test_process_sitemap_urls_success(self, mock_is_recent, mock_extract):
@@ -265,3 +301,60 @@ class TestNFLArticleExtractor:
 
         assert result == mock_articles
         mock_process.assert_called_once_with(mock_sitemap_urls, 5, 7)
+
+
+class TestConcurrentExtraction:
+    def _entries(self, n: int):
+        return [{"url": f"https://www.nfl.com/news/a-{i}", "lastmod": f"d{i}"} for i in range(n)]
+
+    def test_results_keep_sitemap_order_and_respect_limits(self):
+        extractor = NFLArticleExtractor(max_concurrency=4, per_host_limit=2)
+        state = {"active": 0, "peak": 0, "calls": 0}
+
+        async def fake_extract(url: str):
+            state["calls"] += 1
+            state["active"] += 1
+            state["peak"] = max(state["peak"], state["active"])
+            idx = int(url.rsplit("-", 1)[1])
+            # Later URLs finish first to prove ordering is restored
+            await asyncio.sleep(0.001 * (10 - idx))
+            state["active"] -= 1
+            return {"title": f"T{idx}", "url": url}
+
+        extractor.extract_article_content_async = fake_extract  # type: ignore[assignment]
+        with patch.object(NFLArticleExtractor, "is_recent", return_value=True):
+            result = asyncio.run(extractor.process_sitemap_urls_async(self._entries(10), 6, 7))
+
+        assert [a["title"] for a in result] == [f"T{i}" for i in range(6)]
+        assert result[0]["lastmod"] == "d0" and result[0]["publisher"] == "NFL.com"
+        assert state["peak"] <= 2  # per-host politeness
+        assert state["calls"] == 6  # never fetches beyond max_articles when all succeed
+
+    def test_failures_are_backfilled_from_later_entries(self):
+        extractor = NFLArticleExtractor(max_concurrency=3)
+
+        async def fake_extract(url: str):
+            idx = int(url.rsplit("-", 1)[1])
+            return None if idx % 2 == 0 else {"title": f"T{idx}", "url": url}
+
+        extractor.extract_article_content_async = fake_extract  # type: ignore[assignment]
+        with patch.object(NFLArticleExtractor, "is_recent", return_value=True):
+            result = extractor.process_sitemap_urls(self._entries(10), max_articles=3)
+
+        assert [a["title"] for a in result] == ["T1", "T3", "T5"]
+
+    def test_sync_entrypoint_refuses_to_block_a_running_loop(self):
+        extractor = NFLArticleExtractor(max_concurrency=2)
+
+        async def caller():
+            with pytest.raises(RuntimeError, match="process_sitemap_urls_async"):
+                extractor.process_sitemap_urls(self._entries(3), max_articles=5)
+            # The async API is the way in from async code
+            with patch.object(NFLArticleExtractor, "is_recent", return_value=True):
+                extractor.extract_article_content_async = fake_extract  # type: ignore[assignment]
+                return await extractor.process_sitemap_urls_async(self._entries(3), 5)
+
+        async def fake_extract(url: str):
+            return {"title": url, "url": url}
+
+        assert len(asyncio.run(caller())) == 3
@@ -0,0 +1,129 @@
+from __future__ import annotations
+
+import asyncio
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+import pytest
+import yaml
+
+
+def write_cfg(tmp_path, sources: List[Dict[str, Any]], **defaults: Any) -> str:
+    path = tmp_path / "feeds.yaml"
+    path.write_text(yaml.safe_dump({"defaults": defaults, "sources": sources}), encoding="utf-8")
+    return str(path)
+
+
+def test_sources_run_concurrently_and_aggregate_in_order(make_pipeline, tmp_path, monkeypatch):
+    active = 0
+    peak = 0
+
+    async def process(src, defaults):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        # Later sources finish first; totals must not depend on that
+        await asyncio.sleep(0.01 * (5 - int(src["name"][1:])))
+        active -= 1
+        return {
+            "total": 1,
+            "kept": 1,
+            "rejected": 0,
+            "escalated": 0,
+            "weight": int(src["name"][1:]),
+        }
+
+    sources = [{"name": f"s{i}", "publisher": f"P{i}", "type": "rss"} for i in range(5)]
+    p = make_pipeline()
+    monkeypatch.setattr(p, "_process_source", process)
+    stats = asyncio.run(p.run_from_config(write_cfg(tmp_path, sources, max_parallel_sources=3)))
+
+    assert peak == 3
+    assert stats == {"total": 5, "kept": 5, "rejected": 0, "escalated": 0, "weight": 10}
+
+
+def test_per_publisher_limit(make_pipeline, tmp_path, monkeypatch):
+    active: Dict[str, int] = {}
+    peak: Dict[str, int] = {}
+
+    async def process(src, defaults):
+        pub = src["publisher"]
+        active[pub] = active.get(pub, 0) + 1
+        peak[pub] = max(peak.get(pub, 0), active[pub])
+        await asyncio.sleep(0.01)
+        active[pub] -= 1
+        return {"total": 0, "kept": 0, "rejected": 0, "escalated": 0}
+
+    sources = [{"name": f"a{i}", "publisher": "A", "type": "rss"} for i in range(4)]
+    sources += [{"name": f"b{i}", "publisher": "B", "type": "rss"} for i in range(4)]
+    p = make_pipeline()
+    monkeypatch.setattr(p, "_process_source", process)
+    cfg = write_cfg(tmp_path, sources, max_parallel_sources=8, max_parallel_per_publisher=1)
+    asyncio.run(p.run_from_config(cfg))
+
+    assert peak == {"A": 1, "B": 1}
+
+
+def test_failed_source_does_not_stop_others(make_pipeline, tmp_path, monkeypatch):
+    done: List[str] = []
+
+    async def process(src, defaults):
+        await asyncio.sleep(0)
+        if src["name"] == "bad":
+            raise RuntimeError("boom")
+        done.append(src["name"])
+        return {"total": 1, "kept": 0, "rejected": 1, "escalated": 0}
+
+    sources = [
+        {"name": "bad", "publisher": "X", "type": "rss", "url": "https://x.test/rss"},
+        {"name": "good", "publisher": "Y", "type": "rss", "url": "https://y.test/rss"},
+    ]
+    p = make_pipeline()
+    monkeypatch.setattr(p, "_process_source", process)
+    p.validators.remember("https://x.test/rss", {"ETag": '"x"'})
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(p.run_from_config(write_cfg(tmp_path, sources)))
+
+    assert done == ["good"]
+    assert p.validators.get("https://x.test/rss") is None
+
+
+def test_failed_templated_source_forgets_resolved_url(make_pipeline, tmp_path, monkeypatch):
+    async def process(src, defaults):
+        raise RuntimeError("boom")
+
+    now = datetime.now(timezone.utc)
+    resolved = f"https://z.test/sitemaps/{now:%Y}/{now:%m}.xml"
+    sources = [{"name": "z", "type": "sitemap", "url": "https://z.test/sitemaps/{YYYY}/{MM}.xml"}]
+    p = make_pipeline()
+    monkeypatch.setattr(p, "_process_source", process)
+    p.validators.remember(resolved, {"ETag": '"z"'})
+
+    with pytest.raises(RuntimeError, match="boom"):
+        asyncio.run(p.run_from_config(write_cfg(tmp_path, sources)))
+
+    assert p.validators.get(resolved) is None
+
+
+def test_same_source_key_is_serialized(make_pipeline, tmp_path, monkeypatch):
+    active = 0
+    peak = 0
+
+    async def process(src, defaults):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01)
+        active -= 1
+        return {"total": 0, "kept": 0, "rejected": 0, "escalated": 0}
+
+    sources = [
+        {"name": "dup", "publisher": "A", "type": "rss"},
+        {"name": "dup", "publisher": "B", "type": "rss"},
+    ]
+    p = make_pipeline()
+    monkeypatch.setattr(p, "_process_source", process)
+    asyncio.run(p.run_from_config(write_cfg(tmp_path, sources)))
+
+    assert peak == 1
@@ -0,0 +1,111 @@
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any, Dict, List
+
+import pytest
+
+
+def test_persist_overlaps_fetch_and_queues_stay_bounded(offline_pipeline, monkeypatch):
+    events: List[str] = []
+    emitted = 0
+    persisted = 0
+    max_lead = 0
+
+    async def fake_crawl(url: str, sink=None, **kwargs: Any):
+        nonlocal emitted
+        for batch in range(20):
+            await sink([{"url": f"https://ex.com/{batch}-{i}", "lastmod": None} for i in range(50)])
+            emitted += 50
+            events.append("batch")
+        return []
+
+    def upsert(data: Dict[str, Any]):
+        nonlocal persisted, max_lead
+        persisted += 1
+        max_lead = max(max_lead, emitted - persisted)
+        events.append("upsert")
+        return SimpleNamespace(url=data["url"], publication_date=None)
+
+    monkeypatch.setattr("services.pipeline.crawl_sitemap_async", fake_crawl)
+    p = offline_pipeline(upsert)
+    src = {"name": "big", "type": "sitemap", "url": "https://ex.com/sitemap.xml"}
+
+    st = asyncio.run(p._process_source(src, {"queue_size": 8, "write_queue_size": 8}))
+
+    assert st == {"total": 1000, "kept": 1000, "rejected": 0, "escalated": 0}
+    # Writes start long before the download finishes
+    assert events.index("upsert") < events.index("batch") + 5
+    # The producer can never run further ahead than the queues (and the write batch
+    # being stored) allow
+    assert max_lead <= 4 * 8 + 50 + 3
+
+
+def test_stage_failure_cancels_pipeline(offline_pipeline, monkeypatch):
+    cancelled = asyncio.Event()
+
+    async def fake_crawl(url: str, sink=None, **kwargs: Any):
+        try:
+            for i in range(10_000):
+                await sink([{"url": f"https://ex.com/{i}", "lastmod": None}])
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+        return []
+
+    def upsert(data: Dict[str, Any]):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr("services.pipeline.crawl_sitemap_async", fake_crawl)
+    p = offline_pipeline(upsert)
+    src = {"name": "broken", "type": "sitemap", "url": "https://ex.com/sitemap.xml"}
+
+    with pytest.raises(RuntimeError, match="db down"):
+        asyncio.run(p._process_source(src, {"queue_size": 4}))
+    assert cancelled.is_set()
+
+
+def test_failed_source_forgets_child_sitemap_validators(offline_pipeline, monkeypatch):
+    children = ["https://ex.com/news-1.xml", "https://ex.com/news-2.xml"]
+
+    async def fake_crawl(url: str, sink=None, validators=None, visited=None, **kwargs: Any):
+        # An index whose children were all downloaded before the write failed
+        for doc_url in [url, *children]:
+            visited.add(doc_url)
+            validators.remember(doc_url, {"ETag": '"v"'})
+        await sink([{"url": "https://ex.com/a", "lastmod": None}])
+        return []
+
+    def upsert(data: Dict[str, Any]):
+        raise RuntimeError("db down")
+
+    monkeypatch.setattr("services.pipeline.crawl_sitemap_async", fake_crawl)
+    p = offline_pipeline(upsert)
+    src = {"name": "index", "type": "sitemap", "url": "https://ex.com/index.xml"}
+
+    (outcome,) = asyncio.run(p._run_sources([src], {}))
+
+    assert isinstance(outcome, RuntimeError)
+    for doc_url in ["https://ex.com/index.xml", *children]:
+        assert p.validators.get(doc_url) is None
+    assert p._fetched_urls == {}
+
+
+def test_rss_items_deduped_across_feeds(offline_pipeline, monkeypatch):
+    async def fake_fetch_feed(url: str) -> Dict[str, Any]:
+        return {"url": url, "status": 200, "content": ""}
+
+    async def fake_extract(feed: Dict[str, Any]) -> List[Dict[str, Any]]:
+        return [{"link": f"https://ex.com/{i}", "title": "t"} for i in range(3)]
+
+    def upsert(data: Dict[str, Any]):
+        return SimpleNamespace(url=data["url"], publication_date=None)
+
+    p = offline_pipeline(upsert)
+    monkeypatch.setattr(p.ingester, "fetch_feed", fake_fetch_feed)
+    monkeypatch.setattr(p.ingester, "extract_articles", fake_extract)
+    src = {"name": "multi", "type": "rss", "url": ["https://ex.com/a", "https://ex.com/b"]}
+
+    st = asyncio.run(p._process_source(src, {}))
+    assert st["total"] == 3 and st["kept"] == 3
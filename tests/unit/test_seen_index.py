@@ -0,0 +1,131 @@
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+from click.testing import CliRunner
+
+from cli.commands.seen_index import seen_index_group
+from database import connection as conn
+from database.repositories.article_repo import ArticleRepository
+from services.seen_index import BloomFilter, SeenUrlIndex, default_index_path, get_seen_index
+
+
+def test_bloom_filter_has_no_false_negatives_and_bounded_fp_rate():
+    bf = BloomFilter(capacity=5000, fp_rate=0.01)
+    urls = [f"https://ex.com/a/{i}" for i in range(5000)]
+    # add() reports a few URLs as present while the filter fills up
+    assert sum(bf.add(u) for u in urls) >= 4950
+    assert all(u in bf for u in urls)
+    false_hits = sum(f"https://ex.com/b/{i}" in bf for i in range(20_000))
+    assert false_hits / 20_000 < 0.02
+    assert abs(bf.fp_rate - 0.01) < 0.005
+
+
+def test_index_persists_and_survives_corrupt_file(tmp_path):
+    path = str(tmp_path / "seen.bloom")
+    idx = SeenUrlIndex(path, capacity=100)
+    assert idx.add_many(["https://x/1", "https://x/2", "https://x/1"]) == 2
+    assert "https://x/1" in idx
+    # Staged only: nothing on disk until save()
+    assert "https://x/1" not in SeenUrlIndex(path)
+    idx.save()
+    assert "https://x/2" in SeenUrlIndex(path)
+    assert SeenUrlIndex(path).stats()["urls"] == 2
+
+    (tmp_path / "seen.bloom").write_bytes(b"garbage")
+    assert "https://x/1" not in SeenUrlIndex(path)
+    assert "https://x/1" not in SeenUrlIndex(path, enabled=False)
+
+
+def test_pipeline_skips_urls_stored_by_earlier_runs(offline_pipeline, tmp_path, monkeypatch):
+    stored: list[str] = []
+
+    def make():
+        p = offline_pipeline(lambda item: stored.append(item["url"]))
+        p.seen_urls = SeenUrlIndex(str(tmp_path / "seen.bloom"))
+        return p
+
+    polls = [range(0, 10), range(5, 15)]
+
+    async def fake_crawl(url: str, sink=None, **kwargs: Any):
+        # Undated entries: the watermark cannot tell repeats apart
+        await sink([{"url": f"https://ex.com/{i}", "lastmod": None} for i in polls.pop(0)])
+        return []
+
+    monkeypatch.setattr("services.pipeline.crawl_sitemap_async", fake_crawl)
+    src = {"name": "yahoo", "type": "sitemap", "url": "https://ex.com/sitemap.xml"}
+
+    first = asyncio.run(make()._process_source(src, {}))
+    second = asyncio.run(make()._process_source(src, {}))
+    assert first["kept"] == 10 and second["total"] == second["kept"] == 5
+    assert stored == [f"https://ex.com/{i}" for i in range(15)]
+
+
+def test_rebuild_command_indexes_articles_table(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'seen.db'}")
+    conn.dispose_engines()
+    try:
+        ArticleRepository().upsert_many([{"url": f"https://x/{i}"} for i in range(25)])
+        runner = CliRunner()
+        res = runner.invoke(seen_index_group, ["rebuild"])
+        assert res.exit_code == 0, res.output
+        assert "Indexed 25 URLs" in res.output
+        res = runner.invoke(seen_index_group, ["stats"])
+        assert '"urls": 25' in res.output
+        # The index file belongs to the database it was built from
+        assert (tmp_path / "seen.db.seen.bloom").exists()
+    finally:
+        conn.dispose_engines()
+
+
+def test_index_is_opt_in_and_keyed_by_database(tmp_path, monkeypatch):
+    monkeypatch.delenv("T4L_SEEN_INDEX", raising=False)
+    monkeypatch.delenv("T4L_SEEN_INDEX_PATH", raising=False)
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'a.db'}")
+    assert not get_seen_index().enabled
+    assert get_seen_index().path == f"{tmp_path / 'a.db'}.seen.bloom"
+
+    pg = "postgresql+psycopg://u:{}@db.example.com:5432/t4l"
+    assert default_index_path(pg.format("old")) == default_index_path(pg.format("new"))
+    assert default_index_path(pg.format("x")) != default_index_path(pg.format("x") + "_staging")
+    assert default_index_path("sqlite://") != default_index_path(pg.format("x"))
+
+
+def test_reconcile_discards_index_of_another_database(tmp_path):
+    path = str(tmp_path / "seen.bloom")
+    idx = SeenUrlIndex(path, capacity=100)
+    idx.add_many([f"https://x/{i}" for i in range(10)])
+    idx.save()
+
+    assert SeenUrlIndex(path).reconcile(stored_articles=12)
+    assert "https://x/3" in SeenUrlIndex(path)
+
+    # A fresh or reset database has fewer articles than the index has URLs
+    assert not SeenUrlIndex(path).reconcile(stored_articles=0)
+    assert "https://x/3" not in SeenUrlIndex(path)
+
+
+def test_run_reconciles_index_with_articles_table(offline_pipeline, tmp_path, monkeypatch):
+    seen = SeenUrlIndex(str(tmp_path / "seen.bloom"))
+    seen.add_many(["https://ex.com/1"])
+    seen.save()
+    stored: list[str] = []
+
+    async def fake_crawl(url: str, sink=None, **kwargs: Any):
+        await sink([{"url": "https://ex.com/1", "lastmod": None}])
+        return []
+
+    monkeypatch.setattr("services.pipeline.crawl_sitemap_async", fake_crawl)
+    p = offline_pipeline(lambda item: stored.append(item["url"]))
+    p.seen_urls = SeenUrlIndex(str(tmp_path / "seen.bloom"))
+    monkeypatch.setattr(p.article_repo, "count", lambda: 0)
+    cfg = tmp_path / "feeds.yaml"
+    cfg.write_text(
+        "sources:\n- {name: s, type: sitemap, url: 'https://ex.com/sitemap.xml'}\n",
+        encoding="utf-8",
+    )
+
+    asyncio.run(p.run_from_config(str(cfg)))
+
+    assert stored == ["https://ex.com/1"]
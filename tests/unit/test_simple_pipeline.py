@@ -81,3 +81,58 @@ async def test_run_simplified_pipeline():
         assert len(results) == 1
         assert results[0]["status"] == "success"
         assert results[0]["articles_count"] == 5
+
+
+@pytest.mark.asyncio
+async def test_run_simplified_pipeline_concurrent_keeps_order():
+    """Sources overlap up to the limit while results stay in config order."""
+    import asyncio
+
+    mock_config = {
+        "defaults": {"max_parallel_sources": 3},
+        "sources": [{"url": f"https://ex.com/{i}", "publisher": f"P{i}"} for i in range(4)],
+    }
+    active = 0
+    peak = 0
+
+    async def fake_run_source(self, source):
+        nonlocal active, peak
+        active += 1
+        peak = max(peak, active)
+        await asyncio.sleep(0.01 * (4 - int(source["url"][-1])))
+        active -= 1
+        return {"source_key": source["url"], "articles_count": 1, "status": "success"}
+
+    with (
+        patch("builtins.open", mock_open(read_data="mock yaml content")),
+        patch("yaml.safe_load", return_value=mock_config),
+        patch.object(SimplifiedPipeline, "run_source", fake_run_source),
+    ):
+        results = await run_simplified_pipeline("config.yaml")
+        assert peak == 3
+        assert [r["source_key"] for r in results] == [s["url"] for s in mock_config["sources"]]
+
+        peak = 0
+        await run_simplified_pipeline("config.yaml", concurrency=1)
+        assert peak == 1
+
+
+@pytest.mark.asyncio
+async def test_sitemap_extraction_runs_off_event_loop():
+    import threading
+
+    pipeline = SimplifiedPipeline(use_supabase=False)
+    loop_thread = threading.get_ident()
+    seen = {}
+
+    def fake_fetch(url, validators=None):
+        seen["thread"] = threading.get_ident()
+        return None  # 304 Not Modified
+
+    with patch("services.sitemap_parser.fetch_sitemap", side_effect=fake_fetch):
+        result = await pipeline.run_source(
+            {"url": "https://example.com/sitemap.xml", "publisher": "Ex", "type": "sitemap"}
+        )
+
+    assert result["status"] == "success"
+    assert seen["thread"] != loop_thread
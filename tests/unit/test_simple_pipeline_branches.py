@@ -1,5 +1,6 @@
 """Extra coverage for SimplifiedPipeline branches."""
 
+import asyncio
 from unittest.mock import AsyncMock, Mock, patch
 
 import pytest
@@ -64,7 +65,7 @@ async def test_run_with_local_sitemap_nfl_flow():
     with (
         patch("services.sitemap_parser.fetch_sitemap", return_value="<xml></xml>"),
         patch("services.sitemap_parser.parse_sitemap", return_value=sitemap_urls),
-        patch("services.nfl_extractor.extract_nfl_articles", return_value=nfl_articles),
+        patch("services.nfl_extractor.extract_nfl_articles_async", return_value=nfl_articles),
     ):
 
         result = await pipeline.run_source(source_config)
@@ -80,6 +81,7 @@ async def test_run_with_supabase_sitemap_nfl_flow():
     # Replace supabase repo with a mock
     mock_repo = Mock()
     mock_repo.get_watermark.return_value = None
+    mock_repo.existing_urls.return_value = set()
     mock_repo.save_articles.return_value = True
     mock_repo.update_watermark.return_value = True
     mock_repo.log_processing.return_value = True
@@ -117,7 +119,7 @@ async def test_run_with_supabase_sitemap_nfl_flow():
     with (
         patch("services.sitemap_parser.fetch_sitemap", return_value="<xml></xml>"),
         patch("services.sitemap_parser.parse_sitemap", return_value=sitemap_urls),
-        patch("services.nfl_extractor.extract_nfl_articles", return_value=nfl_articles),
+        patch("services.nfl_extractor.extract_nfl_articles_async", return_value=nfl_articles),
     ):
 
         result = await pipeline.run_source(source_config)
@@ -127,3 +129,130 @@ async def test_run_with_supabase_sitemap_nfl_flow():
     mock_repo.save_articles.assert_called()
     mock_repo.update_watermark.assert_called()
     mock_repo.log_processing.assert_called()
+
+
+@pytest.mark.asyncio
+async def test_run_source_not_modified_skips_parsing(tmp_path):
+    from services.http_cache import ValidatorStore
+
+    pipeline = SimplifiedPipeline(use_supabase=False)
+    pipeline.validators = ValidatorStore(str(tmp_path / "v.json"))
+
+    source_config = {"url": "https://example.com/rss", "publisher": "Pub", "type": "rss"}
+
+    with patch("services.simple_pipeline.FeedIngester") as mock_ingester:
+        mock_instance = mock_ingester.return_value
+        mock_instance.fetch_feed = AsyncMock(return_value={"status": 304, "content": ""})
+        mock_instance.extract_articles = AsyncMock(return_value=[])
+
+        result = await pipeline.run_source(source_config)
+
+    assert result == {
+        "source_key": "Pub:https://example.com/rss",
+        "articles_count": 0,
+        "status": "success",
+    }
+    mock_instance.extract_articles.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_run_with_supabase_rss_is_incremental():
+    from services.feed_ingester import FeedIngester
+
+    pipeline = SimplifiedPipeline(use_supabase=True)
+    mock_repo = Mock()
+    mock_repo.get_watermark.return_value = "2025-09-05T00:00:00+00:00"
+    mock_repo.existing_urls.return_value = {"https://ex.com/stored"}
+    mock_repo.save_articles.return_value = True
+    pipeline.supabase_repo = mock_repo
+
+    raw = [
+        {"link": "https://ex.com/old", "published": "2025-09-01T00:00:00Z"},
+        {"link": "https://ex.com/stored", "published": "2025-09-06T00:00:00Z"},
+        {"link": "https://ex.com/new", "published": "Sun, 07 Sep 2025 12:00:00 GMT"},
+        {"link": "https://ex.com/undated"},
+    ]
+    source_config = {"url": "https://ex.com/rss", "publisher": "Pub", "type": "rss"}
+
+    with patch("services.simple_pipeline.FeedIngester") as mock_ingester:
+        mock_instance = mock_ingester.return_value
+        mock_instance.fetch_feed = AsyncMock(return_value={"status": 200, "content": ""})
+        mock_instance.extract_articles = AsyncMock(return_value=raw)
+        mock_instance.standardize_article.side_effect = FeedIngester().standardize_article
+
+        result = await pipeline.run_source(source_config)
+
+    assert result["status"] == "success" and result["articles_count"] == 2
+    # Only URLs that passed the watermark are looked up, in one call
+    mock_repo.existing_urls.assert_called_once_with(
+        ["https://ex.com/stored", "https://ex.com/new", "https://ex.com/undated"]
+    )
+    saved = [a["url"] for a in mock_repo.save_articles.call_args[0][0]]
+    assert saved == ["https://ex.com/new", "https://ex.com/undated"]
+    # Watermark is the newest publication date, not wall-clock time
+    mock_repo.update_watermark.assert_called_once_with(
+        "Pub:https://ex.com/rss", "2025-09-07T12:00:00+00:00"
+    )
+
+
+@pytest.mark.asyncio
+async def test_run_with_supabase_sitemap_skips_known_before_extraction():
+    pipeline = SimplifiedPipeline(use_supabase=True)
+    mock_repo = Mock()
+    mock_repo.get_watermark.return_value = "2025-09-02T15:00:00+00:00"
+    mock_repo.existing_urls.return_value = {"https://www.nfl.com/news/b"}
+    pipeline.supabase_repo = mock_repo
+
+    sitemap_urls = [
+        {"url": "https://www.nfl.com/news/a", "lastmod": "2025-09-01"},
+        {"url": "https://www.nfl.com/news/b", "lastmod": "2025-09-02"},
+        {"url": "https://www.nfl.com/news/c", "lastmod": "2025-09-02"},
+    ]
+    source_config = {
+        "url": "https://www.nfl.com/sitemap.xml",
+        "publisher": "NFL.com",
+        "type": "sitemap",
+    }
+
+    with (
+        patch("services.sitemap_parser.fetch_sitemap", return_value="<xml></xml>"),
+        patch("services.sitemap_parser.parse_sitemap", return_value=sitemap_urls),
+        patch("services.nfl_extractor.extract_nfl_articles_async", return_value=[]) as extract,
+    ):
+        result = await pipeline.run_source(source_config)
+
+    assert result["status"] == "success"
+    # Day-precision lastmod keeps the watermark's day; stored URLs are never fetched
+    assert extract.call_args[0][0] == [sitemap_urls[2]]
+    mock_repo.update_watermark.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_sitemap_sources_share_the_host_scheduler():
+    from services.async_processor import get_host_scheduler
+
+    pipeline = SimplifiedPipeline(use_supabase=True)
+    mock_repo = Mock()
+    mock_repo.get_watermark.return_value = None
+    mock_repo.existing_urls.return_value = set()
+    pipeline.supabase_repo = mock_repo
+    schedulers = []
+
+    async def extract(sitemap_urls, *args, **kwargs):
+        schedulers.append(get_host_scheduler())
+        return []
+
+    sources = [
+        {"url": f"https://www.nfl.com/sitemap-{i}.xml", "publisher": "NFL.com", "type": "sitemap"}
+        for i in range(2)
+    ]
+    with (
+        patch("services.sitemap_parser.fetch_sitemap", return_value="<xml></xml>"),
+        patch("services.sitemap_parser.parse_sitemap", return_value=[]),
+        patch("services.nfl_extractor.extract_nfl_articles_async", side_effect=extract),
+    ):
+        results = await asyncio.gather(*(pipeline.run_source(s) for s in sources))
+
+    assert [r["status"] for r in results] == ["success", "success"]
+    # Extraction ran on this loop, whose scheduler paces both sources per host
+    assert len(schedulers) == 2 and schedulers[0] is schedulers[1] is get_host_scheduler()
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+import asyncio
+import gzip
+
+import httpx
+
+from src.services import sitemap_parser
+from src.services.http_cache import ValidatorStore
+from src.services.sitemap_parser import (
+    SitemapStreamParser,
+    crawl_sitemap_async,
+    fetch_sitemap_entries_async,
+    iter_sitemap_entries,
+    parse_sitemap,
+)
+
+URLSET = (
+    b'<?xml version="1.0" encoding="UTF-8"?>\n'
+    b'<urlset xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+    + b"".join(
+        b"<url><loc>https://ex.com/%d</loc><lastmod>2025-09-%02d</lastmod></url>" % (i, 20 - i)
+        for i in range(10)
+    )
+    + b"<url><loc>https://ex.com/nodate</loc></url></urlset>"
+)
+
+
+def _chunks(data: bytes, size: int):
+    return [data[i : i + size] for i in range(0, len(data), size)]
+
+
+def test_streaming_matches_list_parser_for_any_chunking():
+    expected = parse_sitemap(URLSET.decode("utf-8"))
+    assert len(expected) == 11
+    assert expected[0] == {"url": "https://ex.com/0", "lastmod": "2025-09-20"}
+    for size in (1, 7, 64, 4096):
+        assert list(iter_sitemap_entries(_chunks(URLSET, size))) == expected
+
+
+def test_gzip_body_is_inflated_on_the_fly():
+    gz = gzip.compress(URLSET)
+    entries = list(iter_sitemap_entries(_chunks(gz, 5)))
+    assert [e["url"] for e in entries][:2] == ["https://ex.com/0", "https://ex.com/1"]
+    assert len(entries) == 11
+
+
+def test_lastmod_cutoff_filters_or_stops_early():
+    filtered = list(iter_sitemap_entries([URLSET], min_lastmod="2025-09-15"))
+    # 2025-09-20 .. 2025-09-15 plus the undated entry
+    assert [e["url"] for e in filtered] == [f"https://ex.com/{i}" for i in range(6)] + [
+        "https://ex.com/nodate"
+    ]
+
+    parser = SitemapStreamParser(min_lastmod="2025-09-15", stop_at_cutoff=True)
+    stopped = parser.feed(URLSET) + parser.close()
+    assert [e["url"] for e in stopped] == [f"https://ex.com/{i}" for i in range(6)]
+    assert parser.done
+
+
+def test_html_sitemap_falls_back_to_html_parser():
+    html = (
+        "<html><body><table>"
+        "<tr><td><a href='/news/a'>A</a></td><td>2025-09-07</td></tr>"
+        "<tr><td><a href='/about'>About</a></td></tr>"
+        "</table></body></html>"
+    ).encode("utf-8")
+    entries = list(iter_sitemap_entries(_chunks(html, 16)))
+    assert entries == [{"url": "https://www.nfl.com/news/a", "lastmod": "2025-09-07"}]
+
+
+def test_decoded_text_ignores_declared_encoding():
+    xml = (
+        '<?xml version="1.0" encoding="ISO-8859-1"?>'
+        "<urlset><url><loc>https://ex.com/café-à-paris</loc></url></urlset>"
+    )
+    assert parse_sitemap(xml) == [{"url": "https://ex.com/café-à-paris", "lastmod": None}]
+
+
+def test_bom_and_long_prolog_are_sniffed_as_xml():
+    xml = (
+        "\ufeff<?xml version='1.0' encoding='UTF-8'?>\n<!-- "
+        + "x" * 600
+        + " --><urlset><url><loc>https://ex.com/1</loc></url></urlset>"
+    )
+    expected = [{"url": "https://ex.com/1", "lastmod": None}]
+    assert parse_sitemap(xml) == expected
+    assert list(iter_sitemap_entries(_chunks(xml.encode("utf-8"), 100))) == expected
+
+
+def test_xml_without_entries_falls_back_to_html_links():
+    xhtml = (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<html xmlns="http://www.w3.org/1999/xhtml"><body><table>'
+        "<tr><td><a href='/news/b'>B</a></td><td>2025-09-08</td></tr>"
+        "</table></body></html>"
+    )
+    expected = [{"url": "https://www.nfl.com/news/b", "lastmod": "2025-09-08"}]
+    assert parse_sitemap(xhtml) == expected
+    assert list(iter_sitemap_entries(_chunks(xhtml.encode("utf-8"), 16))) == expected
+
+
+def test_fetch_sitemap_entries_async_conditional(monkeypatch, tmp_path):
+    calls = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        calls.append(dict(request.headers))
+        if request.headers.get("If-None-Match") == '"v1"':
+            return httpx.Response(304)
+        return httpx.Response(200, content=gzip.compress(URLSET), headers={"ETag": '"v1"'})
+
+    monkeypatch.setattr(
+        sitemap_parser.http_client,
+        "get_async_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    store = ValidatorStore(str(tmp_path / "v.json"))
+    url = "https://ex.com/sitemap.xml.gz"
+
+    first = asyncio.run(fetch_sitemap_entries_async(url, validators=store))
+    assert first is not None and len(first) == 11
+    second = asyncio.run(fetch_sitemap_entries_async(url, validators=store))
+    assert second is None
+    assert calls[1]["if-none-match"] == '"v1"'
+
+
+def _index(children) -> bytes:
+    body = "".join(
+        f"<sitemap><loc>{loc}</loc>" + (f"<lastmod>{lm}</lastmod>" if lm else "") + "</sitemap>"
+        for loc, lm in children
+    )
+    return (
+        '<?xml version="1.0"?><sitemapindex xmlns="http://www.sitemaps.org/schemas/sitemap/0.9">'
+        f"{body}</sitemapindex>"
+    ).encode()
+
+
+def _urlset(*locs: str) -> bytes:
+    body = "".join(f"<url><loc>{u}</loc><lastmod>2025-09-10</lastmod></url>" for u in locs)
+    return f"<urlset>{body}</urlset>".encode()
+
+
+def test_crawl_sitemap_index_prunes_old_children(monkeypatch, tmp_path):
+    docs = {
+        "https://ex.com/index.xml": _index(
+            [
+                ("https://ex.com/new.xml", "2025-09-10"),
+                ("https://ex.com/old.xml", "2025-01-01"),
+                ("https://ex.com/undated.xml", None),
+                ("https://ex.com/nested.xml", "2025-09-09"),
+            ]
+        ),
+        "https://ex.com/nested.xml": _index([("https://ex.com/deep.xml.gz", None)]),
+        "https://ex.com/new.xml": _urlset("https://ex.com/a", "https://ex.com/b"),
+        "https://ex.com/undated.xml": _urlset("https://ex.com/c"),
+        "https://ex.com/deep.xml.gz": gzip.compress(_urlset("https://ex.com/d")),
+    }
+    fetched = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        fetched.append(str(request.url))
+        return httpx.Response(200, content=docs[str(request.url)])
+
+    monkeypatch.setattr(
+        sitemap_parser.http_client,
+        "get_async_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+
+    visited: set = set()
+    entries = asyncio.run(
+        crawl_sitemap_async("https://ex.com/index.xml", min_lastmod="2025-09-05", visited=visited)
+    )
+
+    assert [e["url"] for e in entries] == [
+        "https://ex.com/a",
+        "https://ex.com/b",
+        "https://ex.com/c",
+        "https://ex.com/d",
+    ]
+    assert "https://ex.com/old.xml" not in fetched
+    assert visited == set(fetched)
+
+    # Nesting beyond max_depth is not followed
+    entries = asyncio.run(crawl_sitemap_async("https://ex.com/index.xml", max_depth=1))
+    assert "https://ex.com/d" not in [e["url"] for e in entries]
+
+
+def test_crawl_sitemap_index_child_failure_drops_index_validators(monkeypatch, tmp_path):
+    def handler(request: httpx.Request) -> httpx.Response:
+        if request.url.path == "/index.xml":
+            if request.headers.get("If-None-Match") == '"i1"':
+                return httpx.Response(304)
+            body = _index([("https://ex.com/ok.xml", None), ("https://ex.com/bad.xml", None)])
+            return httpx.Response(200, content=body, headers={"ETag": '"i1"'})
+        if request.url.path == "/bad.xml":
+            return httpx.Response(404)
+        return httpx.Response(200, content=_urlset("https://ex.com/a"))
+
+    monkeypatch.setattr(
+        sitemap_parser.http_client,
+        "get_async_client",
+        lambda: httpx.AsyncClient(transport=httpx.MockTransport(handler)),
+    )
+    store = ValidatorStore(str(tmp_path / "v.json"))
+
+    entries = asyncio.run(crawl_sitemap_async("https://ex.com/index.xml", validators=store))
+    assert [e["url"] for e in entries] == ["https://ex.com/a"]
+    assert store.get("https://ex.com/index.xml") is None
@@ -0,0 +1,119 @@
+from __future__ import annotations
+
+import threading
+
+from sqlalchemy import text
+
+from database import connection as conn
+from database.repositories.article_repo import ArticleRepository
+from database.repositories.log_repo import ProcessingLogRepository
+
+
+def _fresh(monkeypatch, tmp_path, name="p.db"):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / name}")
+    conn.dispose_engines()
+    return conn.get_sessionmaker()
+
+
+def test_profile_pragmas_applied(monkeypatch, tmp_path):
+    monkeypatch.setenv("T4L_SQLITE_BUSY_TIMEOUT_MS", "1234")
+    factory = _fresh(monkeypatch, tmp_path)
+    try:
+        with factory() as s:
+            assert s.execute(text("PRAGMA journal_mode")).scalar() == "wal"
+            assert s.execute(text("PRAGMA synchronous")).scalar() == 1  # NORMAL
+            assert s.execute(text("PRAGMA busy_timeout")).scalar() == 1234
+            assert s.execute(text("PRAGMA cache_size")).scalar() == -65536
+    finally:
+        conn.dispose_engines()
+
+
+def test_profile_off_leaves_defaults(monkeypatch, tmp_path):
+    monkeypatch.setenv("T4L_SQLITE_PROFILE", "off")
+    factory = _fresh(monkeypatch, tmp_path)
+    try:
+        with factory() as s:
+            assert s.execute(text("PRAGMA journal_mode")).scalar() != "wal"
+        assert conn._writer_for(factory.kw["bind"]) is None
+    finally:
+        conn.dispose_engines()
+
+
+def test_in_memory_database_writes_on_the_schema_connection(monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", "sqlite:///:memory:")
+    conn.dispose_engines()
+    try:
+        repo = ArticleRepository()
+        repo.upsert({"url": "https://example.com/mem", "title": "Mem", "source": "s"})
+        assert repo.get_by_url("https://example.com/mem").title == "Mem"
+        assert conn._writer_for(conn.get_engine()) is None
+    finally:
+        conn.dispose_engines()
+
+
+def test_concurrent_writers_are_serialized_and_readers_proceed(monkeypatch, tmp_path):
+    factory = _fresh(monkeypatch, tmp_path)
+    articles = ArticleRepository(factory)
+    logs = ProcessingLogRepository(factory)
+    errors = []
+
+    def write(n):
+        try:
+            for i in range(20):
+                articles.upsert_many(
+                    [{"url": f"https://x/{n}/{i}/{j}", "title": "t"} for j in range(5)]
+                )
+                logs.add("INFO", f"w{n}-{i}")
+        except Exception as e:  # pragma: no cover - failure path
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(n,)) for n in range(6)]
+    try:
+        for t in threads:
+            t.start()
+        # A reader on its own connection is never blocked by the queued writes
+        with factory() as s:
+            s.execute(text("SELECT count(*) FROM articles")).scalar()
+        for t in threads:
+            t.join()
+        assert errors == []
+        with factory() as s:
+            assert s.execute(text("SELECT count(*) FROM articles")).scalar() == 6 * 20 * 5
+            assert s.execute(text("SELECT count(*) FROM processing_log")).scalar() == 6 * 20
+    finally:
+        conn.dispose_engines()
+
+
+def test_run_write_is_inline_inside_writer_thread(monkeypatch, tmp_path):
+    factory = _fresh(monkeypatch, tmp_path)
+    writer = conn._writer_for(factory.kw["bind"])
+    seen = []
+
+    def outer(session):
+        seen.append(threading.current_thread().name)
+        # Nested write from a job must not wait on its own queue
+        return conn.run_write(factory, lambda s: seen.append(threading.current_thread().name))
+
+    try:
+        conn.run_write(factory, outer)
+        assert seen == ["sqlite-writer", "sqlite-writer"]
+        assert writer is not None
+    finally:
+        conn.dispose_engines()
+
+
+def test_run_write_errors_propagate(monkeypatch, tmp_path):
+    factory = _fresh(monkeypatch, tmp_path)
+
+    def boom(session):
+        raise ValueError("nope")
+
+    try:
+        try:
+            conn.run_write(factory, boom)
+        except ValueError as e:
+            assert str(e) == "nope"
+        else:  # pragma: no cover
+            raise AssertionError("expected ValueError")
+    finally:
+        conn.dispose_engines()
@@ -0,0 +1,97 @@
+from __future__ import annotations
+
+from unittest.mock import Mock
+
+import httpx
+import pytest
+from postgrest.exceptions import APIError
+
+from src.database.supabase_batch import SupabaseBatchWriter, chunk_rows
+
+
+def rows(n):
+    return [{"url": f"https://x/{i}"} for i in range(n)]
+
+
+def test_chunk_rows_bounds_rows_and_bytes():
+    assert [len(c) for c in chunk_rows(rows(7), max_rows=3)] == [3, 3, 1]
+    big = [{"url": "u", "content": "x" * 100}] * 4
+    chunks = list(chunk_rows(big, max_rows=10, max_bytes=300))
+    assert [len(c) for c in chunks] == [2, 2]
+    # An oversize row still goes out, alone
+    assert [len(c) for c in chunk_rows(big[:2], max_bytes=10)] == [1, 1]
+
+
+def test_upsert_asks_for_minimal_return():
+    client = Mock()
+    table = client.table.return_value
+    result = SupabaseBatchWriter(client, max_rows=2, max_parallel=2).write(rows(5))
+    assert result.ok and result.written == 5 and result.requests == 3
+    _, kwargs = table.upsert.call_args
+    assert kwargs["returning"] == "minimal" and kwargs["on_conflict"] == "url"
+
+
+def test_old_client_signature_falls_back():
+    client = Mock()
+    table = client.table.return_value
+
+    def upsert(data, on_conflict="", **kwargs):
+        if kwargs:
+            raise TypeError("unexpected keyword")
+        return Mock()
+
+    table.upsert.side_effect = upsert
+    assert SupabaseBatchWriter(client).write(rows(3)).written == 3
+
+
+def test_single_row_duplicates_count_as_success():
+    client = Mock()
+    query = client.table.return_value.upsert.return_value
+    query.execute.side_effect = Exception('duplicate key value violates "articles_url_key"')
+    result = SupabaseBatchWriter(client).write(rows(2))
+    assert result.ok and result.duplicates == 2 and result.requests == 3
+
+
+def test_transport_errors_are_not_bisected():
+    client = Mock()
+    query = client.table.return_value.upsert.return_value
+    query.execute.side_effect = httpx.ConnectError("refused")
+    result = SupabaseBatchWriter(client, max_rows=100).write(rows(64))
+    assert len(result.failed) == 64 and result.requests == 1
+
+
+@pytest.mark.parametrize(
+    "error",
+    [
+        APIError({"message": "JWT expired", "code": "PGRST301"}),
+        APIError({"message": "JSON could not be generated", "code": 401}),
+        APIError({"message": "JSON could not be generated", "code": 503}),
+        APIError({"message": "too many requests", "code": "429"}),
+        APIError({"message": "statement timeout", "code": "57014"}),
+    ],
+    ids=["jwt", "401", "503", "429", "timeout"],
+)
+def test_non_row_errors_fail_the_chunk_without_bisecting(error):
+    client = Mock()
+    query = client.table.return_value.upsert.return_value
+    query.execute.side_effect = error
+    result = SupabaseBatchWriter(client, max_rows=100).write(rows(64))
+    assert len(result.failed) == 64 and result.requests == 1
+
+
+def test_row_errors_are_bisected_down_to_the_bad_row():
+    client = Mock()
+    table = client.table.return_value
+
+    def upsert(data, **kwargs):
+        query = Mock()
+        if any(r["url"] == "https://x/5" for r in data):
+            query.execute.side_effect = APIError(
+                {"message": "invalid input syntax", "code": "22P02"}
+            )
+        return query
+
+    table.upsert.side_effect = upsert
+    result = SupabaseBatchWriter(client, max_rows=100).write(rows(8))
+    assert result.failed == [{"url": "https://x/5"}] and result.written == 7
+    assert result.requests == 7
@@ -226,3 +226,20 @@ class TestSimpleSupabaseRepo:
         assert repo.get_watermark("test") is None
         assert repo.update_watermark("test", "timestamp") is False
         assert repo.log_processing("test", "success") is False
+
+
+def test_existing_urls_uses_chunked_in_queries():
+    client = Mock()
+    query = client.table.return_value.select.return_value.in_.return_value
+    query.execute.side_effect = [
+        Mock(data=[{"url": "https://x/0"}, {"url": "https://x/1"}]),
+        Mock(data=[{"url": "https://x/2"}]),
+    ]
+    repo = SimpleSupabaseRepo(client=client)
+
+    urls = [f"https://x/{i}" for i in range(3)] + ["https://x/0", ""]
+    assert repo.existing_urls(urls, chunk_size=2) == {"https://x/0", "https://x/1", "https://x/2"}
+    client.table.return_value.select.assert_called_with("url")
+    chunks = [c.args for c in client.table.return_value.select.return_value.in_.call_args_list]
+    assert chunks == [("url", ["https://x/0", "https://x/1"]), ("url", ["https://x/2"])]
+    assert SimpleSupabaseRepo(client=None).existing_urls(urls) == set()
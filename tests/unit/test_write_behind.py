@@ -0,0 +1,205 @@
+from __future__ import annotations
+
+import asyncio
+import threading
+from datetime import datetime, timezone
+from typing import Any, Dict, List
+
+import pytest
+
+from database import connection as conn
+from database.repositories.article_repo import ArticleRepository
+from database.repositories.log_repo import BufferedLogWriter
+from src.services.metrics import Metrics
+from src.services.write_behind import WriteBehindWriter
+
+
+class FakeLogs:
+    def __init__(self) -> None:
+        self.buffer: List[Dict[str, Any]] = []
+        self.written: List[Dict[str, Any]] = []
+        self.due = False
+
+    def add(self, level: str, message: str, **kwargs: Any) -> None:
+        self.buffer.append({"level": level, "message": message, **kwargs})
+
+    async def aflush(self) -> int:
+        n = len(self.buffer)
+        self.written.extend(self.buffer)
+        self.buffer = []
+        return n
+
+
+class FakeArticles:
+    def __init__(self, fail_on: str | None = None) -> None:
+        self.batches: List[List[str]] = []
+        self.fail_on = fail_on
+
+    def existing(self, urls: List[str]) -> Dict[str, Any]:
+        return {}
+
+    def upsert_many(self, items: List[Dict[str, Any]]) -> List[Any]:
+        urls = [it["url"] for it in items]
+        if self.fail_on in urls:
+            raise RuntimeError("db down")
+        self.batches.append(urls)
+        return []
+
+
+class FakeWatermarks:
+    def __init__(self) -> None:
+        self.rows: Dict[str, Any] = {}
+
+    def upsert(self, source: str, when: Any, url: Any) -> None:
+        self.rows[source] = (when, url)
+
+
+def writer(articles: Any, **kwargs: Any):
+    logs, marks = FakeLogs(), FakeWatermarks()
+    return WriteBehindWriter(articles, logs, marks, **kwargs), logs, marks
+
+
+def test_batches_and_flush_barrier():
+    articles = FakeArticles()
+    w, logs, marks = writer(articles, batch_size=4)
+    when = datetime(2025, 9, 7, tzinfo=timezone.utc)
+
+    async def scenario():
+        async with w:
+            for i in range(10):
+                await w.put_article("s", {"url": f"https://x/{i}"}, 1.0)
+            await w.put_watermark("s", when, "https://x/9")
+            await w.flush("s")
+            # Everything queued before the barrier is stored, logs included
+            assert sum(len(b) for b in articles.batches) == 10
+            assert len(logs.written) == 10 and marks.rows["s"] == (when, "https://x/9")
+
+    asyncio.run(scenario())
+    assert all(len(b) <= 4 for b in articles.batches)
+    assert len(articles.batches) < 10
+
+
+def test_failed_batch_suppresses_watermark_and_fails_fast():
+    articles = FakeArticles(fail_on="https://x/bad")
+    w, logs, marks = writer(articles)
+
+    async def scenario():
+        async with w:
+            await w.put_article("bad", {"url": "https://x/bad"}, 1.0)
+            await w.flush()
+            # Once a source has failed, its producers stop at the next put
+            with pytest.raises(RuntimeError, match="db down"):
+                await w.put_article("bad", {"url": "https://x/2"}, 1.0)
+            with pytest.raises(RuntimeError, match="db down"):
+                await w.put_watermark("bad", None, "https://x/2")
+            # Other sources keep writing
+            await w.put_article("good", {"url": "https://x/ok"}, 1.0)
+            await w.put_watermark("good", None, "https://x/ok")
+            await w.flush("good")
+            with pytest.raises(RuntimeError, match="db down"):
+                await w.flush("bad")
+
+    asyncio.run(scenario())
+    assert "bad" not in marks.rows and marks.rows["good"] == (None, "https://x/ok")
+
+
+def test_close_drains_queue_and_reports_depth():
+    articles = FakeArticles()
+    w, logs, _ = writer(articles, max_queue=5, batch_size=2)
+    depths: List[int] = []
+
+    async def scenario():
+        await w.start()
+        for i in range(20):
+            await w.put_article("s", {"url": f"https://x/{i}"}, 1.0)
+            depths.append(w.depth)
+        await w.close()
+        with pytest.raises(RuntimeError, match="not running"):
+            await w.put_article("s", {"url": "https://x/late"}, 1.0)
+
+    asyncio.run(scenario())
+    assert max(depths) <= 5
+    assert sum(len(b) for b in articles.batches) == 20 and len(logs.written) == 20
+    # The gauge is process-wide, so only its final level is specific to this test
+    assert Metrics.snapshot()["gauges"]["pipeline.write_queue.depth"]["value"] == 0
+
+
+def test_watermark_queued_behind_failed_articles_is_dropped():
+    articles = FakeArticles(fail_on="https://x/bad")
+    w, _, marks = writer(articles, batch_size=1)
+
+    async def scenario():
+        async with w:
+            # Both are queued before the worker sees the failure
+            await w.put_article("s", {"url": "https://x/bad"}, 1.0)
+            await w.put_watermark("s", None, "https://x/bad")
+            with pytest.raises(RuntimeError, match="db down"):
+                await w.flush("s")
+
+    asyncio.run(scenario())
+    assert marks.rows == {}
+
+
+def test_unchanged_articles_are_not_rewritten(tmp_path, monkeypatch):
+    monkeypatch.setenv("DATABASE_URL", f"sqlite:///{tmp_path / 'wb.db'}")
+    conn.dispose_engines()
+    try:
+        repo = ArticleRepository()
+        item = {"url": "https://x/1", "title": "One", "publisher": "P"}
+        repo.upsert_many([item])
+        written: List[str] = []
+        real_upsert = repo.upsert_many
+
+        def upsert_many(items: List[Dict[str, Any]]) -> Any:
+            written.extend(i["url"] for i in items)
+            return real_upsert(items)
+
+        monkeypatch.setattr(repo, "upsert_many", upsert_many)
+        w, logs, _ = writer(repo)
+
+        async def scenario():
+            async with w:
+                await w.put_article("s", dict(item), 1.0)
+                await w.put_article("s", {"url": "https://x/1 ", "title": "Renamed"}, 1.0)
+                await w.put_article("s", {"url": "https://x/2", "title": "Two"}, 1.0)
+                await w.flush("s")
+
+        asyncio.run(scenario())
+        assert written == ["https://x/1 ", "https://x/2"]
+        # Every kept article is audited, the unchanged one included
+        assert [e["article_url"] for e in logs.written] == [
+            "https://x/1",
+            "https://x/1 ",
+            "https://x/2",
+        ]
+        assert repo.get_by_url("https://x/1").title == "Renamed"
+    finally:
+        conn.dispose_engines()
+
+
+def test_sync_log_flushes_run_off_the_event_loop():
+    class ThreadRecordingLogs:
+        def __init__(self) -> None:
+            self.threads: List[int] = []
+            self.rows = 0
+
+        def add_many(self, entries: List[Dict[str, Any]]) -> int:
+            self.threads.append(threading.get_ident())
+            self.rows += len(entries)
+            return len(entries)
+
+    repo = ThreadRecordingLogs()
+    logs = BufferedLogWriter(repo, max_entries=2, auto_flush=False)
+    w = WriteBehindWriter(FakeArticles(), logs, FakeWatermarks(), batch_size=1)
+    loop_threads: List[int] = []
+
+    async def scenario():
+        loop_threads.append(threading.get_ident())
+        async with w:
+            for i in range(5):
+                await w.put_article("s", {"url": f"https://x/{i}"}, 1.0)
+            await w.flush("s")
+
+    asyncio.run(scenario())
+    assert repo.rows == 5 and logs.pending == 0
+    assert repo.threads and loop_threads[0] not in repo.threads